@@ -0,0 +1,115 @@
+"""
+Test impact analysis: select the component tests affected by the changes since a git revision.
+
+A changed file affects a component if it is one of the component sources or test sources,
+one of the project headers they include, a file in the component directory or a file listed
+in the component coverage report of the previous run, if there is one. Changes to the yanga configuration
+files affect all components.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from py_app_dev.core.logging import logger
+from yanga_core.commands.run import RunCommand, RunCommandConfig
+from yanga_core.domain.component_resolver import resolve_include_directories
+from yanga_core.domain.components import Component
+from yanga_core.domain.execution_context import ExecutionContext, UserRequest, UserRequestScope, UserRequestTarget
+
+from .cmake.coverage import CoverageRelevantFile, load_coverage_report
+from .sources import collect_included_files, get_changed_files
+
+
+@dataclass(frozen=True, order=True)
+class UserAffectedTestsRequest(UserRequest):
+    """Request to build and run only the component tests affected by the changes since a git revision."""
+
+    #: Git revision to compare against
+    affected_since: Optional[str] = None
+
+
+def create_affected_tests_request(variant_name: Optional[str], affected_since: str, build_type: Optional[str] = None) -> UserAffectedTestsRequest:
+    return UserAffectedTestsRequest(UserRequestScope.VARIANT, variant_name, target=UserRequestTarget.TEST, build_type=build_type, affected_since=affected_since)
+
+
+def run_affected_tests(config: RunCommandConfig, affected_since: str) -> None:
+    """Run the pipeline like ``RunCommand`` does, but build only the affected component test targets."""
+    run_command = RunCommand()
+    project_slurper = run_command.create_project_slurper(config.project_dir)
+    if config.not_interactive:
+        variant_name, platform_name = config.variant_name, config.platform
+    else:
+        variant_name = run_command.determine_variant_name(config.variant_name, project_slurper.variants)
+        platform_name = run_command.determine_platform_name(config.platform, project_slurper.platforms)
+    build_type = run_command.determine_build_type(config.build_type, platform_name, project_slurper, config.not_interactive)
+    run_command.execute_pipeline_steps(
+        project_dir=config.project_dir,
+        project_slurper=project_slurper,
+        user_request=create_affected_tests_request(variant_name, affected_since, build_type),
+        variant_name=variant_name,
+        platform_name=platform_name,
+        step=config.step,
+        single=config.single,
+        force_run=config.force_run,
+    )
+
+
+def read_coverage_report_files(coverage_report: Path, project_dir: Path) -> set[Path]:
+    """Source files of a gcovr JSON report. Returns an empty set if the report does not exist (yet)."""
+    if not coverage_report.is_file():
+        return set()
+    try:
+        files = load_coverage_report(coverage_report).get("files", [])
+    except (json.JSONDecodeError, OSError):
+        logger.warning(f"Could not read coverage report {coverage_report}.")
+        return set()
+    return {(project_dir / file_data["file"]).resolve() for file_data in files}
+
+
+class AffectedComponents:
+    def __init__(self, project_dir: Path, components: list[Component], coverage_reports: dict[str, Path], config_files: Optional[list[Path]] = None) -> None:
+        self.project_dir = project_dir
+        self.components = components
+        #: Previous coverage report of the components with tests. Missing if the coverage is disabled.
+        self.coverage_reports = coverage_reports
+        self.config_files = {file.resolve() for file in config_files or []}
+        self.logger = logger.bind()
+
+    @classmethod
+    def from_execution_context(cls, execution_context: ExecutionContext) -> "AffectedComponents":
+        coverage_reports = {
+            entry.target.component_name: entry.json_report.to_path() for entry in execution_context.data_registry.find_data(CoverageRelevantFile) if entry.target.component_name
+        }
+        return cls(execution_context.project_root_dir, execution_context.components, coverage_reports, execution_context.user_config_files)
+
+    def get_component_files(self, component: Component, include_dirs: list[Path]) -> set[Path]:
+        files = collect_included_files([*component.sources, *component.test_sources], include_dirs)
+        files.update(component.sources)
+        files.update(component.test_sources)
+        coverage_report = self.coverage_reports.get(component.name)
+        if coverage_report:
+            files.update(read_coverage_report_files(coverage_report, self.project_dir))
+        return {file.resolve() for file in files}
+
+    def select(self, changed_files: list[Path]) -> list[str]:
+        """Names of the components with tests affected by the changed files."""
+        changed = {file.resolve() for file in changed_files}
+        tested_components = [component for component in self.components if component.is_testable]
+        if changed & self.config_files:
+            self.logger.info("Configuration files changed. All components are affected.")
+            return [component.name for component in tested_components]
+        include_dirs = resolve_include_directories(self.components)
+        affected = []
+        for component in tested_components:
+            component_dir = component.path.resolve()
+            if any(file.is_relative_to(component_dir) for file in changed) or changed & self.get_component_files(component, include_dirs):
+                affected.append(component.name)
+        return affected
+
+    def get_test_targets(self, base_ref: str) -> list[str]:
+        changed_files = get_changed_files(self.project_dir, base_ref)
+        affected = self.select(changed_files)
+        self.logger.info(f"{len(changed_files)} files changed since {base_ref}. Affected components: {', '.join(affected) if affected else 'none'}.")
+        return [UserRequest(UserRequestScope.COMPONENT, component_name=name, target=UserRequestTarget.TEST).target_name for name in affected]
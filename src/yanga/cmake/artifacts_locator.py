@@ -3,7 +3,7 @@ from pathlib import Path
 
 from yanga_core.domain.spl_paths import SPLPaths
 
-from yanga.cmake.cmake_backend import CMakePath
+from yanga.cmake.cmake_backend import CMakePath, CMakePathInterner
 
 
 class BuildArtifact(Enum):
@@ -22,22 +22,24 @@ class CMakeArtifactsLocator:
     def __init__(self, output_dir: Path, spl_paths: SPLPaths) -> None:
         # The directory where the build files will be generated
         self.spl_paths = spl_paths
-        self.cmake_build_dir = CMakePath(output_dir, "CMAKE_BUILD_DIR")
-        self.cmake_project_dir = CMakePath(self.spl_paths.project_root_dir)
-        self.cmake_variant_reports_dir = self.cmake_build_dir.joinpath("reports")
+        # Paths requested repeatedly for the same component share one instance
+        self.paths = CMakePathInterner()
+        self.cmake_build_dir = self.paths.intern(CMakePath(output_dir, "CMAKE_BUILD_DIR"))
+        self.cmake_project_dir = self.paths.intern(CMakePath(self.spl_paths.project_root_dir))
+        self.cmake_variant_reports_dir = self.paths.joinpath(self.cmake_build_dir, "reports")
 
     @property
     def project_root_dir(self) -> Path:
         return self.spl_paths.project_root_dir
 
     def get_component_build_dir(self, component_name: str) -> CMakePath:
-        return self.cmake_build_dir.joinpath(component_name)
+        return self.paths.joinpath(self.cmake_build_dir, component_name)
 
     def get_component_reports_dir(self, component_name: str) -> CMakePath:
-        return self.get_component_build_dir(component_name).joinpath("reports")
+        return self.paths.joinpath(self.get_component_build_dir(component_name), "reports")
 
     def get_build_artifact(self, artifact: BuildArtifact) -> CMakePath:
-        return self.cmake_build_dir.joinpath(artifact.path)
+        return self.paths.joinpath(self.cmake_build_dir, artifact.path)
 
     def get_component_build_artifact(self, component_name: str, artifact: BuildArtifact) -> CMakePath:
-        return self.get_component_build_dir(component_name).joinpath(artifact.path)
+        return self.paths.joinpath(self.get_component_build_dir(component_name), artifact.path)
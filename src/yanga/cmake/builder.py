@@ -2,9 +2,8 @@ from pathlib import Path
 from typing import Optional
 
 from py_app_dev.core.exceptions import UserNotificationException
-from py_app_dev.core.find import find_elements_of_type
 from py_app_dev.core.logging import logger
-from py_app_dev.core.pipeline import PipelineLoader
+from py_app_dev.core.pipeline import PipelineLoader, PipelineStepReference
 from yanga_core.domain.config import PlatformConfig
 from yanga_core.domain.execution_context import ExecutionContext
 
@@ -17,12 +16,15 @@ from .cmake_backend import (
     CMakeComment,
     CMakeCustomCommand,
     CMakeCustomTarget,
+    CMakeElement,
     CMakeMinimumVersion,
     CMakePath,
     CMakeProject,
     CMakeVariable,
 )
+from .concurrency import CMakeGeneratorsRunner
 from .generator import CMakeFile, CMakeGenerator, GeneratedFile, GeneratedFileIf
+from .ninja_backend import NinjaBuildFileGenerator, get_ninja_toolchain_config
 from .targets import Target, TargetsData, TargetType
 from .variant_config import ConfigCMakeGenerator
 
@@ -50,10 +52,13 @@ class CMakeBuildSystemGenerator:
         self,
         execution_context: ExecutionContext,
         output_dir: Path,
+        max_workers: int = 1,
     ):
         self.logger = logger.bind()
         self.execution_context = execution_context
         self.output_dir = output_dir
+        #: Number of threads used to run the generators. 1 runs them sequentially.
+        self.max_workers = max_workers
         # The directory where the CMakeLists.txt file is located
         self.cmake_current_list_dir = CMakePath(self.output_dir, "CMAKE_CURRENT_LIST_DIR")
         self.artifacts_locator = CMakeArtifactsLocator(output_dir, execution_context.spl_paths)
@@ -77,6 +82,19 @@ class CMakeBuildSystemGenerator:
         cmake_files.append(self.create_variant_cmake_file())
         files.extend(cmake_files)
         files.append(self.create_target_dependencies_file(cmake_files))
+        ninja_toolchain = get_ninja_toolchain_config(self.execution_context)
+        if ninja_toolchain:
+            elements = [element for cmake_file in cmake_files for element in cmake_file.content]
+            files.extend(
+                NinjaBuildFileGenerator(
+                    elements,
+                    ninja_toolchain,
+                    self.output_dir,
+                    self.execution_context.project_root_dir,
+                    self.variant_name,
+                    self.execution_context.user_request.build_type,
+                ).generate()
+            )
         return files
 
     def create_cmake_lists(self) -> CMakeFile:
@@ -102,18 +120,35 @@ class CMakeBuildSystemGenerator:
             cmake_file.append(cmake_build_dir_var)
         platform = self.execution_context.platform
         if platform:
+            steps: list[CMakeGenerator] = []
             try:
-                steps_references = PipelineLoader[CMakeGenerator](platform.generators, self.execution_context.project_root_dir).load_steps()
-                for step_reference in steps_references:
+                for step_reference in self.load_generators():
                     step = step_reference._class(self.execution_context, self.output_dir, step_reference.config)
-                    cmake_file.extend(step.generate())
-            except FileNotFoundError as e:
-                raise UserNotificationException(e) from e
+                    steps.append(step)
             except TypeError as e:
                 raise UserNotificationException(f"{e}. Please check {platform.file} for {step}.") from e
-        cmake_file.extend(ComponentCleanCMakeGenerator(self.execution_context, self.output_dir, existing_elements=cmake_file.content).generate())
+
+            def generate(step: CMakeGenerator) -> list[CMakeElement]:
+                try:
+                    return step.generate()
+                except TypeError as e:
+                    raise UserNotificationException(f"{e}. Please check {platform.file} for {step}.") from e
+
+            for elements in CMakeGeneratorsRunner(self.execution_context, self.max_workers).run(steps, generate):
+                cmake_file.extend(elements)
+        cmake_file.extend(ComponentCleanCMakeGenerator(self.execution_context, self.output_dir, element_index=cmake_file.index).generate())
         return cmake_file
 
+    def load_generators(self) -> list[PipelineStepReference[CMakeGenerator]]:
+        """Load the generator classes configured for the current platform."""
+        platform = self.execution_context.platform
+        if not platform:
+            return []
+        try:
+            return PipelineLoader[CMakeGenerator](platform.generators, self.execution_context.project_root_dir).load_steps()
+        except FileNotFoundError as e:
+            raise UserNotificationException(e) from e
+
     def create_config_cmake_file(self) -> CMakeFile:
         cmake_file = CMakeFile(self.config_cmake_file.to_path())
         config_generator = ConfigCMakeGenerator(self.execution_context, self.output_dir)
@@ -126,18 +161,13 @@ class CMakeBuildSystemGenerator:
         """
         Create a json file that contains the CMake target dependencies tree for the current variant and each component.
 
-        Parse all cmake files, search for the custom targets and their dependencies, and create a json file.
+        Query the element index of the cmake files for the custom targets and their dependencies, and create a json file.
         This file is required to create a graph of the targets and their dependencies.
         """
         targets: list[Target] = []
 
-        # Extract all elements from cmake files
-        all_elements = []
-        for cmake_file in cmake_files:
-            all_elements.extend(cmake_file.content)
-
         # Find all custom commands
-        custom_commands = find_elements_of_type(all_elements, CMakeCustomCommand)
+        custom_commands = [element for cmake_file in cmake_files for element in cmake_file.find_elements_of_type(CMakeCustomCommand)]
         for custom_command in custom_commands:
             dependencies = []
             outputs = []
@@ -167,7 +197,7 @@ class CMakeBuildSystemGenerator:
             )
 
         # Find all custom targets
-        custom_targets = find_elements_of_type(all_elements, CMakeCustomTarget)
+        custom_targets = [element for cmake_file in cmake_files for element in cmake_file.find_elements_of_type(CMakeCustomTarget)]
         for custom_target in custom_targets:
             dependencies = []
             outputs = []
@@ -197,7 +227,7 @@ class CMakeBuildSystemGenerator:
             )
 
         # Find all executables
-        executables = find_elements_of_type(all_elements, CMakeAddExecutable)
+        executables = [element for cmake_file in cmake_files for element in cmake_file.find_elements_of_type(CMakeAddExecutable)]
         for executable in executables:
             dependencies = []
 
@@ -220,7 +250,7 @@ class CMakeBuildSystemGenerator:
             )
 
         # Find all object libraries
-        object_libraries = find_elements_of_type(all_elements, CMakeAddLibrary)
+        object_libraries = [element for cmake_file in cmake_files for element in cmake_file.find_elements_of_type(CMakeAddLibrary)]
         for obj_lib in object_libraries:
             targets.append(
                 Target(
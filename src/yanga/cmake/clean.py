@@ -6,7 +6,7 @@ from yanga_core.domain.execution_context import ExecutionContext, UserRequest, U
 
 from .artifacts_locator import CMakeArtifactsLocator
 from .cmake_backend import CMakeAddExecutable, CMakeAddLibrary, CMakeCommand, CMakeComment, CMakeCustomTarget, CMakeElement
-from .generator import CMakeGenerator
+from .generator import CMakeElementIndex, CMakeGenerator
 
 
 class ComponentCleanCMakeGenerator(CMakeGenerator):
@@ -25,15 +25,16 @@ class ComponentCleanCMakeGenerator(CMakeGenerator):
         output_dir: Path,
         config: Optional[dict[str, Any]] = None,
         existing_elements: Optional[list[CMakeElement]] = None,
+        element_index: Optional[CMakeElementIndex] = None,
     ) -> None:
         super().__init__(execution_context, output_dir, config)
         self.artifacts_locator = CMakeArtifactsLocator(output_dir, execution_context.spl_paths)
-        self.existing_elements = existing_elements or []
+        # Prefer the index maintained by the CMake file over indexing the element list again
+        self.element_index = element_index or CMakeElementIndex(existing_elements)
 
     def generate(self) -> list[CMakeElement]:
         elements: list[CMakeElement] = [CMakeComment(f"Generated by {self.__class__.__name__}")]
         cmake_build_root = self.artifacts_locator.cmake_build_dir.to_path().resolve(strict=False)
-        targets_by_component = self._index_tagged_targets()
 
         for component in self.execution_context.components:
             component_build_dir = self.artifacts_locator.get_component_build_dir(component.name)
@@ -45,7 +46,7 @@ class ComponentCleanCMakeGenerator(CMakeGenerator):
                 )
 
             commands = [CMakeCommand("${CMAKE_COMMAND}", ["-E", "rm", "-rf", component_build_dir])]
-            for target_name in targets_by_component.get(component.name, []):
+            for target_name in self._tagged_targets(component.name):
                 commands.append(CMakeCommand("${CMAKE_COMMAND}", ["-E", "rm", "-rf", f"${{CMAKE_BUILD_DIR}}/CMakeFiles/{target_name}.dir"]))
 
             clean_target_name = UserRequest(
@@ -62,12 +63,12 @@ class ComponentCleanCMakeGenerator(CMakeGenerator):
             )
         return elements
 
-    def _index_tagged_targets(self) -> dict[str, list[str]]:
-        """Index tagged add_library / add_executable elements by component name."""
-        index: dict[str, list[str]] = {}
-        for element in self.existing_elements:
-            if isinstance(element, CMakeAddLibrary) and element.component_name:
-                index.setdefault(element.component_name, []).append(element.target_name)
-            elif isinstance(element, CMakeAddExecutable) and element.component_name:
-                index.setdefault(element.component_name, []).append(element.name)
-        return index
+    def _tagged_targets(self, component_name: str) -> list[str]:
+        """Target names of the add_library / add_executable elements tagged with the component name."""
+        targets: list[str] = []
+        for element in self.element_index.find_component_elements(component_name):
+            if isinstance(element, CMakeAddLibrary):
+                targets.append(element.target_name)
+            elif isinstance(element, CMakeAddExecutable):
+                targets.append(element.name)
+        return targets
@@ -24,6 +24,8 @@ class IncludeScope(Enum):
 
 
 class CMakeElement(ABC):
+    # Empty slots allow the frequently instantiated subclasses to be slotted as well
+    __slots__ = ()
     tab_prefix = " " * 4
 
     @abstractmethod
@@ -35,6 +37,8 @@ class CMakeElement(ABC):
 
 
 class CMakeContent(CMakeElement):
+    __slots__ = ("content",)
+
     def __init__(self, content: str) -> None:
         super().__init__()
         self.content = content
@@ -44,11 +48,15 @@ class CMakeContent(CMakeElement):
 
 
 class CMakeEmptyLine(CMakeElement):
+    __slots__ = ()
+
     def to_string(self) -> str:
         return ""
 
 
 class CMakeComment(CMakeElement):
+    __slots__ = ("comment",)
+
     def __init__(self, comment: str) -> None:
         super().__init__()
         self.comment = comment
@@ -76,6 +84,8 @@ class CMakeMinimumVersion(CMakeElement):
 
 
 class CMakeAddLibrary(CMakeElement):
+    __slots__ = ("compile_options", "component_name", "files", "name", "type")
+
     def __init__(
         self,
         name: str,
@@ -132,32 +142,66 @@ class CMakeVariable(CMakeElement):
         return "set(" + " ".join(arguments) + ")"
 
 
+_set_slot = object.__setattr__
+
+
 class CMakePath:
+    """
+    Path which is rendered relative to a CMake variable (e.g. ``${CMAKE_BUILD_DIR}/CompA``).
+
+    Instances are immutable and hashable, so they can be used in sets and as dict keys.
+    The string and path forms are computed once, on first use.
+    """
+
+    __slots__ = ("_full_path", "_hash", "_string", "path", "relative_path", "variable")
+
+    path: Path
+    variable: Optional[str]
+    relative_path: Optional[Path]
+    _string: str
+    _full_path: Path
+    _hash: int
+
     def __init__(
         self,
         path: Path,
         variable: Optional[str] = None,
         relative_path: Optional[Path] = None,
     ) -> None:
-        super().__init__()
-        self.path = path
-        self.variable = variable
-        self.relative_path = relative_path
+        # The cache slots stay unset until first use
+        _set_slot(self, "path", path)
+        _set_slot(self, "variable", variable)
+        _set_slot(self, "relative_path", relative_path)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self) -> tuple[type["CMakePath"], tuple[Path, Optional[str], Optional[Path]]]:
+        return (self.__class__, (self.path, self.variable, self.relative_path))
 
     def to_cmake_element(self) -> Optional[CMakeElement]:
         return CMakeVariable(self.variable, self.to_path().as_posix()) if self.variable else None
 
     def to_string(self) -> str:
-        if self.variable:
-            path = f"${{{self.variable}}}"
-        else:
-            path = self.path.as_posix()
-        if self.relative_path:
-            path += f"/{self.relative_path.as_posix()}"
-        return path
+        try:
+            return self._string
+        except AttributeError:
+            string = f"${{{self.variable}}}" if self.variable else self.path.as_posix()
+            if self.relative_path:
+                string += f"/{self.relative_path.as_posix()}"
+            _set_slot(self, "_string", string)
+            return string
 
     def to_path(self) -> Path:
-        return self.path / self.relative_path if self.relative_path else self.path
+        try:
+            return self._full_path
+        except AttributeError:
+            full_path = self.path / self.relative_path if self.relative_path else self.path
+            _set_slot(self, "_full_path", full_path)
+            return full_path
 
     def joinpath(self, path: str) -> "CMakePath":
         rel_path = self.relative_path / path if self.relative_path else Path(path)
@@ -166,6 +210,9 @@ class CMakePath:
     def __str__(self) -> str:
         return self.to_string()
 
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self.path!r}, variable={self.variable!r}, relative_path={self.relative_path!r})"
+
     def with_suffix(self, suffix: str) -> "CMakePath":
         if self.relative_path:
             new_relative_path = self.relative_path.with_suffix(suffix)
@@ -175,12 +222,55 @@ class CMakePath:
             return CMakePath(new_path, self.variable, None)
 
     def __eq__(self, value: object) -> bool:
+        if self is value:
+            return True
         if not isinstance(value, CMakePath):
             return False
         return self.path == value.path and self.relative_path == value.relative_path
 
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            # Consistent with __eq__, which ignores the variable
+            hash_value = hash((self.path, self.relative_path))
+            _set_slot(self, "_hash", hash_value)
+            return hash_value
+
+
+class CMakePathInterner:
+    """
+    Intern table for CMake paths.
+
+    Equal paths built repeatedly (e.g. the component build dir for every target of a component)
+    share one instance, together with its cached string and path forms.
+    """
+
+    def __init__(self) -> None:
+        self._paths: dict[tuple[Path, Optional[str], Optional[Path]], CMakePath] = {}
+        self._joined: dict[tuple[int, str], CMakePath] = {}
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def intern(self, path: CMakePath) -> CMakePath:
+        # The variable is part of the key because it changes the rendering
+        return self._paths.setdefault((path.path, path.variable, path.relative_path), path)
+
+    def joinpath(self, base: CMakePath, path: str) -> CMakePath:
+        """Interned ``base.joinpath(path)``. The lookup does not create any path object if it was already joined."""
+        interned_base = self.intern(base)
+        # Keyed by the identity of the interned base, which is kept alive by the table
+        key = (id(interned_base), path)
+        joined = self._joined.get(key)
+        if joined is None:
+            joined = self._joined[key] = self.intern(interned_base.joinpath(path))
+        return joined
+
 
 class CMakeInclude(CMakeElement):
+    __slots__ = ("path",)
+
     def __init__(self, path: str | CMakePath) -> None:
         super().__init__()
         self.path = path
@@ -190,6 +280,8 @@ class CMakeInclude(CMakeElement):
 
 
 class CMakeIncludeDirectories(CMakeElement):
+    __slots__ = ("paths",)
+
     def __init__(self, paths: list[CMakePath]) -> None:
         super().__init__()
         self.paths = paths
@@ -205,6 +297,8 @@ class CMakeIncludeDirectories(CMakeElement):
 
 
 class CMakeTargetIncludeDirectories(CMakeElement):
+    __slots__ = ("paths", "scope", "target_name")
+
     def __init__(self, target_name: str, paths: list[CMakePath], scope: IncludeScope = IncludeScope.PRIVATE) -> None:
         super().__init__()
         self.target_name = target_name
@@ -218,6 +312,37 @@ class CMakeTargetIncludeDirectories(CMakeElement):
         return f"target_include_directories({self.target_name} {self.scope.name} {paths_str})"
 
 
+class CMakeTargetPrecompileHeaders(CMakeElement):
+    """
+    Precompile headers for a target, or reuse the precompiled headers of another target.
+
+    System headers are given in angle brackets (``<vector>``), all other headers as paths.
+    """
+
+    __slots__ = ("headers", "reuse_from", "scope", "target_name")
+
+    def __init__(
+        self,
+        target_name: str,
+        headers: list[str | CMakePath] | None = None,
+        scope: IncludeScope = IncludeScope.PRIVATE,
+        reuse_from: Optional[str] = None,
+    ) -> None:
+        super().__init__()
+        self.target_name = target_name
+        self.headers = headers or []
+        self.scope = scope
+        self.reuse_from = reuse_from
+
+    def to_string(self) -> str:
+        if self.reuse_from:
+            return f"target_precompile_headers({self.target_name} REUSE_FROM {self.reuse_from})"
+        if not self.headers:
+            return ""
+        headers_str = " ".join(str(header) for header in self.headers)
+        return f"target_precompile_headers({self.target_name} {self.scope.name} {headers_str})"
+
+
 @dataclass
 class CMakeAddExecutable(CMakeElement):
     name: str
@@ -310,6 +435,8 @@ class CMakeAddTargetCleanFiles(CMakeElement):
 
 
 class CMakeCommand(CMakeElement):
+    __slots__ = ("arguments", "command")
+
     def __init__(self, command: str | CMakePath, arguments: list[str | CMakePath]) -> None:
         super().__init__()
         self.command = command
@@ -348,6 +475,8 @@ class CMakeExecuteProcess(CMakeElement):
 
 
 class CMakeDepends(CMakeElement):
+    __slots__ = ("depends",)
+
     def __init__(self, depends: Sequence[str | CMakePath]) -> None:
         super().__init__()
         self.depends = depends
@@ -357,6 +486,8 @@ class CMakeDepends(CMakeElement):
 
 
 class CMakeByproducts(CMakeElement):
+    __slots__ = ("byproducts",)
+
     def __init__(self, byproducts: list[CMakePath]) -> None:
         super().__init__()
         self.byproducts = byproducts
@@ -533,3 +664,33 @@ class CMakeEnableTesting(CMakeElement):
 
     def to_string(self) -> str:
         return "enable_testing()"
+
+
+@dataclass
+class CMakeAddTest(CMakeElement):
+    """
+    Register a test to be run by CTest.
+
+    If ``command`` is an executable target name, CMake replaces it with the path of the executable.
+    https://cmake.org/cmake/help/latest/command/add_test.html
+    """
+
+    name: str
+    command: str | CMakePath
+    arguments: list[str | CMakePath] = field(default_factory=list)
+
+    def to_string(self) -> str:
+        return f"add_test(NAME {self.name} COMMAND " + " ".join(str(arg) for arg in [self.command, *self.arguments]) + ")"
+
+
+@dataclass
+class CMakeSetTestsProperties(CMakeElement):
+    tests: list[str]
+    properties: dict[str, str | CMakePath]
+
+    def to_string(self) -> str:
+        if not self.tests or not self.properties:
+            return ""
+        # The values are quoted, list values like the ENVIRONMENT are separated by semicolons
+        props = " ".join(f'{key} "{value}"' for key, value in self.properties.items())
+        return f"set_tests_properties({' '.join(self.tests)} PROPERTIES {props})"
@@ -0,0 +1,157 @@
+"""
+Concurrent execution of the CMake generators.
+
+With more than one worker, the generators run in worker threads. Their data registry inserts are buffered and committed to the
+run registry in the configured generator order, so the result is identical to a sequential run.
+"""
+
+import contextvars
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from py_app_dev.core.data_registry import DataEntry, DataRegistry
+from py_app_dev.core.logging import logger
+from yanga_core.domain.execution_context import ExecutionContext
+
+from .cmake_backend import CMakeElement
+from .generator import CMakeGenerator
+
+T = TypeVar("T")
+TItem = TypeVar("TItem")
+
+#: Registry scope of the generator (or component) running in the current context
+_active_scope: contextvars.ContextVar[Optional["DataRegistryScope"]] = contextvars.ContextVar("yanga_generation_scope", default=None)
+#: Number of worker threads available for nested parallel generation (e.g. per component)
+_max_workers: contextvars.ContextVar[int] = contextvars.ContextVar("yanga_generation_max_workers", default=1)
+
+
+class DataRegistryScope(DataRegistry):
+    """Buffered view on a registry: reads see the parent and the own inserts, inserts are committed to the parent on request."""
+
+    def __init__(self, parent: DataRegistry) -> None:
+        super().__init__()
+        self.parent = parent
+        self.entries: list[DataEntry] = []
+
+    def insert(self, data: Any, provider: str) -> None:
+        self.entries.append(DataEntry(data, provider))
+
+    def find_entries(self, data_type: type[T]) -> list[DataEntry]:
+        type_name = self._get_type_name(data_type)
+        return [*self.parent.find_entries(data_type), *(entry for entry in self.entries if self._get_type_name(type(entry.data)) == type_name)]
+
+    def commit(self) -> None:
+        for entry in self.entries:
+            self.parent.insert(entry.data, entry.provider_name)
+        self.entries = []
+
+
+class ScopedDataRegistry(DataRegistry):
+    """Installed on the execution context during generation. Forwards to the scope of the calling generator."""
+
+    def __init__(self, registry: DataRegistry) -> None:
+        super().__init__()
+        self.registry = registry
+
+    @property
+    def current(self) -> DataRegistry:
+        return _active_scope.get() or self.registry
+
+    def insert(self, data: Any, provider: str) -> None:
+        self.current.insert(data, provider)
+
+    def find_entries(self, data_type: type[T]) -> list[DataEntry]:
+        return self.current.find_entries(data_type)
+
+
+def _run_in_scope(scope: DataRegistryScope, max_workers: int, function: Callable[[], T]) -> T:
+    _active_scope.set(scope)
+    _max_workers.set(max_workers)
+    return function()
+
+
+def _depends_on(generator: CMakeGenerator, previous: CMakeGenerator) -> bool:
+    """A generator waits for a previous one if it reads what the previous one inserts. Undeclared generators wait for (and block) all others."""
+    if generator.consumes is None or previous.produces is None:
+        return True
+    return any(issubclass(produced, consumed) for produced in previous.produces for consumed in generator.consumes)
+
+
+class CMakeGeneratorsRunner:
+    """
+    Run the generators concurrently and return their elements in the generators order.
+
+    A generator only starts when all previous generators producing a data registry type it consumes
+    have been committed. Generators without ``produces``/``consumes`` declarations run alone.
+    """
+
+    def __init__(self, execution_context: ExecutionContext, max_workers: int = 1) -> None:
+        self.logger = logger.bind()
+        self.execution_context = execution_context
+        self.max_workers = max_workers
+
+    def run(self, generators: Sequence[CMakeGenerator], generate: Callable[[CMakeGenerator], list[CMakeElement]]) -> list[list[CMakeElement]]:
+        if self.max_workers <= 1 or len(generators) <= 1:
+            return [generate(generator) for generator in generators]
+        registry = self.execution_context.data_registry
+        self.execution_context.data_registry = ScopedDataRegistry(registry)
+        try:
+            return self._run(registry, generators, generate)
+        finally:
+            self.execution_context.data_registry = registry
+
+    def _run(self, registry: DataRegistry, generators: Sequence[CMakeGenerator], generate: Callable[[CMakeGenerator], list[CMakeElement]]) -> list[list[CMakeElement]]:
+        scopes = [DataRegistryScope(registry) for _ in generators]
+        committed = [threading.Event() for _ in generators]
+        failed = threading.Event()
+
+        def task(index: int) -> list[CMakeElement]:
+            for previous in range(index):
+                if _depends_on(generators[index], generators[previous]):
+                    committed[previous].wait()
+                    if failed.is_set():
+                        return []
+            return _run_in_scope(scopes[index], self.max_workers, partial(generate, generators[index]))
+
+        results: list[list[CMakeElement]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="yanga_generator") as executor:
+            # Tasks start in submission order, so a task only ever waits for tasks which already started
+            futures = [executor.submit(contextvars.copy_context().run, task, index) for index in range(len(generators))]
+            try:
+                for index, future in enumerate(futures):
+                    results.append(future.result())
+                    scopes[index].commit()
+                    committed[index].set()
+            except BaseException:
+                failed.set()
+                for event in committed:
+                    event.set()
+                raise
+        return results
+
+
+def generate_in_order(items: Sequence[TItem], generate: Callable[[TItem], list[T]]) -> list[T]:
+    """
+    Generate the elements for all items (e.g. components) and concatenate them in the items order.
+
+    When called by a generator run through :class:`CMakeGeneratorsRunner`, the items are processed in
+    worker threads. The data registry inserts of every item are committed in the items order.
+    Otherwise, the items are processed sequentially.
+    """
+    scope = _active_scope.get()
+    max_workers = _max_workers.get()
+    if scope is None or max_workers <= 1 or len(items) <= 1:
+        return [element for item in items for element in generate(item)]
+    item_scopes = [DataRegistryScope(scope) for _ in items]
+    elements: list[T] = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix="yanga_component") as executor:
+        futures: list[Future[list[T]]] = [
+            executor.submit(contextvars.copy_context().run, _run_in_scope, item_scope, 1, partial(generate, item)) for item, item_scope in zip(items, item_scopes)
+        ]
+        for future, item_scope in zip(futures, item_scopes):
+            elements.extend(future.result())
+            item_scope.commit()
+    return elements
@@ -1,5 +1,8 @@
+import gzip
+import json
 from dataclasses import dataclass
 from pathlib import Path
+from typing import IO, Any, Literal, cast
 
 from yanga_core.domain.execution_context import UserRequest
 from yanga_core.domain.spl_paths import SPLPaths
@@ -7,6 +10,22 @@ from yanga_core.domain.spl_paths import SPLPaths
 from .artifacts_locator import CMakeArtifactsLocator
 from .cmake_backend import CMakePath
 
+#: gcovr writes and reads gzip compressed reports if the file name ends with this suffix
+GZIP_SUFFIX = ".gz"
+
+
+def open_coverage_report(file: Path, mode: Literal["r", "w"] = "r") -> IO[str]:
+    if file.name.endswith(GZIP_SUFFIX):
+        return cast(IO[str], gzip.open(file, f"{mode}t", encoding="utf-8"))
+    return file.open(mode, encoding="utf-8")
+
+
+def load_coverage_report(file: Path) -> dict[str, Any]:
+    """Load a gcovr JSON report, plain or gzip compressed."""
+    with open_coverage_report(file) as report:
+        data: dict[str, Any] = json.load(report)
+    return data
+
 
 @dataclass
 class CoverageRelevantFile:
@@ -32,17 +51,17 @@ class CoverageArtifactsLocator(CMakeArtifactsLocator):
 
     def get_component_coverage_reports_dir(self, component_name: str) -> CMakePath:
         """Path inside the component reports dir where the coverage report is located."""
-        return self.get_component_reports_dir(component_name).joinpath(self._get_component_coverage_reports_relative_dir(component_name))
+        return self.paths.joinpath(self.get_component_reports_dir(component_name), self._get_component_coverage_reports_relative_dir(component_name))
 
     def get_component_variant_coverage_reports_dir(self, component_name: str) -> CMakePath:
         """Path inside the variant reports dir where the component coverage report shall be located."""
-        return self.cmake_variant_reports_dir.joinpath(self._get_component_coverage_reports_relative_dir(component_name))
+        return self.paths.joinpath(self.cmake_variant_reports_dir, self._get_component_coverage_reports_relative_dir(component_name))
 
     def get_component_coverage_html_file(self, component_name: str) -> CMakePath:
-        return self.get_component_coverage_reports_dir(component_name).joinpath("index.html")
+        return self.paths.joinpath(self.get_component_coverage_reports_dir(component_name), "index.html")
 
     def get_variant_coverage_reports_dir(self) -> CMakePath:
-        return self.cmake_variant_reports_dir.joinpath("coverage")
+        return self.paths.joinpath(self.cmake_variant_reports_dir, "coverage")
 
     def get_variant_coverage_html_file(self) -> CMakePath:
-        return self.get_variant_coverage_reports_dir().joinpath("index.html")
+        return self.paths.joinpath(self.get_variant_coverage_reports_dir(), "index.html")
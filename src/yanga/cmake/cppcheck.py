@@ -1,15 +1,20 @@
 from pathlib import Path
 from typing import Any, Optional
 
+from yanga_core.domain.components import Component
 from yanga_core.domain.execution_context import ExecutionContext, UserRequest, UserRequestScope, UserRequestTarget
 from yanga_core.domain.reports import ReportRelevantFiles, ReportRelevantFileType
 
 from yanga.cmake.artifacts_locator import BuildArtifact, CMakeArtifactsLocator
 from yanga.cmake.cmake_backend import CMakeCommand, CMakeComment, CMakeCustomCommand, CMakeCustomTarget, CMakeElement, CMakePath
+from yanga.cmake.concurrency import generate_in_order
 from yanga.cmake.generator import CMakeGenerator
 
 
 class CppCheckCMakeGenerator(CMakeGenerator):
+    produces = (ReportRelevantFiles,)
+    consumes = ()
+
     def __init__(
         self,
         execution_context: ExecutionContext,
@@ -78,83 +83,84 @@ class CppCheckCMakeGenerator(CMakeGenerator):
         return elements
 
     def create_components_cmake_elements(self) -> list[CMakeElement]:
-        elements: list[CMakeElement] = []
-        for component in self.execution_context.components:
-            sources = component.sources
-            component_compile_commands_file = self.artifacts_locator.get_component_build_artifact(component.name, BuildArtifact.COMPILE_COMMANDS)
-            xml_report_file = self.artifacts_locator.get_component_build_dir(component.name).joinpath("cppcheck_report.xml")
-            md_report_file = self.artifacts_locator.get_component_build_dir(component.name).joinpath("cppcheck_report.md")
+        return generate_in_order(self.execution_context.components, self.create_component_cmake_elements)
 
-            # TODO: Make sure the cpp commands depends on the component objects being built
-            compile_filter_command = CMakeCustomCommand(
-                description=f"Run cppcheck for component {component.name}",
-                outputs=[component_compile_commands_file, xml_report_file, md_report_file],
-                depends=[],
-                commands=[
-                    CMakeCommand(
-                        "yanga_cmd",
-                        [
-                            "filter_compile_commands",
-                            "--compilation-database",
-                            self.artifacts_locator.get_build_artifact(BuildArtifact.COMPILE_COMMANDS),
-                            "--source-files",
-                            *[CMakePath(src) for src in sources],
-                            "--output-file",
-                            component_compile_commands_file,
-                        ],
-                    ),
-                    CMakeCommand(
-                        "cppcheck",
-                        [
-                            "--enable=all",
-                            "--inconclusive",
-                            "--std=c11",
-                            "--language=c",
-                            "--project=" + str(component_compile_commands_file),
-                            "--xml",
-                            "2> " + str(xml_report_file),
-                        ],
-                    ),
-                    CMakeCommand(
-                        "yanga_cmd",
-                        [
-                            "cppcheck_report",
-                            "--input-file",
-                            xml_report_file,
-                            "--output-file",
-                            md_report_file,
-                            "--project-dir",
-                            CMakePath(self.execution_context.project_root_dir),
-                        ],
-                    ),
-                ],
-            )
-            elements.append(compile_filter_command)
-            # Add custom target for linting the component
-            component_lint_target = UserRequest(
-                UserRequestScope.COMPONENT,
-                component_name=component.name,
-                target=UserRequestTarget.LINT,
-            )
+    def create_component_cmake_elements(self, component: Component) -> list[CMakeElement]:
+        elements: list[CMakeElement] = []
+        sources = component.sources
+        component_compile_commands_file = self.artifacts_locator.get_component_build_artifact(component.name, BuildArtifact.COMPILE_COMMANDS)
+        xml_report_file = self.artifacts_locator.get_component_build_dir(component.name).joinpath("cppcheck_report.xml")
+        md_report_file = self.artifacts_locator.get_component_build_dir(component.name).joinpath("cppcheck_report.md")
 
-            elements.append(
-                CMakeCustomTarget(
-                    component_lint_target.target_name,
-                    f"Lint the {component.name} component",
-                    [],
-                    compile_filter_command.outputs,
-                )
-            )
-            # Register the component lint md report as relevant for the component report
-            self.execution_context.data_registry.insert(
-                ReportRelevantFiles(
-                    target=component_lint_target,
-                    files_to_be_included=[
-                        md_report_file.to_path(),
+        # TODO: Make sure the cpp commands depends on the component objects being built
+        compile_filter_command = CMakeCustomCommand(
+            description=f"Run cppcheck for component {component.name}",
+            outputs=[component_compile_commands_file, xml_report_file, md_report_file],
+            depends=[],
+            commands=[
+                CMakeCommand(
+                    "yanga_cmd",
+                    [
+                        "filter_compile_commands",
+                        "--compilation-database",
+                        self.artifacts_locator.get_build_artifact(BuildArtifact.COMPILE_COMMANDS),
+                        "--source-files",
+                        *[CMakePath(src) for src in sources],
+                        "--output-file",
+                        component_compile_commands_file,
                     ],
-                    file_type=ReportRelevantFileType.LINT_RESULT,
                 ),
+                CMakeCommand(
+                    "cppcheck",
+                    [
+                        "--enable=all",
+                        "--inconclusive",
+                        "--std=c11",
+                        "--language=c",
+                        "--project=" + str(component_compile_commands_file),
+                        "--xml",
+                        "2> " + str(xml_report_file),
+                    ],
+                ),
+                CMakeCommand(
+                    "yanga_cmd",
+                    [
+                        "cppcheck_report",
+                        "--input-file",
+                        xml_report_file,
+                        "--output-file",
+                        md_report_file,
+                        "--project-dir",
+                        CMakePath(self.execution_context.project_root_dir),
+                    ],
+                ),
+            ],
+        )
+        elements.append(compile_filter_command)
+        # Add custom target for linting the component
+        component_lint_target = UserRequest(
+            UserRequestScope.COMPONENT,
+            component_name=component.name,
+            target=UserRequestTarget.LINT,
+        )
+
+        elements.append(
+            CMakeCustomTarget(
                 component_lint_target.target_name,
+                f"Lint the {component.name} component",
+                [],
+                compile_filter_command.outputs,
             )
-
+        )
+        # Register the component lint md report as relevant for the component report
+        self.execution_context.data_registry.insert(
+            ReportRelevantFiles(
+                target=component_lint_target,
+                files_to_be_included=[
+                    md_report_file.to_path(),
+                ],
+                file_type=ReportRelevantFileType.LINT_RESULT,
+            ),
+            component_lint_target.target_name,
+        )
         return elements
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
@@ -26,18 +26,27 @@ from .cmake_backend import (
     CMakeTargetIncludeDirectories,
     IncludeScope,
 )
+from .concurrency import generate_in_order
 from .generator import CMakeGenerator
+from .precompiled_headers import PrecompiledHeaders, PrecompiledHeadersConfig
 
 
 @dataclass
 class CreateExecutableConfig(DataClassDictMixin):
     #: If this is enabled, all includes are defined globally and not component specific
     use_global_includes: bool = True
+    #: Precompiled headers for the component libraries
+    precompiled_headers: Optional[PrecompiledHeadersConfig] = None
+    #: Component specific precompiled headers configuration. It replaces the ``precompiled_headers`` configuration for the given components.
+    component_precompiled_headers: dict[str, PrecompiledHeadersConfig] = field(default_factory=dict)
 
 
 class CreateExecutableCMakeGenerator(CMakeGenerator):
     """Generates CMake elements to build an executable for a variant."""
 
+    produces = ()
+    consumes = (Artifact,)
+
     def __init__(self, execution_context: ExecutionContext, output_dir: Path, config: Optional[dict[str, Any]] = None) -> None:
         super().__init__(execution_context, output_dir, config)
 
@@ -102,46 +111,71 @@ class CreateExecutableCMakeGenerator(CMakeGenerator):
         include_dirs = resolve_include_directories([component]) + registry_dirs
         return [CMakePath(path) for path in include_dirs]
 
+    @cached_property
+    def precompiled_headers(self) -> PrecompiledHeaders:
+        precompiled_headers = PrecompiledHeaders(self.execution_context.project_root_dir, self.config_obj.precompiled_headers)
+        # The first component library using the generator configuration precompiles the headers for all others
+        precompiled_headers.reuse_target = next(
+            (
+                CMakeAddLibrary(component.name).target_name
+                for component in self.execution_context.components
+                if component.sources and component.name not in self.config_obj.component_precompiled_headers
+            ),
+            None,
+        )
+        return precompiled_headers
+
     def create_components_cmake_elements(self) -> list[CMakeElement]:
+        return generate_in_order(self.execution_context.components, self.create_component_cmake_elements)
+
+    def create_component_cmake_elements(self, component: Component) -> list[CMakeElement]:
         elements: list[CMakeElement] = []
-        for component in self.execution_context.components:
-            sources = component.sources
-            component_library = CMakeAddLibrary(component.name, sources, component_name=component.name)
-            elements.append(component_library)
-
-            # Add component-specific include directories when global includes are disabled
-            if not self.config_obj.use_global_includes:
-                include_dirs: list[CMakePath] = self.get_component_include_directories(component)
-                if include_dirs:
-                    # Determine include scope: use PRIVATE for libraries with sources, INTERFACE for header-only
-                    scope = IncludeScope.INTERFACE if not sources else IncludeScope.PRIVATE
-                    target_includes = CMakeTargetIncludeDirectories(component_library.target_name, include_dirs, scope)
-                    elements.append(target_includes)
-
-            elements.append(
-                CMakeCustomTarget(
-                    UserRequest(
-                        UserRequestScope.COMPONENT,
-                        self.variant_name,
-                        component.name,
-                        UserRequestTarget.COMPILE,
-                    ).target_name,
-                    f"Compile component {component.name}",
-                    [],
-                    [component_library.target_name],
-                )
+        sources = component.sources
+        component_library = CMakeAddLibrary(component.name, sources, component_name=component.name)
+        elements.append(component_library)
+
+        # Add component-specific include directories when global includes are disabled
+        if not self.config_obj.use_global_includes:
+            include_dirs: list[CMakePath] = self.get_component_include_directories(component)
+            if include_dirs:
+                # Determine include scope: use PRIVATE for libraries with sources, INTERFACE for header-only
+                scope = IncludeScope.INTERFACE if not sources else IncludeScope.PRIVATE
+                target_includes = CMakeTargetIncludeDirectories(component_library.target_name, include_dirs, scope)
+                elements.append(target_includes)
+
+        # Header only components are not compiled, there is nothing to precompile
+        if sources:
+            precompile_headers = self.precompiled_headers.create(
+                component_library.target_name,
+                self.config_obj.component_precompiled_headers.get(component.name, self.config_obj.precompiled_headers),
             )
-            elements.append(
-                CMakeCustomTarget(
-                    UserRequest(
-                        UserRequestScope.COMPONENT,
-                        self.variant_name,
-                        component.name,
-                        UserRequestTarget.BUILD,
-                    ).target_name,
-                    f"Compile component {component.name}",
-                    [],
-                    [component_library.target_name],
-                )
+            if precompile_headers:
+                elements.append(precompile_headers)
+
+        elements.append(
+            CMakeCustomTarget(
+                UserRequest(
+                    UserRequestScope.COMPONENT,
+                    self.variant_name,
+                    component.name,
+                    UserRequestTarget.COMPILE,
+                ).target_name,
+                f"Compile component {component.name}",
+                [],
+                [component_library.target_name],
+            )
+        )
+        elements.append(
+            CMakeCustomTarget(
+                UserRequest(
+                    UserRequestScope.COMPONENT,
+                    self.variant_name,
+                    component.name,
+                    UserRequestTarget.BUILD,
+                ).target_name,
+                f"Compile component {component.name}",
+                [],
+                [component_library.target_name],
             )
+        )
         return elements
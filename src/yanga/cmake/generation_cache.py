@@ -0,0 +1,184 @@
+"""Fingerprint based cache for the build system generation."""
+
+import hashlib
+import inspect
+import pickle
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, TypeVar
+
+from py_app_dev.core.data_registry import DataEntry, DataRegistry
+from py_app_dev.core.logging import logger
+from py_app_dev.core.pipeline import PipelineStepReference
+from pypeline.domain.external_project import ExternalProject
+from yanga_core.domain.artifact import Artifact
+from yanga_core.domain.config import ConfigFile
+from yanga_core.domain.execution_context import ExecutionContext
+
+from yanga import __version__
+
+from .generator import CMakeGenerator
+
+T = TypeVar("T")
+
+
+class RecordingDataRegistry(DataRegistry):
+    """Forwards to the run data registry and records every inserted entry."""
+
+    def __init__(self, registry: DataRegistry) -> None:
+        super().__init__()
+        self.registry = registry
+        self.entries: list[DataEntry] = []
+
+    def insert(self, data: Any, provider: str) -> None:
+        self.registry.insert(data, provider)
+        self.entries.append(DataEntry(data, provider))
+
+    def find_data(self, data_type: type[T]) -> list[T]:
+        return self.registry.find_data(data_type)
+
+    def find_entries(self, data_type: type[T]) -> list[DataEntry]:
+        return self.registry.find_entries(data_type)
+
+
+def collect_source_files(classes: Iterable[type[Any]]) -> set[Path]:
+    """Source files of the ``yanga.cmake`` package and of the given classes, including their base classes."""
+    files: set[Path] = set(Path(__file__).parent.glob("*.py"))
+    for class_ in classes:
+        for cls in inspect.getmro(class_):
+            try:
+                source_file = inspect.getsourcefile(cls)
+            except TypeError:
+                # Builtin classes have no source file
+                continue
+            if source_file:
+                files.add(Path(source_file))
+    return files
+
+
+def hash_parts(parts: Iterable[str], files: Iterable[Path] = ()) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    for file in files:
+        hasher.update(file.as_posix().encode("utf-8"))
+        hasher.update(file.read_bytes() if file.is_file() else b"<missing>")
+    return hasher.hexdigest()
+
+
+class GenerationFingerprint:
+    """
+    Digest of everything the build system generation depends on.
+
+    Covers the yanga version, the sources of the generator modules (including their base classes
+    and the ``yanga.cmake`` package itself), the generators configuration, the resolved components,
+    the data the generators read from the registry and the content of the relevant config files.
+    The source hashes keep the cache upgrade-safe even for editable installs where the version does not change.
+    """
+
+    def __init__(self, execution_context: ExecutionContext, generators: list[PipelineStepReference[CMakeGenerator]]) -> None:
+        self.execution_context = execution_context
+        self.generators = generators
+
+    @property
+    def digest(self) -> str:
+        return hash_parts(self._collect_parts(), self._collect_files())
+
+    def _collect_parts(self) -> list[str]:
+        context = self.execution_context
+        parts = [
+            __version__,
+            str(context.variant_name),
+            repr(context.platform),
+            repr(context.variant),
+            repr(context.project_configs),
+            repr(context.components),
+            repr(context.data_registry.find_data(Artifact)),
+            repr(context.data_registry.find_data(ExternalProject)),
+        ]
+        parts.extend(f"{reference.group_name}:{reference._class.__module__}.{reference._class.__qualname__}:{reference.config!r}" for reference in self.generators)
+        return parts
+
+    def _collect_files(self) -> list[Path]:
+        files = collect_source_files(reference._class for reference in self.generators)
+        files.update(self.execution_context.user_config_files)
+        if self.execution_context.features_selection_file:
+            files.add(self.execution_context.features_selection_file)
+        files.update(self._resolve_config_file(config) for config in self._collect_config_files() if config.file)
+        return sorted(files)
+
+    def _collect_config_files(self) -> list[ConfigFile]:
+        context = self.execution_context
+        configs = list(context.project_configs)
+        if context.variant:
+            configs.extend(context.variant.configs)
+            for variant_platform in (context.variant.platforms or {}).values():
+                configs.extend(variant_platform.configs)
+        if context.platform:
+            configs.extend(context.platform.configs)
+        return configs
+
+    def _resolve_config_file(self, config: ConfigFile) -> Path:
+        """Mirror the resolution order of ``parse_config``: next to the declaring yaml first, then the project root."""
+        file = Path(str(config.file))
+        if config.location and config.location.file and not file.is_absolute():
+            candidate = config.location.file.parent / file
+            if candidate.exists():
+                return candidate
+        return self.execution_context.project_root_dir / file
+
+
+@dataclass
+class GenerationSnapshot:
+    """Persisted result of a generation run: the data registry entries it inserted and the files it wrote."""
+
+    fingerprint: str
+    entries: list[tuple[Any, str]] = field(default_factory=list)
+    generated_files: list[Path] = field(default_factory=list)
+
+
+class GenerationCache:
+    """Stores the generation snapshot in the variant build dir and restores it when the fingerprint matches."""
+
+    SNAPSHOT_FILE = ".yanga_generation.pickle"
+
+    def __init__(self, output_dir: Path) -> None:
+        self.logger = logger.bind()
+        self.snapshot_file = output_dir / self.SNAPSHOT_FILE
+
+    def load(self, fingerprint: str) -> Optional[GenerationSnapshot]:
+        """Return the stored snapshot if it matches the fingerprint and all the generated files still exist."""
+        if not self.snapshot_file.is_file():
+            return None
+        try:
+            # The snapshot is written and read back only by yanga in the variant build dir
+            snapshot = pickle.loads(self.snapshot_file.read_bytes())  # noqa: S301
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError) as e:
+            self.logger.debug(f"Ignore unreadable generation snapshot {self.snapshot_file}: {e}")
+            return None
+        if not isinstance(snapshot, GenerationSnapshot) or snapshot.fingerprint != fingerprint:
+            return None
+        if not all(file.is_file() for file in snapshot.generated_files):
+            return None
+        return snapshot
+
+    def store(self, snapshot: GenerationSnapshot) -> None:
+        try:
+            content = pickle.dumps(snapshot)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            # Data registered by generators loaded from user files can not be pickled. Always regenerate in this case.
+            self.logger.debug(f"Generation snapshot can not be stored: {e}")
+            self.clear()
+            return
+        self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        self.snapshot_file.write_bytes(content)
+
+    def clear(self) -> None:
+        self.snapshot_file.unlink(missing_ok=True)
+
+
+def restore_entries(registry: DataRegistry, snapshot: GenerationSnapshot) -> None:
+    for data, provider in snapshot.entries:
+        registry.insert(data, provider)
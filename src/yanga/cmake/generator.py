@@ -1,18 +1,86 @@
+import hashlib
+import heapq
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, ClassVar, Optional, TypeVar
 
+from py_app_dev.core.logging import logger
 from yanga_core.domain.execution_context import ExecutionContext
 from yanga_core.domain.generated_file import GeneratedFile, GeneratedFileIf
 
 from .cmake_backend import CMakeElement
 
-__all__ = ["CMakeFile", "CMakeGenerator", "GeneratedFile", "GeneratedFileIf"]
+__all__ = ["CMakeElementIndex", "CMakeFile", "CMakeGenerator", "GeneratedFile", "GeneratedFileIf", "GeneratedFilesWriter", "write_if_changed"]
+
+T = TypeVar("T")
+
+
+def _content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    try:
+        # Read in text mode to compare against the same newline translation the writer applies
+        return _content_digest(path.read_text())
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write ``content`` to ``path`` only if it differs from what is already on disk.
+
+    The file is replaced atomically (write to a sibling temp file, then rename) so a
+    concurrent reader never sees a partially written file. An unchanged file keeps its
+    mtime, which is what stops CMake from reconfiguring on no-op runs.
+
+    Returns True if the file was written.
+    """
+    if _file_digest(path) == _content_digest(content):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return True
+
+
+class GeneratedFilesWriter:
+    """Writes generated files to disk, skipping the ones whose content did not change."""
+
+    def __init__(self) -> None:
+        self.logger = logger.bind()
+        self.written_files: list[Path] = []
+        self.skipped_files: list[Path] = []
+
+    def write(self, file: GeneratedFileIf) -> bool:
+        if write_if_changed(file.path, file.to_string()):
+            self.written_files.append(file.path)
+            return True
+        self.skipped_files.append(file.path)
+        return False
+
+    def write_all(self, files: list[GeneratedFileIf]) -> None:
+        for file in files:
+            self.write(file)
+        self.logger.info(f"Generated files: {len(self.written_files)} written, {len(self.skipped_files)} unchanged.")
 
 
 class CMakeGenerator(ABC):
     """Base class for CMake generators."""
 
+    #: Data registry types inserted by the generator. ``None`` means unknown, the generator then does not run concurrently with others.
+    produces: ClassVar[Optional[tuple[type[Any], ...]]] = None
+    #: Data registry types inserted by other generators which this generator reads. ``None`` means unknown.
+    consumes: ClassVar[Optional[tuple[type[Any], ...]]] = None
+
     def __init__(self, execution_context: ExecutionContext, output_dir: Path, config: Optional[dict[str, Any]] = None) -> None:
         self.execution_context = execution_context
         self.config = config
@@ -23,20 +91,63 @@ class CMakeGenerator(ABC):
         pass
 
 
+class CMakeElementIndex:
+    """
+    Index of CMake elements by concrete type and by component name.
+
+    It is updated incrementally when elements are added, so consumers do not need to scan
+    the complete element list with ``isinstance`` checks. Query results keep the insertion order.
+    """
+
+    def __init__(self, elements: Optional[list[CMakeElement]] = None) -> None:
+        self._count = 0
+        self._by_type: dict[type[CMakeElement], list[tuple[int, Any]]] = {}
+        self._by_component: dict[str, list[CMakeElement]] = {}
+        for element in elements or []:
+            self.add(element)
+
+    def add(self, element: CMakeElement) -> None:
+        self._by_type.setdefault(type(element), []).append((self._count, element))
+        self._count += 1
+        component_name = getattr(element, "component_name", None)
+        if component_name:
+            self._by_component.setdefault(component_name, []).append(element)
+
+    def find_elements_of_type(self, element_type: type[T]) -> list[T]:
+        """Find all elements of the given type, including its subclasses."""
+        matching = [entries for indexed_type, entries in self._by_type.items() if issubclass(indexed_type, element_type)]
+        if len(matching) == 1:
+            return [element for _, element in matching[0]]
+        # Elements of different types are merged back into insertion order
+        return [element for _, element in heapq.merge(*matching, key=lambda entry: entry[0])]
+
+    def find_component_elements(self, component_name: str) -> list[CMakeElement]:
+        """Find all elements tagged with the given component name."""
+        return list(self._by_component.get(component_name, []))
+
+
 class CMakeFile(GeneratedFileIf):
     def __init__(self, path: Path) -> None:
         super().__init__(path)
         self.content: list[CMakeElement] = []
+        self.index = CMakeElementIndex()
 
     def to_string(self) -> str:
         return "\n".join(str(elem) for elem in self.content)
 
+    def to_file(self) -> None:
+        write_if_changed(self.path, self.to_string())
+
     def append(self, content: Optional[CMakeElement]) -> "CMakeFile":
         if content:
             self.content.append(content)
+            self.index.add(content)
         return self
 
     def extend(self, content: list[CMakeElement]) -> "CMakeFile":
         for element in content:
             self.append(element)
         return self
+
+    def find_elements_of_type(self, element_type: type[T]) -> list[T]:
+        return self.index.find_elements_of_type(element_type)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
@@ -6,6 +6,7 @@ from typing import Any, Optional
 from mashumaro import DataClassDictMixin
 from py_app_dev.core.config import merge_configs
 from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger
 from pypeline.domain.external_project import ExternalProject
 from yanga_core.domain.artifact import Artifact, collect_directories, filter_artifacts, for_consumer, with_label
 from yanga_core.domain.component_resolver import resolve_include_directories
@@ -16,27 +17,34 @@ from yanga_core.domain.reports import ReportRelevantFiles, ReportRelevantFileTyp
 
 from yanga.cmake.artifacts_locator import BuildArtifact, CMakeArtifactsLocator
 from yanga.cmake.coverage import CoverageArtifactsLocator, CoverageRelevantFile
+from yanga.sources import CXX_SOURCE_SUFFIXES
 
 from .cmake_backend import (
     CMakeAddExecutable,
     CMakeAddLibrary,
     CMakeAddSubdirectory,
     CMakeAddTargetCleanFiles,
+    CMakeAddTest,
     CMakeCommand,
     CMakeComment,
     CMakeCustomCommand,
     CMakeCustomTarget,
     CMakeElement,
     CMakeEmptyLine,
+    CMakeEnableTesting,
     CMakeIncludeDirectories,
     CMakePath,
     CMakeSetTargetProperties,
+    CMakeSetTestsProperties,
     CMakeTargetIncludeDirectories,
     CMakeVariable,
     IncludeScope,
     cmake_directory_provider,
 )
+from .concurrency import generate_in_order
 from .generator import CMakeGenerator
+from .prebuilt_gtest import CMakePrebuiltGTest, PrebuiltGTestConfig
+from .precompiled_headers import PrecompiledHeaders, PrecompiledHeadersConfig
 
 
 class GTestCMakeArtifactsLocator(CMakeArtifactsLocator):
@@ -46,24 +54,93 @@ class GTestCMakeArtifactsLocator(CMakeArtifactsLocator):
 
     def __init__(self, output_dir: Path, execution_context: ExecutionContext) -> None:
         super().__init__(output_dir, execution_context.spl_paths)
-        self.cmake_gtest_dir = CMakePath(self._locate_gtest(execution_context))
+        gtest_project = self._locate_gtest(execution_context)
+        self.cmake_gtest_dir = CMakePath(gtest_project.path)
+        self.gtest_revision = gtest_project.revision
 
-    def _locate_gtest(self, execution_context: ExecutionContext) -> Path:
-        """Resolve the GoogleTest source dir from the data registry, where WestInstall publishes it, so the install layout stays an internal detail."""
+    def _locate_gtest(self, execution_context: ExecutionContext) -> ExternalProject:
+        """Resolve the GoogleTest project from the data registry, where WestInstall publishes it, so the install layout stays an internal detail."""
         for project in execution_context.data_registry.find_data(ExternalProject):
             if project.name == self.GTEST_PROJECT_NAME:
-                return project.path
+                return project
         raise UserNotificationException(
             f"GoogleTest dependency '{self.GTEST_PROJECT_NAME}' was not installed by a WestInstall step (no matching ExternalProject in the data registry)."
         )
 
 
+@dataclass
+class UnityBuildConfig(DataClassDictMixin):
+    #: Merge the component test sources into unity (jumbo) translation units
+    enabled: bool = True
+    #: Maximum number of sources merged into one translation unit
+    batch_size: int = 8
+    #: Sources to be compiled standalone, e.g. because they define clashing static symbols (glob patterns like ``test_isr_*.cc``)
+    exclude: list[str] = field(default_factory=list)
+
+    def can_merge(self, source: Path) -> bool:
+        return source.suffix in CXX_SOURCE_SUFFIXES and not any(source.match(pattern) for pattern in self.exclude)
+
+
+@dataclass
+class CoverageDiffConfig(DataClassDictMixin):
+    #: Git revision the changed lines are determined against. The ``YANGA_COVERAGE_DIFF_BASE`` environment variable overrides it at build time.
+    base_ref: str = "origin/main"
+    #: Fail if the coverage of the changed lines is below the given percentage
+    fail_under: Optional[float] = None
+
+
+@dataclass
+class TestTimingConfig(DataClassDictMixin):
+    #: Report the slowest tests and the test time trends for every component and for the variant
+    enabled: bool = True
+    #: Number of previous runs kept in the build directory to compute the test time trends
+    history_size: int = 10
+    #: Number of slowest tests listed in the report
+    slowest: int = 20
+
+
+@dataclass
+class CTestConfig(DataClassDictMixin):
+    #: Register the component test executables with CTest and create the ``ctest`` target
+    enabled: bool = True
+    #: Maximum run time in seconds of a test executable or test shard
+    timeout: int = 1500
+    #: Number of tests run in parallel. Defaults to the number of CPUs.
+    parallel_level: Optional[int] = None
+
+
 @dataclass
 class GTestCMakeGeneratorConfig(DataClassDictMixin):
     #: If this is enabled, all includes are defined globally and not component specific
     use_global_includes: bool = False
     #: Mocking configuration
     mocking: Optional[MockingConfig] = None
+    #: Compile the test sources and the mockup sources in unity (jumbo) translation units
+    unity_build: Optional[UnityBuildConfig] = None
+    #: Component specific unity build configuration. It replaces the ``unity_build`` configuration for the given components.
+    component_unity_build: dict[str, UnityBuildConfig] = field(default_factory=dict)
+    #: Precompiled headers for the component test executables. Defaults to the gtest and gmock headers.
+    precompiled_headers: Optional[PrecompiledHeadersConfig] = None
+    #: Component specific precompiled headers configuration. It replaces the ``precompiled_headers`` configuration for the given components.
+    component_precompiled_headers: dict[str, PrecompiledHeadersConfig] = field(default_factory=dict)
+    #: Number of shards the tests of a component executable are split into. The shards run in parallel, each with its own JUnit report and coverage data.
+    test_shards: int = 1
+    #: Component specific number of test shards
+    component_test_shards: dict[str, int] = field(default_factory=dict)
+    #: Import GoogleTest prebuilt in a cache directory shared by all variants and build types instead of building it in every build directory
+    prebuilt_gtest: Optional[PrebuiltGTestConfig] = None
+    #: Create the ``coverage_diff`` target reporting the coverage of the lines changed relative to a base revision
+    coverage_diff: Optional[CoverageDiffConfig] = None
+    #: Create the ``test_timing`` targets reporting the slowest tests and the test time trends
+    test_timing: Optional[TestTimingConfig] = None
+    #: Register the component tests and test shards with CTest. The ``ctest`` target runs them in parallel, the longest tests first.
+    ctest: Optional[CTestConfig] = None
+    #: Compile the component sources and link the test executables with coverage instrumentation. Disable it for fast test builds without coverage reports.
+    coverage: bool = True
+    #: Write the component coverage JSON reports gzip compressed (``coverage.json.gz``)
+    compress_coverage_json: bool = False
+    #: Render the variant coverage html report from the merged tracefile with ``yanga_cmd coverage_html``, which only renders the pages of changed source files again
+    incremental_coverage_html: bool = False
 
     @property
     def automock(self) -> bool:
@@ -73,9 +150,10 @@ class GTestCMakeGeneratorConfig(DataClassDictMixin):
 
 
 class GTestCMakeComponent:
-    def __init__(self, component: Component, execution_context: ExecutionContext) -> None:
+    def __init__(self, component: Component, execution_context: ExecutionContext, variant_include_directories: Optional[list[Path]] = None) -> None:
         self.component = component
         self.execution_context = execution_context
+        self.variant_include_directories = variant_include_directories
 
     @property
     def name(self) -> str:
@@ -100,8 +178,10 @@ class GTestCMakeComponent:
 
     def get_include_directories(self) -> list[CMakePath]:
         registry_dirs = collect_directories(filter_artifacts(self.execution_context.data_registry.find_data(Artifact), with_label("include"), for_consumer(self.component.name)))
-        include_dirs = resolve_include_directories(self.execution_context.components) + registry_dirs
-        return [CMakePath(path) for path in include_dirs]
+        variant_include_dirs = self.variant_include_directories
+        if variant_include_dirs is None:
+            variant_include_dirs = resolve_include_directories(self.execution_context.components)
+        return [CMakePath(path) for path in [*variant_include_dirs, *registry_dirs]]
 
 
 class CMakeMockupCreator:
@@ -119,32 +199,35 @@ class CMakeMockupCreator:
 
     def generate(self) -> list[CMakeElement]:
         elements: list[CMakeElement] = []
-        # Create the partial link library containing only the productive sources to be able to find the required mocks
+        # The productive sources declare the symbols to be mocked
         sources = [CMakePath(source) for source in self.gtest_cmake_component.component.sources]
         # Add the component-specific build directory for the component to find the generated mockup sources
         component_build_dir = self.artifacts_locator.get_component_build_dir(self.gtest_cmake_component.name)
-        # Custom command to create the partial link library
-        partial_link_obj = component_build_dir.joinpath(f"{self.gtest_cmake_component.partial_link_name}.o")
+        # Custom command to collect the symbols required by the productive sources from their object files.
+        # The manifest is only rewritten if the symbols changed.
+        symbols_manifest = component_build_dir.joinpath(f"{self.gtest_cmake_component.partial_link_name}_symbols.json")
         custom_command = CMakeCustomCommand(
-            description="Create partial link library containing only the productive sources",
-            outputs=[partial_link_obj],
+            description="Collect the symbols required by the productive sources",
+            outputs=[symbols_manifest],
             depends=[self.component_object_library_target],
             commands=[
                 CMakeCommand(
-                    "${CMAKE_CXX_COMPILER}",
+                    "yanga_cmd",
                     [
-                        "-r",
-                        "-nostdlib",
-                        "-o",
-                        partial_link_obj,
+                        "object_symbols",
+                        "--object-files",
                         f"$<TARGET_OBJECTS:{self.component_object_library_target}>",
+                        "--output-file",
+                        symbols_manifest,
                     ],
                 )
             ],
             command_expand_lists=True,
         )
         elements.append(custom_command)
-        # Custom command to run clanguru and generate the mockup sources
+        # Custom command to run clanguru and generate the mockup sources.
+        # It runs on every rebuild of the component objects, not only if the required symbols changed: a changed header can change the
+        # prototypes of the same symbols. The mockup sources are cached and only rewritten if the required symbols or the parsed headers changed.
         clanguru_args = []
         if self.mocking_config:
             clanguru_args.append("--strict" if self.mocking_config.strict else "--no-strict")
@@ -155,19 +238,22 @@ class CMakeMockupCreator:
         generate_mockup_cmake_cmd = CMakeCustomCommand(
             description="Run clanguru to generate mockup sources",
             outputs=[CMakePath(file) for file in self.get_mockup_generated_files()],
-            depends=[partial_link_obj],
+            depends=[symbols_manifest, self.component_object_library_target, *sources],
             commands=[
                 CMakeCommand(
-                    "clanguru",
+                    "yanga_cmd",
                     [
-                        "mock",
+                        "mockup",
                         "--filename",
                         f"mockup_{self.gtest_cmake_component.component.name}",
-                        *[f"--source-file {source}" for source in sources],
-                        "--partial-object-file",
-                        partial_link_obj,
+                        "--source-files",
+                        *sources,
+                        "--symbols-manifest",
+                        symbols_manifest,
                         "--output-dir",
                         component_build_dir,
+                        "--cache-dir",
+                        component_build_dir.joinpath(".mockup_cache"),
                         "--compilation-database",
                         self.artifacts_locator.cmake_build_dir.joinpath("compile_commands.json"),
                         *clanguru_args,
@@ -202,17 +288,90 @@ class CMakeMockupCreator:
         return component_build_dir.joinpath(f"mockup_{self.gtest_cmake_component.name}.{file_extension}").to_path()
 
 
+#: The test timing report targets are named ``<component>_test_timing`` and ``test_timing``
+TEST_TIMING_TARGET = "test_timing"
+CTEST_TARGET = "ctest"
+COVERAGE_DIFF_TARGET = "coverage_diff"
+
+
+def create_test_timing_report(
+    execution_context: ExecutionContext, target: UserRequest, junit_files: list[CMakePath], output_dir: CMakePath, config: TestTimingConfig
+) -> list[CMakeElement]:
+    """Create the test timing report for the given JUnit reports and register it as test result for the target report."""
+    report_file = output_dir.joinpath("test_timing.md")
+    history_file = output_dir.joinpath("test_timing_history.json")
+    test_timing_command = CMakeCustomCommand(
+        description=f"Create the test timing report for {target.component_name or 'the variant'}",
+        outputs=[report_file],
+        depends=junit_files,
+        commands=[
+            CMakeCommand(
+                "yanga_cmd",
+                [
+                    "test_timing",
+                    "--junit-files",
+                    *junit_files,
+                    "--output-file",
+                    report_file,
+                    "--history-file",
+                    history_file,
+                    "--history-size",
+                    str(config.history_size),
+                    "--slowest",
+                    str(config.slowest),
+                ],
+            )
+        ],
+    )
+    execution_context.data_registry.insert(
+        ReportRelevantFiles(
+            target=target,
+            files_to_be_included=[report_file.to_path()],
+            file_type=ReportRelevantFileType.TEST_RESULT,
+        ),
+        target.target_name,
+    )
+    return [
+        test_timing_command,
+        CMakeCustomTarget(
+            name=target.target_name,
+            description=f"Create the test timing report for {target.component_name or 'the variant'}",
+            commands=[],
+            depends=test_timing_command.outputs,
+        ),
+    ]
+
+
 class GTestComponentCMakeGenerator:
     def __init__(self, execution_context: ExecutionContext, output_dir: Path, config: GTestCMakeGeneratorConfig) -> None:
         self.execution_context = execution_context
         self.artifacts_locator = GTestCMakeArtifactsLocator(output_dir, execution_context)
         self.config = config
 
+    @cached_property
+    def variant_include_directories(self) -> list[Path]:
+        """Include directories of all variant components. Every component is compiled against them, resolve them only once."""
+        return resolve_include_directories(self.execution_context.components)
+
+    @cached_property
+    def precompiled_headers(self) -> PrecompiledHeaders:
+        precompiled_headers = PrecompiledHeaders(self.execution_context.project_root_dir, self.config.precompiled_headers, ["<gtest/gtest.h>", "<gmock/gmock.h>"])
+        # The first test executable using the generator configuration precompiles the headers for all others
+        precompiled_headers.reuse_target = next(
+            (
+                GTestCMakeComponent(component, self.execution_context).executable_name
+                for component in self.execution_context.components
+                if component.is_testable and component.name not in self.config.component_precompiled_headers
+            ),
+            None,
+        )
+        return precompiled_headers
+
     def generate(self, component: Component) -> list[CMakeElement]:
         component_generator_config = self._determine_component_generator_config(component)
 
         component_build_dir = self.artifacts_locator.get_component_build_dir(component.name)
-        gtest_cmake_component = GTestCMakeComponent(component, self.execution_context)
+        gtest_cmake_component = GTestCMakeComponent(component, self.execution_context, self.variant_include_directories)
 
         elements: list[CMakeElement] = []
         elements.append(CMakeComment(f"Component {component.name}"))
@@ -226,7 +385,7 @@ class GTestComponentCMakeGenerator:
             files=productive_sources,
             compile_options=[
                 "-ggdb",  # Include detailed debug information to be able to debug the executable.
-                "--coverage",  # Enable coverage tracking information to be generated.
+                *(["--coverage"] if component_generator_config.coverage else []),  # Enable coverage tracking information to be generated.
             ],
             component_name=component.name,
         )
@@ -250,10 +409,14 @@ class GTestComponentCMakeGenerator:
 
         # Components without tests will just be compiled
         if component.is_testable:
-            all_sources = component.test_sources
+            all_sources = list(component.test_sources)
             if mockup_generator:
                 all_sources += mockup_generator.get_mockup_sources()
-            test_executable = self.add_executable(gtest_cmake_component.executable_name, all_sources, component_sources_object_library.target_name, component.name)
+            create_unity_sources, compiled_sources = self.create_unity_sources(component.name, all_sources, component_generator_config.unity_build)
+            elements.extend(create_unity_sources)
+            test_executable = self.add_executable(
+                gtest_cmake_component.executable_name, compiled_sources, component_sources_object_library.target_name, component.name, component_generator_config
+            )
             elements.append(test_executable)
 
             # Set the executable output directory to the component-specific directory
@@ -261,6 +424,10 @@ class GTestComponentCMakeGenerator:
             target_properties = CMakeSetTargetProperties(test_executable.name, {"RUNTIME_OUTPUT_DIRECTORY": component_build_dir})
             elements.append(target_properties)
 
+            precompile_headers = self.precompiled_headers.create(test_executable.name, component_generator_config.precompiled_headers)
+            if precompile_headers:
+                elements.append(precompile_headers)
+
             # Add component-specific include directories when global includes are disabled
             if include_dirs and not component_generator_config.use_global_includes:
                 # Determine visibility: use PRIVATE for executables with sources, INTERFACE for header-only
@@ -269,64 +436,83 @@ class GTestComponentCMakeGenerator:
                 elements.append(target_includes)
 
             # Create the custom target to execute the tests
-            execute_tests_command = self.run_executable(component.name, test_executable.name)
+            if component_generator_config.test_shards > 1:
+                run_shard_commands = self.run_executable_shards(component.name, test_executable.name, component_generator_config.test_shards)
+                elements.extend(run_shard_commands)
+                execute_tests_command = self.merge_test_shards(component.name, run_shard_commands)
+            else:
+                execute_tests_command = self.run_executable(component.name, test_executable.name)
             elements.append(execute_tests_command)
+            if component_generator_config.ctest and component_generator_config.ctest.enabled:
+                elements.extend(self.add_tests(component.name, test_executable.name, component_generator_config.test_shards, component_generator_config.ctest))
+
+            if component_generator_config.test_timing and component_generator_config.test_timing.enabled:
+                elements.extend(
+                    create_test_timing_report(
+                        self.execution_context,
+                        UserRequest(UserRequestScope.COMPONENT, component_name=component.name, target=TEST_TIMING_TARGET),
+                        execute_tests_command.outputs or [],
+                        component_build_dir,
+                        component_generator_config.test_timing,
+                    )
+                )
 
-            # Generate coverage report
-            coverage_cmd = self.create_coverage_report(component.name, execute_tests_command, productive_sources, component_sources_object_library.target_name)
-            elements.append(coverage_cmd)
-            component_coverage_target = UserRequest(
-                UserRequestScope.COMPONENT,
-                component_name=component.name,
-                target=UserRequestTarget.COVERAGE,
-            )
+            # Generate coverage report, only for instrumented builds
+            if component_generator_config.coverage:
+                coverage_cmd = self.create_coverage_report(component.name, execute_tests_command, productive_sources, component_sources_object_library.target_name)
+                elements.append(coverage_cmd)
+                component_coverage_target = UserRequest(
+                    UserRequestScope.COMPONENT,
+                    component_name=component.name,
+                    target=UserRequestTarget.COVERAGE,
+                )
 
-            elements.append(
-                CMakeCustomTarget(
-                    name=component_coverage_target.target_name,
-                    description=f"Generate coverage report for {component.name}",
-                    commands=[],
-                    depends=coverage_cmd.outputs,
+                elements.append(
+                    CMakeCustomTarget(
+                        name=component_coverage_target.target_name,
+                        description=f"Generate coverage report for {component.name}",
+                        commands=[],
+                        depends=coverage_cmd.outputs,
+                    )
                 )
-            )
 
-            coverage_artifacts_locator = CoverageArtifactsLocator.from_cmake_artifacts_locator(self.artifacts_locator)
-            # The gcovr --html-details run populates the component coverage html dir with files
-            # that ninja does not track. Register the directory for recursive removal on `clean`.
-            elements.append(
-                CMakeAddTargetCleanFiles(
-                    target=component_coverage_target.target_name,
-                    files=[coverage_artifacts_locator.get_component_coverage_reports_dir(component.name)],
+                coverage_artifacts_locator = CoverageArtifactsLocator.from_cmake_artifacts_locator(self.artifacts_locator)
+                # The gcovr --html-details run populates the component coverage html dir with files
+                # that ninja does not track. Register the directory for recursive removal on `clean`.
+                elements.append(
+                    CMakeAddTargetCleanFiles(
+                        target=component_coverage_target.target_name,
+                        files=[coverage_artifacts_locator.get_component_coverage_reports_dir(component.name)],
+                    )
                 )
-            )
 
-            # Register the component coverage html report as relevant for the component report
-            # When registering an html content, the path shall be relative to the reports directory
-            index_html = (
-                coverage_artifacts_locator.get_component_coverage_html_file(component.name)
-                .to_path()
-                .relative_to(coverage_artifacts_locator.get_component_reports_dir(component.name).to_path())
-            )
-            self.execution_context.data_registry.insert(
-                ReportRelevantFiles(
-                    target=component_coverage_target,
-                    files_to_be_included=[],
-                    file_type=ReportRelevantFileType.COVERAGE_RESULT,
-                    html_content=ReportRelevantHtmlContent(
-                        name="Coverage Report",
-                        index_html=index_html,
+                # Register the component coverage html report as relevant for the component report
+                # When registering an html content, the path shall be relative to the reports directory
+                index_html = (
+                    coverage_artifacts_locator.get_component_coverage_html_file(component.name)
+                    .to_path()
+                    .relative_to(coverage_artifacts_locator.get_component_reports_dir(component.name).to_path())
+                )
+                self.execution_context.data_registry.insert(
+                    ReportRelevantFiles(
+                        target=component_coverage_target,
+                        files_to_be_included=[],
+                        file_type=ReportRelevantFileType.COVERAGE_RESULT,
+                        html_content=ReportRelevantHtmlContent(
+                            name="Coverage Report",
+                            index_html=index_html,
+                        ),
                     ),
-                ),
-                component_coverage_target.target_name,
-            )
-            # Register the component coverage json report as relevant for the merged coverage report
-            self.execution_context.data_registry.insert(
-                CoverageRelevantFile(
-                    target=component_coverage_target,
-                    json_report=self.artifacts_locator.get_component_build_artifact(component.name, BuildArtifact.COVERAGE_JSON),
-                ),
-                component_coverage_target.target_name,
-            )
+                    component_coverage_target.target_name,
+                )
+                # Register the component coverage json report as relevant for the merged coverage report
+                self.execution_context.data_registry.insert(
+                    CoverageRelevantFile(
+                        target=component_coverage_target,
+                        json_report=self.get_coverage_json_file(component.name),
+                    ),
+                    component_coverage_target.target_name,
+                )
 
             # Create the component mockup sources
             if mockup_generator:
@@ -367,15 +553,60 @@ class GTestComponentCMakeGenerator:
 
     def _determine_component_generator_config(self, component: Component) -> GTestCMakeGeneratorConfig:
         """Take over the component mocking configuration over the global generator configuration."""
-        result = self.config
+        # Work on a copy, the generator configuration is shared by all components
+        result = replace(self.config)
         if component.testing and component.testing.mocking:
             if not result.mocking:
                 result.mocking = component.testing.mocking
             else:
                 result.mocking = merge_configs(result.mocking, component.testing.mocking)
+        if component.name in result.component_unity_build:
+            result.unity_build = result.component_unity_build[component.name]
+        if component.name in result.component_precompiled_headers:
+            result.precompiled_headers = result.component_precompiled_headers[component.name]
+        result.test_shards = result.component_test_shards.get(component.name, result.test_shards)
+        if result.test_shards < 1:
+            raise UserNotificationException(f"Number of test shards for component '{component.name}' must be at least 1, got {result.test_shards}.")
         return result
 
-    def add_executable(self, executable_name: str, sources: list[Path], component_object_library: str, component_name: str) -> CMakeAddExecutable:
+    def create_unity_sources(self, component_name: str, sources: list[Path], config: Optional[UnityBuildConfig]) -> tuple[list[CMakeCustomCommand], list[Path]]:
+        """
+        Batch the sources into unity sources which include up to ``batch_size`` sources each.
+
+        Returns the commands creating the unity sources and the sources to be compiled.
+        The unity sources are created at build time because they might include the generated mockup sources.
+        """
+        if not config or not config.enabled:
+            return [], sources
+        if config.batch_size < 1:
+            raise UserNotificationException(f"Unity build batch size for component '{component_name}' must be at least 1, got {config.batch_size}.")
+        mergeable = [source for source in sources if config.can_merge(source)]
+        standalone = [source for source in sources if not config.can_merge(source)]
+        component_build_dir = self.artifacts_locator.get_component_build_dir(component_name)
+        commands: list[CMakeCustomCommand] = []
+        compiled_sources: list[Path] = []
+        for index, start in enumerate(range(0, len(mergeable), config.batch_size)):
+            batch = mergeable[start : start + config.batch_size]
+            if len(batch) == 1:
+                compiled_sources.extend(batch)
+                continue
+            unity_source = component_build_dir.joinpath(f"{component_name}_unity_{index}.cc")
+            batch_paths = [CMakePath(source) for source in batch]
+            commands.append(
+                CMakeCustomCommand(
+                    description=f"Create unity source {index} for component {component_name}",
+                    outputs=[unity_source],
+                    depends=batch_paths,
+                    commands=[CMakeCommand("yanga_cmd", ["unity_source", "--source-files", *batch_paths, "--output-file", unity_source])],
+                )
+            )
+            compiled_sources.append(unity_source.to_path())
+        return commands, compiled_sources + standalone
+
+    def add_executable(
+        self, executable_name: str, sources: list[Path], component_object_library: str, component_name: str, config: GTestCMakeGeneratorConfig
+    ) -> CMakeAddExecutable:
+        """Link the test executable. It must use the coverage instrumentation of the component objects it links."""
         return CMakeAddExecutable(
             name=executable_name,
             sources=[CMakePath(source) for source in sources],
@@ -383,7 +614,7 @@ class GTestComponentCMakeGenerator:
             compile_options=[
                 "-ggdb",  # Include detailed debug information to be able to debug the executable.
             ],
-            link_options=["--coverage"],  # Enable coverage analysis.
+            link_options=["--coverage"] if config.coverage else [],  # Enable coverage analysis.
             component_name=component_name,
         )
 
@@ -410,6 +641,129 @@ class GTestComponentCMakeGenerator:
             commands=[command],
         )
 
+    def get_test_shard_dir(self, component_name: str, shard_index: int) -> CMakePath:
+        return self.artifacts_locator.get_component_build_dir(component_name).joinpath(f"shards/{shard_index}")
+
+    def run_executable_shards(self, component_name: str, component_executable_name: str, test_shards: int) -> list[CMakeCustomCommand]:
+        """
+        Run the test executable in ``test_shards`` shards, every shard runs a part of the tests.
+
+        Every shard writes its coverage data into its own directory (``GCOV_PREFIX``) to not corrupt the data of the other shards.
+        The build directory is stripped from the coverage data paths, so they are relative to the build directory.
+        """
+        component_build_dir = self.artifacts_locator.get_component_build_dir(component_name)
+        executable_path = component_build_dir.joinpath(component_executable_name)
+        commands: list[CMakeCustomCommand] = []
+        for shard_index in range(test_shards):
+            shard_dir = self.get_test_shard_dir(component_name, shard_index)
+            junit_report_file = self.get_test_shard_junit_file(component_name, shard_index)
+            commands.append(
+                CMakeCustomCommand(
+                    f"Run the test executable shard {shard_index} of {test_shards}, generate JUnit report and return success independent of the test result",
+                    outputs=[junit_report_file],
+                    depends=[component_executable_name],
+                    commands=[
+                        # Remove the coverage data of the previous run, it is merged with the data of the other shards
+                        CMakeCommand("${CMAKE_COMMAND}", ["-E", "rm", "-rf", shard_dir.joinpath("gcov")]),
+                        CMakeCommand(
+                            "${CMAKE_COMMAND}",
+                            [
+                                "-E",
+                                "env",
+                                *self.get_test_shard_environment(component_name, test_shards, shard_index),
+                                executable_path,
+                                f"--gtest_output=xml:{junit_report_file}",
+                                "||",
+                                "${CMAKE_COMMAND}",
+                                "-E",
+                                "true",
+                            ],
+                        ),
+                    ],
+                )
+            )
+        return commands
+
+    def get_test_shard_junit_file(self, component_name: str, shard_index: int) -> CMakePath:
+        return self.get_test_shard_dir(component_name, shard_index).joinpath(f"{component_name}_junit.xml")
+
+    def get_test_shard_environment(self, component_name: str, test_shards: int, shard_index: int) -> list[str]:
+        """Environment selecting the tests of the shard and redirecting its coverage data into the shard directory."""
+        gcov_prefix_strip = len(self.artifacts_locator.cmake_build_dir.to_path().absolute().parts) - 1
+        return [
+            f"GTEST_TOTAL_SHARDS={test_shards}",
+            f"GTEST_SHARD_INDEX={shard_index}",
+            f"GCOV_PREFIX={self.get_test_shard_dir(component_name, shard_index).joinpath('gcov')}",
+            f"GCOV_PREFIX_STRIP={gcov_prefix_strip}",
+        ]
+
+    def add_tests(self, component_name: str, component_executable_name: str, test_shards: int, config: CTestConfig) -> list[CMakeElement]:
+        """
+        Register the test executable with CTest. Every shard is a test on its own, so CTest can schedule the shards independently.
+
+        The shards run with the same environment and JUnit report as in ``run_executable_shards``.
+        A setup fixture removes the coverage data of the previous run before the shards run.
+        """
+        properties: dict[str, str | CMakePath] = {"TIMEOUT": str(config.timeout), "LABELS": component_name}
+        if test_shards <= 1:
+            return [CMakeAddTest(component_name, component_executable_name), CMakeSetTestsProperties([component_name], properties)]
+        fixture_name = f"{component_name}_test_shards"
+        clean_test_name = f"{component_name}_clean_test_shards"
+        elements: list[CMakeElement] = [
+            CMakeAddTest(
+                clean_test_name,
+                "${CMAKE_COMMAND}",
+                ["-E", "rm", "-rf", *[self.get_test_shard_dir(component_name, shard_index).joinpath("gcov") for shard_index in range(test_shards)]],
+            ),
+            CMakeSetTestsProperties([clean_test_name], {"LABELS": component_name, "FIXTURES_SETUP": fixture_name}),
+        ]
+        for shard_index in range(test_shards):
+            test_name = f"{component_name}_shard_{shard_index}"
+            elements.append(CMakeAddTest(test_name, component_executable_name, [f"--gtest_output=xml:{self.get_test_shard_junit_file(component_name, shard_index)}"]))
+            elements.append(
+                CMakeSetTestsProperties(
+                    [test_name],
+                    {
+                        **properties,
+                        "FIXTURES_REQUIRED": fixture_name,
+                        "ENVIRONMENT": ";".join(self.get_test_shard_environment(component_name, test_shards, shard_index)),
+                    },
+                ),
+            )
+        return elements
+
+    def merge_test_shards(self, component_name: str, run_shard_commands: list[CMakeCustomCommand]) -> CMakeCustomCommand:
+        """Merge the JUnit reports and the coverage data of all shards. The results are the same as for a test executable run without shards."""
+        component_build_dir = self.artifacts_locator.get_component_build_dir(component_name)
+        shard_junit_files = [output for command in run_shard_commands for output in command.outputs or []]
+        return CMakeCustomCommand(
+            "Merge the JUnit reports and the coverage data of all test executable shards",
+            outputs=[component_build_dir.joinpath(f"{component_name}_junit.xml")],
+            depends=shard_junit_files,
+            commands=[
+                CMakeCommand(
+                    "yanga_cmd",
+                    [
+                        "merge_test_shards",
+                        "--junit-files",
+                        *shard_junit_files,
+                        "--coverage-dirs",
+                        *[self.get_test_shard_dir(component_name, shard_index).joinpath("gcov") for shard_index in range(len(run_shard_commands))],
+                        "--build-dir",
+                        self.artifacts_locator.cmake_build_dir,
+                        "--output-file",
+                        component_build_dir.joinpath(f"{component_name}_junit.xml"),
+                    ],
+                )
+            ],
+        )
+
+    def get_coverage_json_file(self, component_name: str) -> CMakePath:
+        if self.config.compress_coverage_json:
+            # gcovr compresses the report based on the file name
+            return self.artifacts_locator.get_component_build_dir(component_name).joinpath(f"{BuildArtifact.COVERAGE_JSON.path}.gz")
+        return self.artifacts_locator.get_component_build_artifact(component_name, BuildArtifact.COVERAGE_JSON)
+
     def create_coverage_report(
         self,
         component_name: str,
@@ -420,10 +774,10 @@ class GTestComponentCMakeGenerator:
         artifacts_locator = CoverageArtifactsLocator.from_cmake_artifacts_locator(self.artifacts_locator)
         component_build_dir = artifacts_locator.get_component_build_dir(component_name)
         gcovr_config_file = component_build_dir.joinpath("gcovr.cfg")
-        gcovr_json_file = artifacts_locator.get_component_build_artifact(component_name, BuildArtifact.COVERAGE_JSON)
-        gcovr_html_dir = artifacts_locator.get_component_coverage_reports_dir(component_name)
+        gcovr_json_file = self.get_coverage_json_file(component_name)
         gcovr_html_file = artifacts_locator.get_component_coverage_html_file(component_name)
 
+        # Single gcovr run for the JSON and HTML reports, with the gcov calls spread over the free job slots
         return CMakeCustomCommand(
             description=f"Generate coverage report for component {component_name}",
             outputs=[gcovr_config_file, gcovr_json_file, gcovr_html_file],
@@ -433,44 +787,16 @@ class GTestComponentCMakeGenerator:
                 CMakeCommand(
                     "yanga_cmd",
                     [
-                        "gcovr_config_component",
+                        "coverage_report_component",
                         "--component-objects",
                         f"$<TARGET_OBJECTS:{component_object_library}>",
                         "--source-files",
                         *[CMakePath(src) for src in sources],
-                        "--output-file",
+                        "--config-file",
                         gcovr_config_file,
-                    ],
-                ),
-                CMakeCommand(
-                    "gcovr",
-                    [
-                        "--config",
-                        gcovr_config_file,
-                        "--json",
-                        "--output",
+                        "--json-file",
                         gcovr_json_file,
-                        "--json-pretty",
-                    ],
-                ),
-                CMakeCommand(
-                    "${CMAKE_COMMAND}",
-                    [
-                        "-E",
-                        "make_directory",
-                        gcovr_html_dir,
-                    ],
-                ),
-                CMakeCommand(
-                    "gcovr",
-                    [
-                        "--config",
-                        gcovr_config_file,
-                        "--add-tracefile",
-                        gcovr_json_file,
-                        "--html",
-                        "--html-details",
-                        "--output",
+                        "--html-file",
                         gcovr_html_file,
                     ],
                 ),
@@ -481,6 +807,10 @@ class GTestComponentCMakeGenerator:
 class GTestCMakeGenerator(CMakeGenerator):
     """Generates CMake elements to build an executable for a variant."""
 
+    # The coverage entries read for the variant report are the ones inserted by this generator
+    produces = (ReportRelevantFiles, CoverageRelevantFile)
+    consumes = (Artifact, ExternalProject)
+
     def __init__(self, execution_context: ExecutionContext, output_dir: Path, config: Optional[dict[str, Any]] = None) -> None:
         super().__init__(execution_context, output_dir, config)
         self.artifacts_locator = GTestCMakeArtifactsLocator(output_dir, execution_context)
@@ -507,13 +837,27 @@ class GTestCMakeGenerator(CMakeGenerator):
         elements.append(CMakeVariable("CMAKE_CXX_STANDARD", "14"))
         elements.append(CMakeVariable("CMAKE_CXX_STANDARD_REQUIRED", "ON"))
         elements.append(CMakeVariable("gtest_force_shared_crt", "ON", True, "BOOL", "", True))
-        elements.append(CMakeComment("Add local GoogleTest directory"))
-        elements.append(
-            CMakeAddSubdirectory(
-                self.artifacts_locator.cmake_gtest_dir,
-                self.artifacts_locator.cmake_build_dir.joinpath(".gtest"),
+        prebuilt_gtest = self.config_obj.prebuilt_gtest
+        if prebuilt_gtest and prebuilt_gtest.enabled:
+            elements.append(CMakeComment("Import the GoogleTest libraries prebuilt in the shared cache directory"))
+            elements.append(
+                CMakePrebuiltGTest(
+                    self.artifacts_locator.cmake_gtest_dir,
+                    self.artifacts_locator.gtest_revision,
+                    CMakePath(prebuilt_gtest.get_cache_dir(self.execution_context.project_root_dir)),
+                    self.artifacts_locator.cmake_build_dir.joinpath(".gtest"),
+                )
             )
-        )
+        else:
+            elements.append(CMakeComment("Add local GoogleTest directory"))
+            elements.append(
+                CMakeAddSubdirectory(
+                    self.artifacts_locator.cmake_gtest_dir,
+                    self.artifacts_locator.cmake_build_dir.joinpath(".gtest"),
+                )
+            )
+        if self.config_obj.ctest and self.config_obj.ctest.enabled:
+            elements.append(CMakeEnableTesting())
         if self.config_obj.use_global_includes:
             elements.append(self.get_include_directories())
         else:
@@ -535,15 +879,75 @@ class GTestCMakeGenerator(CMakeGenerator):
     def create_components_cmake_elements(self) -> list[CMakeElement]:
         elements: list[CMakeElement] = []
         component_generator = GTestComponentCMakeGenerator(self.execution_context, self.output_dir, self.config_obj)
-        for component in self.execution_context.components:
-            elements.extend(component_generator.generate(component))
+        elements.extend(generate_in_order(self.execution_context.components, component_generator.generate))
         return elements
 
+    def create_coverage_diff_target(self, config: CoverageDiffConfig, coverage_json_reports: list[CMakePath]) -> CMakeCustomTarget:
+        # The target always runs: the changed lines depend on the working tree and on the base revision
+        arguments: list[str | CMakePath] = [
+            "coverage_diff",
+            "--base-ref",
+            config.base_ref,
+            "--coverage-files",
+            *coverage_json_reports,
+            "--project-dir",
+            CMakePath(self.execution_context.project_root_dir),
+            "--output-file",
+            self.artifacts_locator.cmake_build_dir.joinpath("coverage_diff.json"),
+        ]
+        if config.fail_under is not None:
+            arguments.extend(["--fail-under", str(config.fail_under)])
+        return CMakeCustomTarget(
+            name=UserRequest(UserRequestScope.VARIANT, target=COVERAGE_DIFF_TARGET).target_name,
+            description="Generate coverage report for the changed lines",
+            commands=[CMakeCommand("yanga_cmd", arguments)],
+            depends=coverage_json_reports,
+        )
+
+    def create_ctest_target(self, config: CTestConfig, test_executables: list[str]) -> CMakeCustomTarget:
+        # CTest keeps the test times of the previous runs in Testing/Temporary/CTestCostData.txt and starts the longest tests first
+        arguments: list[str | CMakePath] = ["--test-dir", self.artifacts_locator.cmake_build_dir, "--parallel"]
+        if config.parallel_level:
+            arguments.append(str(config.parallel_level))
+        arguments.extend(["--output-on-failure", "--output-junit", self.artifacts_locator.cmake_build_dir.joinpath("ctest_junit.xml")])
+        return CMakeCustomTarget(
+            name=UserRequest(UserRequestScope.VARIANT, target=CTEST_TARGET).target_name,
+            description="Run the component tests with CTest",
+            commands=[CMakeCommand("${CMAKE_CTEST_COMMAND}", arguments)],
+            depends=test_executables,
+        )
+
     def create_variant_cmake_elements(self) -> list[CMakeElement]:
         elements: list[CMakeElement] = []
         # Collect all coverage json reports for the variant coverage report
         artifacts_locator = CoverageArtifactsLocator.from_cmake_artifacts_locator(self.artifacts_locator)
         coverage_relevant_json_reports = [entry.json_report for entry in self.execution_context.data_registry.find_data(CoverageRelevantFile)]
+        if self.config_obj.coverage_diff:
+            if coverage_relevant_json_reports:
+                elements.append(self.create_coverage_diff_target(self.config_obj.coverage_diff, list(coverage_relevant_json_reports)))
+            else:
+                logger.warning("No component is built with coverage instrumentation. The coverage_diff target is not generated, enable the coverage to get it.")
+        junit_files = [
+            self.artifacts_locator.get_component_build_dir(component.name).joinpath(f"{component.name}_junit.xml")
+            for component in self.execution_context.components
+            if component.is_testable
+        ]
+        if self.config_obj.ctest and self.config_obj.ctest.enabled and junit_files:
+            test_executables = [GTestCMakeComponent(component, self.execution_context).executable_name for component in self.execution_context.components if component.is_testable]
+            elements.append(self.create_ctest_target(self.config_obj.ctest, test_executables))
+        if self.config_obj.test_timing and self.config_obj.test_timing.enabled and junit_files:
+            elements.extend(
+                create_test_timing_report(
+                    self.execution_context,
+                    UserRequest(UserRequestScope.VARIANT, target=TEST_TIMING_TARGET),
+                    junit_files,
+                    self.artifacts_locator.cmake_build_dir,
+                    self.config_obj.test_timing,
+                )
+            )
+        if not self.config_obj.coverage:
+            # Without coverage instrumentation there is no coverage data for the variant coverage report
+            return elements
         gcovr_config_file = artifacts_locator.cmake_build_dir.joinpath("gcovr.cfg")
         gcovr_html_dir = artifacts_locator.get_variant_coverage_reports_dir()
         gcovr_html_file = artifacts_locator.get_variant_coverage_html_file()
@@ -554,12 +958,13 @@ class GTestCMakeGenerator(CMakeGenerator):
         elements.append(gcovr_html_dir_provider.command)
 
         # The html coverage reports are generated in the component specific reports directories.
-        # We need to create custom commands to copy them to the variant report directory.
+        # We need to create custom commands to link them into the variant report directory.
         targets_with_coverage_results = [
             entry.target
             for entry in self.execution_context.data_registry.find_data(ReportRelevantFiles)
             if entry.file_type == ReportRelevantFileType.COVERAGE_RESULT and entry.target.scope == UserRequestScope.COMPONENT and entry.target.component_name is not None
         ]
+        component_json_reports = list(coverage_relevant_json_reports)
         coverage_report_dependencies: list[CMakePath] = coverage_relevant_json_reports
         component_variant_coverage_html_dirs: list[CMakePath] = []
         for target in targets_with_coverage_results:
@@ -567,60 +972,86 @@ class GTestCMakeGenerator(CMakeGenerator):
             if component_name is None:
                 raise ValueError("Component name must be set for component scope targets.")
             artifacts_locator = CoverageArtifactsLocator.from_cmake_artifacts_locator(self.artifacts_locator)
-            # Get the directory where the component coverage html report was generated. This directory will be copied to the variant report directory
+            # Get the directory where the component coverage html report was generated. This directory will be linked into the variant report directory
             component_coverage_html_dir = artifacts_locator.get_component_coverage_reports_dir(component_name)
             component_variant_coverage_html_dir = artifacts_locator.get_component_variant_coverage_reports_dir(component_name)
             component_variant_coverage_html_dirs.append(component_variant_coverage_html_dir)
-            # copy_directory has no canonical file output (it copies an arbitrary tree), so the tracked output is a stamp we touch ourselves.
+            # link_directory has no canonical file output (it mirrors an arbitrary tree), so the tracked output is a stamp we touch ourselves.
             # The destination dir is not given a directory provider: only this command writes into it, so there is no race to gate against.
-            copy_done_stamp = component_variant_coverage_html_dir.joinpath(".yanga.stamp")
-            copy_coverage_html_cmd = CMakeCustomCommand(
-                description=f"Copy coverage html report for component {component_name} to variant report directory",
-                outputs=[copy_done_stamp],
+            # The files are hardlinked and a manifest in the destination dir makes sure only the changed files are touched.
+            link_done_stamp = component_variant_coverage_html_dir.joinpath(".yanga.stamp")
+            link_coverage_html_cmd = CMakeCustomCommand(
+                description=f"Link coverage html report for component {component_name} into variant report directory",
+                outputs=[link_done_stamp],
                 depends=[target.target_name, gcovr_html_dir_provider.stamp],
                 commands=[
                     CMakeCommand(
-                        "${CMAKE_COMMAND}",
+                        "yanga_cmd",
                         [
-                            "-E",
-                            "copy_directory",
+                            "link_directory",
+                            "--source-dir",
                             component_coverage_html_dir,
+                            "--destination-dir",
                             component_variant_coverage_html_dir,
                         ],
                     ),
-                    CMakeCommand("${CMAKE_COMMAND}", ["-E", "touch", copy_done_stamp]),
+                    CMakeCommand("${CMAKE_COMMAND}", ["-E", "touch", link_done_stamp]),
                 ],
             )
-            elements.append(copy_coverage_html_cmd)
-            coverage_report_dependencies.append(copy_done_stamp)
-
+            elements.append(link_coverage_html_cmd)
+            coverage_report_dependencies.append(link_done_stamp)
+
+        merge_commands: list[CMakeCommand] = []
+        merge_outputs: list[CMakePath] = []
+        gcovr_config_arguments: list[str | CMakePath] = [
+            "gcovr_config_variant",
+            "--variant-report-config",
+            self.artifacts_locator.get_build_artifact(BuildArtifact.REPORT_CONFIG),
+            "--output-file",
+            gcovr_config_file,
+        ]
+        render_commands = [
+            CMakeCommand("yanga_cmd", gcovr_config_arguments),
+            CMakeCommand(
+                "gcovr",
+                [
+                    "--config",
+                    gcovr_config_file,
+                    "--html",
+                    "--html-details",
+                    "--output",
+                    gcovr_html_file,
+                ],
+            ),
+        ]
+        render_outputs = [gcovr_config_file, gcovr_html_file]
+        if component_json_reports:
+            # gcovr renders the variant report from one compact tracefile instead of loading all component reports
+            merged_json_file = artifacts_locator.cmake_build_dir.joinpath("coverage_merged.json.gz" if self.config_obj.compress_coverage_json else "coverage_merged.json")
+            merge_commands.append(CMakeCommand("yanga_cmd", ["coverage_merge", "--coverage-files", *component_json_reports, "--output-file", merged_json_file]))
+            merge_outputs.append(merged_json_file)
+            gcovr_config_arguments.extend(["--tracefiles", merged_json_file])
+            if self.config_obj.incremental_coverage_html:
+                render_commands = [
+                    CMakeCommand(
+                        "yanga_cmd",
+                        [
+                            "coverage_html",
+                            "--tracefile",
+                            merged_json_file,
+                            "--output-file",
+                            gcovr_html_file,
+                            "--root-dir",
+                            self.artifacts_locator.cmake_project_dir,
+                        ],
+                    )
+                ]
+                render_outputs = [gcovr_html_file]
         coverage_cmd = CMakeCustomCommand(
             description="Generate coverage report for the variant",
-            outputs=[gcovr_config_file, gcovr_html_file],
+            outputs=[*merge_outputs, *render_outputs],
             depends=[gcovr_html_dir_provider.stamp, *coverage_report_dependencies],
-            commands=[
-                CMakeCommand(
-                    "yanga_cmd",
-                    [
-                        "gcovr_config_variant",
-                        "--variant-report-config",
-                        self.artifacts_locator.get_build_artifact(BuildArtifact.REPORT_CONFIG),
-                        "--output-file",
-                        gcovr_config_file,
-                    ],
-                ),
-                CMakeCommand(
-                    "gcovr",
-                    [
-                        "--config",
-                        gcovr_config_file,
-                        "--html",
-                        "--html-details",
-                        "--output",
-                        gcovr_html_file,
-                    ],
-                ),
-            ],
+            commands=[*merge_commands, *render_commands],
         )
         elements.append(coverage_cmd)
         variant_coverage_target = UserRequest(
@@ -635,7 +1066,7 @@ class GTestCMakeGenerator(CMakeGenerator):
                 depends=coverage_cmd.outputs,
             )
         )
-        # gcovr --html-details and copy_directory populate these dirs with files unknown to ninja.
+        # gcovr --html-details and link_directory populate these dirs with files unknown to ninja.
         # Register them for recursive removal on `clean` to avoid "Directory not empty" failures.
         elements.append(
             CMakeAddTargetCleanFiles(
@@ -0,0 +1,514 @@
+"""
+Native ninja backend.
+
+Writes ``build.ninja`` directly from the CMake element model, so no CMake configure is required.
+The compiler is not detected: it is taken from a toolchain description in the platform configuration
+(config with id ``ninja_toolchain``). The CMake backend stays the default.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from py_app_dev.core.config import ConfigElement, parse_config_element
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger
+from yanga_core.domain.config import ConfigFile, PlatformConfig
+from yanga_core.domain.execution_context import ExecutionContext
+from yanga_core.domain.generated_file import GeneratedFile, GeneratedFileIf
+
+from yanga.sources import C_SOURCE_SUFFIXES, CXX_SOURCE_SUFFIXES
+
+from .cmake_backend import (
+    CMakeAddExecutable,
+    CMakeAddLibrary,
+    CMakeAddSubdirectory,
+    CMakeAddTargetCleanFiles,
+    CMakeAddTest,
+    CMakeComment,
+    CMakeCustomCommand,
+    CMakeCustomTarget,
+    CMakeElement,
+    CMakeEmptyLine,
+    CMakeEnableTesting,
+    CMakeIncludeDirectories,
+    CMakeMinimumVersion,
+    CMakePath,
+    CMakeProject,
+    CMakeSetTargetProperties,
+    CMakeSetTestsProperties,
+    CMakeTargetIncludeDirectories,
+    CMakeTargetPrecompileHeaders,
+    CMakeVariable,
+    IncludeScope,
+    LibraryType,
+)
+from .prebuilt_gtest import CMakePrebuiltGTest
+
+NINJA_TOOLCHAIN_CONFIG_ID = "ninja_toolchain"
+
+
+@dataclass
+class NinjaToolchainConfig(ConfigElement):
+    """Toolchain description used by the ninja backend. The flags must be understood by a gcc compatible compiler."""
+
+    #: C compiler
+    c_compiler: str = "gcc"
+    #: C++ compiler
+    cxx_compiler: str = "g++"
+    #: Linker driver. Defaults to the C++ compiler.
+    linker: Optional[str] = None
+    #: Flags for all C sources
+    c_flags: list[str] = field(default_factory=list)
+    #: Flags for all C++ sources
+    cxx_flags: list[str] = field(default_factory=list)
+    #: Flags for all links
+    link_flags: list[str] = field(default_factory=list)
+    #: Additional compile flags per build type (e.g. ``Debug: [-g, -O0]``)
+    build_type_flags: dict[str, list[str]] = field(default_factory=dict)
+    #: Linker arguments for libraries not built by yanga (e.g. ``GTest::gtest_main: [-lgtest_main, -lgtest]``)
+    link_libraries: dict[str, list[str]] = field(default_factory=dict)
+    #: Object file suffix
+    object_suffix: str = ".o"
+    #: Executable file suffix
+    executable_suffix: str = ""
+    #: CMake executable used for the portable ``cmake -E`` commands. CMake is not used for configuring.
+    cmake_command: str = "cmake"
+
+    @classmethod
+    def from_file(cls, path: Path) -> "NinjaToolchainConfig":
+        return parse_config_element(cls, path)
+
+
+def get_ninja_toolchain_config_file(platform: Optional[PlatformConfig]) -> Optional[ConfigFile]:
+    """Return the platform config with id ``ninja_toolchain``. Its presence selects the ninja backend."""
+    if not platform:
+        return None
+    return next((cfg for cfg in platform.configs if cfg.id == NINJA_TOOLCHAIN_CONFIG_ID), None)
+
+
+def get_ninja_toolchain_config(execution_context: ExecutionContext) -> Optional[NinjaToolchainConfig]:
+    config_file = get_ninja_toolchain_config_file(execution_context.platform)
+    if not config_file:
+        return None
+    if config_file.content:
+        return NinjaToolchainConfig.from_dict(config_file.content)
+    # Same resolution as for the other configs: next to the declaring yaml first, then the project root
+    file = Path(str(config_file.file))
+    if config_file.location and config_file.location.file and not file.is_absolute() and (config_file.location.file.parent / file).exists():
+        return NinjaToolchainConfig.from_file(config_file.location.file.parent / file)
+    return NinjaToolchainConfig.from_file(execution_context.project_root_dir / file)
+
+
+def ninja_escape(value: str) -> str:
+    return value.replace("$", "$$").replace("\n", " ")
+
+
+def ninja_escape_path(path: str) -> str:
+    return ninja_escape(path).replace(" ", "$ ").replace(":", "$:")
+
+
+class NinjaBuildFile(GeneratedFileIf):
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.lines: list[str] = []
+
+    def to_string(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+    def comment(self, text: str) -> None:
+        self.lines.append(f"# {text}")
+
+    def variable(self, name: str, value: str, indent: bool = False) -> None:
+        self.lines.append(f"{'  ' if indent else ''}{name} = {value}")
+
+    def rule(self, name: str, variables: dict[str, str]) -> None:
+        self.lines.append(f"rule {name}")
+        for key, value in variables.items():
+            self.variable(key, value, indent=True)
+        self.lines.append("")
+
+    def build(
+        self,
+        outputs: list[str],
+        rule: str,
+        inputs: Optional[list[str]] = None,
+        implicit: Optional[list[str]] = None,
+        order_only: Optional[list[str]] = None,
+        implicit_outputs: Optional[list[str]] = None,
+        variables: Optional[dict[str, str]] = None,
+    ) -> None:
+        line = "build " + " ".join(ninja_escape_path(output) for output in outputs)
+        if implicit_outputs:
+            line += " | " + " ".join(ninja_escape_path(output) for output in implicit_outputs)
+        line += f": {rule}"
+        if inputs:
+            line += " " + " ".join(ninja_escape_path(item) for item in inputs)
+        if implicit:
+            line += " | " + " ".join(ninja_escape_path(item) for item in implicit)
+        if order_only:
+            line += " || " + " ".join(ninja_escape_path(item) for item in order_only)
+        self.lines.append(line)
+        for key, value in (variables or {}).items():
+            self.variable(key, ninja_escape(value), indent=True)
+        self.lines.append("")
+
+    def default(self, targets: list[str]) -> None:
+        self.lines.append("default " + " ".join(ninja_escape_path(target) for target in targets))
+
+
+@dataclass
+class _ObjectLibrary:
+    element: CMakeAddLibrary
+    #: (source, object) pairs
+    objects: list[tuple[Path, Path]] = field(default_factory=list)
+
+
+@dataclass
+class _Executable:
+    element: CMakeAddExecutable
+    output: Path = Path()
+
+
+class NinjaBuildFileGenerator:
+    """
+    Translate CMake elements into a ``build.ninja`` and a ``compile_commands.json`` file.
+
+    Supported are object libraries, executables, include directories, custom commands and custom targets,
+    which is everything the yanga generators emit. Custom commands get ``restat`` so ninja prunes the
+    dependents of outputs which were not rewritten. Header dependencies are tracked with depfiles.
+    """
+
+    VARIABLE_PATTERN = re.compile(r"\$\{(\w+)\}")
+    GENERATOR_EXPRESSION_PATTERN = re.compile(r"\$<(\w+):([^>]+)>")
+
+    def __init__(
+        self,
+        elements: list[CMakeElement],
+        toolchain: NinjaToolchainConfig,
+        build_dir: Path,
+        project_dir: Path,
+        project_name: str,
+        build_type: Optional[str] = None,
+    ) -> None:
+        self.logger = logger.bind()
+        self.elements = elements
+        self.toolchain = toolchain
+        self.build_dir = build_dir
+        self.project_dir = project_dir
+        self.build_type = build_type
+        self.variables: dict[str, str] = {
+            "CMAKE_COMMAND": toolchain.cmake_command,
+            "CMAKE_C_COMPILER": toolchain.c_compiler,
+            "CMAKE_CXX_COMPILER": toolchain.cxx_compiler,
+            "PROJECT_NAME": project_name,
+            "VARIANT": project_name,
+            "CMAKE_BUILD_TYPE": build_type or "",
+            "CMAKE_SOURCE_DIR": project_dir.as_posix(),
+            "CMAKE_CURRENT_SOURCE_DIR": project_dir.as_posix(),
+            "CMAKE_BINARY_DIR": build_dir.as_posix(),
+            "CMAKE_CURRENT_BINARY_DIR": build_dir.as_posix(),
+            "CMAKE_CURRENT_LIST_DIR": build_dir.as_posix(),
+        }
+        self.global_include_dirs: list[Path] = []
+        self.target_include_dirs: dict[str, list[tuple[IncludeScope, Path]]] = {}
+        self.target_properties: dict[str, dict[str, str]] = {}
+        self.target_precompile_headers: dict[str, CMakeTargetPrecompileHeaders] = {}
+        self.libraries: dict[str, _ObjectLibrary] = {}
+        self.executables: dict[str, _Executable] = {}
+        self.custom_commands: list[CMakeCustomCommand] = []
+        self.custom_targets: list[CMakeCustomTarget] = []
+        #: All outputs of custom commands, used to resolve relative dependencies
+        self.custom_command_outputs: set[Path] = set()
+        self.compile_commands: list[dict[str, str]] = []
+
+    @property
+    def build_ninja_file(self) -> Path:
+        return self.build_dir / "build.ninja"
+
+    def generate(self) -> list[GeneratedFileIf]:
+        self._collect_elements()
+        ninja_file = NinjaBuildFile(self.build_ninja_file)
+        ninja_file.comment("Generated by yanga. Do not edit.")
+        ninja_file.variable("ninja_required_version", "1.10")
+        ninja_file.lines.append("")
+        self._add_rules(ninja_file)
+        default_targets: list[str] = []
+        for library in self.libraries.values():
+            default_targets.extend(self._add_object_library(ninja_file, library))
+        for executable in self.executables.values():
+            default_targets.extend(self._add_executable(ninja_file, executable))
+        for custom_command in self.custom_commands:
+            self._add_custom_command(ninja_file, custom_command)
+        for custom_target in self.custom_targets:
+            self._add_custom_target(ninja_file, custom_target)
+            if custom_target.default_target:
+                default_targets.append(custom_target.name)
+        ninja_file.build(["all"], "phony", list(dict.fromkeys(default_targets)))
+        ninja_file.default(["all"])
+        return [
+            ninja_file,
+            GeneratedFile(self.build_dir / "compile_commands.json", json.dumps(self.compile_commands, indent=2)),
+        ]
+
+    def _collect_elements(self) -> None:
+        if any(isinstance(element, (CMakeAddTest, CMakeSetTestsProperties)) for element in self.elements):
+            # CTest reads the tests from the CTestTestfile.cmake files written by the CMake configure
+            raise UserNotificationException(
+                "CTest is not supported by the ninja backend, there is no CMake configure registering the tests. "
+                f"Disable the 'ctest' option of the GTestCMakeGenerator or remove the '{NINJA_TOOLCHAIN_CONFIG_ID}' platform config."
+            )
+        for element in self.elements:
+            if isinstance(element, CMakeVariable):
+                # Expanded on use, like CMake values which are only evaluated when referenced
+                self.variables[element.name] = element.value.strip('"')
+            elif isinstance(element, CMakeIncludeDirectories):
+                self.global_include_dirs.extend(self.resolve_source_path(path) for path in element.paths)
+            elif isinstance(element, CMakeTargetIncludeDirectories):
+                self.target_include_dirs.setdefault(element.target_name, []).extend((element.scope, self.resolve_source_path(path)) for path in element.paths)
+            elif isinstance(element, CMakeTargetPrecompileHeaders):
+                self.target_precompile_headers[self.expand(element.target_name)] = element
+            elif isinstance(element, CMakeSetTargetProperties):
+                self.target_properties.setdefault(self.expand(element.target), {}).update({key: self.expand(str(value)) for key, value in element.properties.items()})
+            elif isinstance(element, CMakeAddLibrary):
+                self.libraries[element.target_name] = _ObjectLibrary(element)
+            elif isinstance(element, CMakeAddExecutable):
+                self.executables[self.expand(element.name)] = _Executable(element)
+            elif isinstance(element, CMakeCustomCommand):
+                if element.target or element.build_event:
+                    raise UserNotificationException(f"Custom command '{element.description}' attached to a target build event is not supported by the ninja backend.")
+                if not element.outputs:
+                    raise UserNotificationException(f"Custom command '{element.description}' has no outputs.")
+                self.custom_commands.append(element)
+                self.custom_command_outputs.update(self.resolve_output_path(output) for output in element.outputs)
+            elif isinstance(element, CMakeCustomTarget):
+                self.custom_targets.append(element)
+            elif isinstance(element, CMakePrebuiltGTest):
+                self.logger.warning("Ignore the prebuilt GoogleTest for the ninja backend. Provide its libraries with the toolchain 'link_libraries'.")
+            elif isinstance(element, CMakeAddSubdirectory):
+                self.logger.warning(f"Ignore '{element}' for the ninja backend. Provide its libraries with the toolchain 'link_libraries'.")
+            elif isinstance(element, (CMakeComment, CMakeEmptyLine, CMakeProject, CMakeMinimumVersion, CMakeEnableTesting, CMakeAddTargetCleanFiles)):
+                continue
+            else:
+                raise UserNotificationException(f"CMake element '{type(element).__name__}' is not supported by the ninja backend.")
+        for name, library in self.libraries.items():
+            object_dir = self.build_dir / "CMakeFiles" / f"{name}.dir"
+            library.objects = [
+                (source, self._object_path(object_dir, source))
+                for source in (self.resolve_source_path(file) for file in library.element.files)
+                if source.suffix in C_SOURCE_SUFFIXES | CXX_SOURCE_SUFFIXES
+            ]
+        for name, executable in self.executables.items():
+            properties = self.target_properties.get(name, {})
+            output_dir = Path(properties["RUNTIME_OUTPUT_DIRECTORY"]) if "RUNTIME_OUTPUT_DIRECTORY" in properties else self.build_dir
+            executable.output = output_dir / f"{properties.get('OUTPUT_NAME', name)}{self.toolchain.executable_suffix}"
+
+    def expand(self, text: str) -> str:
+        """Replace the CMake variables and the supported generator expressions."""
+
+        def replace_variable(match: re.Match[str]) -> str:
+            name = match.group(1)
+            if name not in self.variables:
+                raise UserNotificationException(f"CMake variable '{name}' in '{text}' is not known by the ninja backend.")
+            return self.expand(self.variables[name])
+
+        def replace_generator_expression(match: re.Match[str]) -> str:
+            expression, target = match.group(1), match.group(2)
+            if expression == "TARGET_OBJECTS" and target in self.libraries:
+                return " ".join(obj.as_posix() for _, obj in self.libraries[target].objects)
+            if expression == "TARGET_FILE" and target in self.executables:
+                return self.executables[target].output.as_posix()
+            raise UserNotificationException(f"Generator expression '{match.group(0)}' is not supported by the ninja backend.")
+
+        expanded = self.VARIABLE_PATTERN.sub(replace_variable, text)
+        return self.GENERATOR_EXPRESSION_PATTERN.sub(replace_generator_expression, expanded)
+
+    def resolve_source_path(self, path: str | Path | CMakePath) -> Path:
+        expanded = Path(self.expand(path.as_posix() if isinstance(path, Path) else str(path)))
+        return expanded if expanded.is_absolute() else self.project_dir / expanded
+
+    def resolve_output_path(self, path: str | CMakePath) -> Path:
+        expanded = Path(self.expand(str(path)))
+        return expanded if expanded.is_absolute() else self.build_dir / expanded
+
+    def resolve_dependency(self, dependency: str | CMakePath) -> str:
+        """Map a DEPENDS entry to a ninja node: a target name, a custom command output or a source file."""
+        expanded = self.expand(str(dependency))
+        if expanded in self.libraries or expanded in self.executables or expanded in self._custom_target_names:
+            return expanded
+        output_path = self.resolve_output_path(expanded)
+        if output_path in self.custom_command_outputs:
+            return output_path.as_posix()
+        return self.resolve_source_path(expanded).as_posix()
+
+    @property
+    def _custom_target_names(self) -> set[str]:
+        return {target.name for target in self.custom_targets}
+
+    def _object_path(self, object_dir: Path, source: Path) -> Path:
+        if source.is_relative_to(self.project_dir):
+            relative_path = source.relative_to(self.project_dir).as_posix()
+        else:
+            # Keep the full path to avoid collisions, without the drive colon
+            relative_path = source.as_posix().replace(":", "").lstrip("/")
+        return object_dir / f"{relative_path}{self.toolchain.object_suffix}"
+
+    def _add_rules(self, ninja_file: NinjaBuildFile) -> None:
+        shell_prefix = "cmd /c " if os.name == "nt" else ""
+        for rule_name, compiler, language in (("c_compile", self.toolchain.c_compiler, "C"), ("cxx_compile", self.toolchain.cxx_compiler, "CXX")):
+            ninja_file.rule(
+                rule_name,
+                {
+                    "command": f"{compiler} $flags $includes -MD -MF $out.d -c $in -o $out",
+                    "depfile": "$out.d",
+                    "deps": "gcc",
+                    "description": f"Building {language} object $out",
+                },
+            )
+        ninja_file.rule(
+            "link",
+            {
+                "command": f"{self.toolchain.linker or self.toolchain.cxx_compiler} $in -o $out $link_flags $libs",
+                "description": "Linking executable $out",
+            },
+        )
+        ninja_file.rule(
+            "custom_command",
+            {
+                "command": f"{shell_prefix}$cmd",
+                "description": "$desc",
+                "restat": "1",
+            },
+        )
+
+    def _language_flags(self, source: Path) -> tuple[str, list[str]]:
+        if source.suffix in C_SOURCE_SUFFIXES:
+            flags = list(self.toolchain.c_flags)
+            if self.variables.get("CMAKE_C_STANDARD"):
+                flags.insert(0, f"-std=c{self.expand(self.variables['CMAKE_C_STANDARD'])}")
+            return "c_compile", flags
+        flags = list(self.toolchain.cxx_flags)
+        if self.variables.get("CMAKE_CXX_STANDARD"):
+            flags.insert(0, f"-std=c++{self.expand(self.variables['CMAKE_CXX_STANDARD'])}")
+        return "cxx_compile", flags
+
+    def _include_dirs(self, target_name: str, linked_libraries: list[str]) -> list[Path]:
+        include_dirs = list(self.global_include_dirs)
+        include_dirs.extend(path for scope, path in self.target_include_dirs.get(target_name, []) if scope != IncludeScope.INTERFACE)
+        for library in linked_libraries:
+            include_dirs.extend(path for scope, path in self.target_include_dirs.get(library, []) if scope != IncludeScope.PRIVATE)
+        return list(dict.fromkeys(include_dirs))
+
+    def _force_included_headers(self, target_name: str) -> list[str]:
+        """Headers are not precompiled by the ninja backend. Like CMake does for precompiled headers, they are included in every source."""
+        element = self.target_precompile_headers.get(target_name)
+        if element and element.reuse_from:
+            element = self.target_precompile_headers.get(self.expand(element.reuse_from))
+        if not element:
+            return []
+        headers = [header[1:-1] if isinstance(header, str) and header.startswith("<") else self.resolve_source_path(header).as_posix() for header in element.headers]
+        return [f"-include {header}" for header in headers]
+
+    def _compile(self, ninja_file: NinjaBuildFile, target_name: str, objects: list[tuple[Path, Path]], compile_options: list[str], linked_libraries: list[str]) -> None:
+        includes = " ".join(f"-I{path.as_posix()}" for path in self._include_dirs(target_name, linked_libraries))
+        force_included_headers = self._force_included_headers(target_name)
+        # Generated sources of the target must exist before any of its sources is compiled, they might provide headers
+        order_only = [source.as_posix() for source, _ in objects if source in self.custom_command_outputs]
+        for source, obj in objects:
+            rule, language_flags = self._language_flags(source)
+            flags = " ".join([*language_flags, *self.toolchain.build_type_flags.get(self.build_type or "", []), *compile_options, *force_included_headers])
+            ninja_file.build([obj.as_posix()], rule, [source.as_posix()], order_only=order_only, variables={"flags": flags, "includes": includes})
+            compiler = self.toolchain.c_compiler if rule == "c_compile" else self.toolchain.cxx_compiler
+            self.compile_commands.append(
+                {
+                    "directory": self.build_dir.as_posix(),
+                    "command": f"{compiler} {flags} {includes} -c {source.as_posix()} -o {obj.as_posix()}",
+                    "file": source.as_posix(),
+                    "output": obj.as_posix(),
+                }
+            )
+
+    def _add_object_library(self, ninja_file: NinjaBuildFile, library: _ObjectLibrary) -> list[str]:
+        name = library.element.target_name
+        self._compile(ninja_file, name, library.objects, library.element.compile_options, [])
+        ninja_file.build([name], "phony", [obj.as_posix() for _, obj in library.objects])
+        return [name] if library.element.type == LibraryType.OBJECT else []
+
+    def _add_executable(self, ninja_file: NinjaBuildFile, executable: _Executable) -> list[str]:
+        element = executable.element
+        name = self.expand(element.name)
+        sources: list[Path] = []
+        linked_objects: list[Path] = []
+        linked_libraries: list[str] = []
+        for source in element.sources:
+            if isinstance(source, CMakeAddLibrary):
+                linked_libraries.append(source.target_name)
+            else:
+                sources.append(self.resolve_source_path(source))
+        link_args: list[str] = []
+        for library in element.libraries:
+            library = self.expand(library)
+            if library in self.libraries:
+                linked_libraries.append(library)
+            elif library in self.toolchain.link_libraries:
+                link_args.extend(self.toolchain.link_libraries[library])
+            elif re.fullmatch(r"[\w+.-]+", library):
+                link_args.append(f"-l{library}")
+            else:
+                raise UserNotificationException(f"Library '{library}' of executable '{name}' is unknown. Define its linker arguments in the ninja toolchain 'link_libraries'.")
+        for library in linked_libraries:
+            linked_objects.extend(obj for _, obj in self.libraries[library].objects)
+        object_dir = self.build_dir / "CMakeFiles" / f"{name}.dir"
+        objects = [(source, self._object_path(object_dir, source)) for source in sources if source.suffix in C_SOURCE_SUFFIXES | CXX_SOURCE_SUFFIXES]
+        self._compile(ninja_file, name, objects, element.compile_options, linked_libraries)
+        ninja_file.build(
+            [executable.output.as_posix()],
+            "link",
+            [obj.as_posix() for _, obj in objects] + [obj.as_posix() for obj in linked_objects],
+            variables={"link_flags": " ".join([*self.toolchain.link_flags, *element.link_options]), "libs": " ".join(link_args)},
+        )
+        ninja_file.build([name], "phony", [executable.output.as_posix()])
+        return [] if element.exclude_from_all else [name]
+
+    def _render_commands(self, commands: list[str], working_directory: Optional[Path] = None) -> str:
+        command = " && ".join(commands)
+        if working_directory:
+            command = f"cd {working_directory.as_posix()} && {command}"
+        return command
+
+    def _add_custom_command(self, ninja_file: NinjaBuildFile, custom_command: CMakeCustomCommand) -> None:
+        ninja_file.build(
+            [self.resolve_output_path(output).as_posix() for output in custom_command.outputs or []],
+            "custom_command",
+            [self.resolve_dependency(dependency) for dependency in custom_command.depends or []],
+            implicit_outputs=[self.resolve_output_path(byproduct).as_posix() for byproduct in custom_command.byproducts or []],
+            variables={
+                "cmd": self._render_commands(
+                    [self.expand(command.to_string().removeprefix("COMMAND ")) for command in custom_command.commands],
+                    self.resolve_output_path(custom_command.working_directory) if custom_command.working_directory else None,
+                ),
+                "desc": custom_command.description,
+            },
+        )
+
+    def _add_custom_target(self, ninja_file: NinjaBuildFile, custom_target: CMakeCustomTarget) -> None:
+        dependencies = [self.resolve_dependency(dependency) for dependency in custom_target.depends or []]
+        if not custom_target.commands:
+            ninja_file.build([custom_target.name], "phony", dependencies)
+            return
+        # Like CMake, the commands of a custom target always run: their output is never created
+        always_run_output = (self.build_dir / "CMakeFiles" / f"{custom_target.name}.util").as_posix()
+        ninja_file.build(
+            [always_run_output],
+            "custom_command",
+            dependencies,
+            implicit_outputs=[self.resolve_output_path(byproduct).as_posix() for byproduct in custom_target.byproducts or []],
+            variables={
+                "cmd": self._render_commands([self.expand(command.to_string().removeprefix("COMMAND ")) for command in custom_target.commands]),
+                "desc": custom_target.description,
+            },
+        )
+        ninja_file.build([custom_target.name], "phony", [always_run_output])
@@ -0,0 +1,145 @@
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from mashumaro import DataClassDictMixin
+
+from .cmake_backend import CMakeAddSubdirectory, CMakeElement, CMakePath
+
+#: Abbreviated or full git commit hash
+COMMIT_HASH_PATTERN = re.compile(r"[0-9a-fA-F]{7,40}")
+#: Release tags like ``v1.17.0`` or ``release-1.8.1``
+RELEASE_TAG_PATTERN = re.compile(r"(v|release-)?\d+(\.\d+)+")
+
+
+@dataclass
+class PrebuiltGTestConfig(DataClassDictMixin):
+    #: Build GoogleTest once and import the prebuilt libraries instead of adding GoogleTest as subdirectory to every build directory
+    enabled: bool = True
+    #: Cache directory for the prebuilt libraries, shared by all variants, build types and checkouts. Relative paths are relative to the project root directory.
+    cache_dir: Optional[Path] = None
+
+    def get_cache_dir(self, project_root_dir: Path) -> Path:
+        if not self.cache_dir:
+            return Path.home() / ".yanga" / "gtest"
+        cache_dir = self.cache_dir.expanduser()
+        return cache_dir if cache_dir.is_absolute() else project_root_dir / cache_dir
+
+
+def is_fixed_revision(revision: str) -> bool:
+    """Check whether the revision looks like a commit hash or a release tag. Branches move, they can not be used as cache key."""
+    return bool(COMMIT_HASH_PATTERN.fullmatch(revision) or RELEASE_TAG_PATTERN.fullmatch(revision))
+
+
+class CMakePrebuiltGTest(CMakeElement):
+    """
+    Imports the ``GTest::`` targets from a GoogleTest installation in the cache directory.
+
+    The installation is keyed on the GoogleTest sources and on everything which makes the libraries compatible
+    with the build directory: toolchain file (content), compilers, compiler flags, build type and C++ standard.
+    The sources are identified by the git tree hash of the checkout, resolved at configure time, because the
+    revision might be a moving branch. Without git only commit hash and release tag revisions are cached,
+    otherwise GoogleTest is added as subdirectory to the build directory.
+    It is built and installed during the CMake configure if it does not exist yet. A file lock serializes
+    concurrent configures of build directories sharing the same key.
+    """
+
+    def __init__(self, source_dir: CMakePath, revision: str, cache_dir: CMakePath, build_dir: CMakePath) -> None:
+        super().__init__()
+        self.source_dir = source_dir
+        self.revision = revision
+        self.cache_dir = cache_dir
+        self.build_dir = build_dir
+
+    def to_string(self) -> str:
+        tab = self.tab_prefix
+        fallback_revision = self.revision if is_fixed_revision(self.revision) else ""
+        return "\n".join(
+            [
+                'set(_yanga_gtest_sources "")',
+                "find_package(Git QUIET)",
+                "if(GIT_FOUND)",
+                f"{tab}execute_process(",
+                f'{tab * 2}COMMAND "${{GIT_EXECUTABLE}}" rev-parse HEAD:./',
+                f'{tab * 2}WORKING_DIRECTORY "{self.source_dir}"',
+                f"{tab * 2}OUTPUT_VARIABLE _yanga_gtest_sources",
+                f"{tab * 2}OUTPUT_STRIP_TRAILING_WHITESPACE",
+                f"{tab * 2}RESULT_VARIABLE _yanga_git_result",
+                f"{tab * 2}ERROR_QUIET",
+                f"{tab})",
+                f"{tab}if(NOT _yanga_git_result EQUAL 0)",
+                f'{tab * 2}set(_yanga_gtest_sources "{fallback_revision}")',
+                f"{tab}endif()",
+                "else()",
+                f'{tab}set(_yanga_gtest_sources "{fallback_revision}")',
+                "endif()",
+                # Configure again after the checkout moved
+                f'if(EXISTS "{self.source_dir}/.git/HEAD")',
+                f'{tab}set_property(DIRECTORY APPEND PROPERTY CMAKE_CONFIGURE_DEPENDS "{self.source_dir}/.git/HEAD")',
+                "endif()",
+                "if(_yanga_gtest_sources)",
+                *[f"{tab}{line}" for line in self._import_prebuilt().splitlines()],
+                "else()",
+                f'{tab}message(STATUS "GoogleTest revision {self.revision} can not be resolved to a commit, it is not cached")',
+                f"{tab}{CMakeAddSubdirectory(self.source_dir, self.build_dir).to_string()}",
+                "endif()",
+            ]
+        )
+
+    def _import_prebuilt(self) -> str:
+        tab = self.tab_prefix
+        revision = re.sub(r"[^\w.-]", "_", self.revision)
+        prefix = f"{self.cache_dir}/{revision}-${{_yanga_gtest_key}}"
+        return "\n".join(
+            [
+                'string(TOUPPER "${CMAKE_BUILD_TYPE}" _yanga_build_type)',
+                "set(_yanga_gtest_args",
+                f'{tab}-G "${{CMAKE_GENERATOR}}"',
+                f'{tab}"-DCMAKE_BUILD_TYPE=${{CMAKE_BUILD_TYPE}}"',
+                f'{tab}"-DCMAKE_C_COMPILER=${{CMAKE_C_COMPILER}}"',
+                f'{tab}"-DCMAKE_CXX_COMPILER=${{CMAKE_CXX_COMPILER}}"',
+                f'{tab}"-DCMAKE_C_FLAGS=${{CMAKE_C_FLAGS}}"',
+                f'{tab}"-DCMAKE_CXX_FLAGS=${{CMAKE_CXX_FLAGS}}"',
+                f'{tab}"-DCMAKE_C_FLAGS_${{_yanga_build_type}}=${{CMAKE_C_FLAGS_${{_yanga_build_type}}}}"',
+                f'{tab}"-DCMAKE_CXX_FLAGS_${{_yanga_build_type}}=${{CMAKE_CXX_FLAGS_${{_yanga_build_type}}}}"',
+                f'{tab}"-DCMAKE_CXX_STANDARD=${{CMAKE_CXX_STANDARD}}"',
+                f"{tab}-DCMAKE_CXX_STANDARD_REQUIRED=ON",
+                f"{tab}-Dgtest_force_shared_crt=ON",
+                f"{tab}-DBUILD_GMOCK=ON",
+                f"{tab}-DINSTALL_GTEST=ON",
+                ")",
+                'set(_yanga_gtest_key "${_yanga_gtest_sources};${CMAKE_CXX_COMPILER_ID}-${CMAKE_CXX_COMPILER_VERSION};${_yanga_gtest_args}")',
+                "if(CMAKE_TOOLCHAIN_FILE)",
+                f'{tab}list(APPEND _yanga_gtest_args "-DCMAKE_TOOLCHAIN_FILE=${{CMAKE_TOOLCHAIN_FILE}}")',
+                f'{tab}file(SHA256 "${{CMAKE_TOOLCHAIN_FILE}}" _yanga_toolchain_hash)',
+                f'{tab}string(APPEND _yanga_gtest_key ";${{_yanga_toolchain_hash}}")',
+                "endif()",
+                "if(CMAKE_MAKE_PROGRAM)",
+                f'{tab}list(APPEND _yanga_gtest_args "-DCMAKE_MAKE_PROGRAM=${{CMAKE_MAKE_PROGRAM}}")',
+                "endif()",
+                'string(SHA256 _yanga_gtest_key "${_yanga_gtest_key}")',
+                "string(SUBSTRING ${_yanga_gtest_key} 0 16 _yanga_gtest_key)",
+                f"set(YANGA_GTEST_PREFIX {prefix})",
+                'if(NOT EXISTS "${YANGA_GTEST_PREFIX}/.complete")',
+                f"{tab}file(MAKE_DIRECTORY {self.cache_dir})",
+                f'{tab}file(LOCK "${{YANGA_GTEST_PREFIX}}.lock" GUARD FILE TIMEOUT 3600)',
+                f'{tab}if(NOT EXISTS "${{YANGA_GTEST_PREFIX}}/.complete")',
+                f'{tab * 2}message(STATUS "Build GoogleTest {self.revision} in ${{YANGA_GTEST_PREFIX}}")',
+                f'{tab * 2}file(REMOVE_RECURSE "${{YANGA_GTEST_PREFIX}}")',
+                f"{tab * 2}execute_process(",
+                f'{tab * 3}COMMAND ${{CMAKE_COMMAND}} -S {self.source_dir} -B "${{YANGA_GTEST_PREFIX}}/build"',
+                f'{tab * 4}${{_yanga_gtest_args}} "-DCMAKE_INSTALL_PREFIX=${{YANGA_GTEST_PREFIX}}"',
+                f"{tab * 3}COMMAND_ERROR_IS_FATAL ANY",
+                f"{tab * 2})",
+                f"{tab * 2}execute_process(",
+                f'{tab * 3}COMMAND ${{CMAKE_COMMAND}} --build "${{YANGA_GTEST_PREFIX}}/build" --target install',
+                f"{tab * 3}COMMAND_ERROR_IS_FATAL ANY",
+                f"{tab * 2})",
+                f'{tab * 2}file(REMOVE_RECURSE "${{YANGA_GTEST_PREFIX}}/build")',
+                f'{tab * 2}file(TOUCH "${{YANGA_GTEST_PREFIX}}/.complete")',
+                f"{tab}endif()",
+                "endif()",
+                'find_package(GTest CONFIG REQUIRED PATHS "${YANGA_GTEST_PREFIX}" NO_DEFAULT_PATH)',
+            ]
+        )
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from mashumaro import DataClassDictMixin
+
+from .cmake_backend import CMakePath, CMakeTargetPrecompileHeaders
+
+
+@dataclass
+class PrecompiledHeadersConfig(DataClassDictMixin):
+    #: Precompile the headers
+    enabled: bool = True
+    #: Headers to precompile. System headers in angle brackets (``<vector>``), project headers relative to the project root directory.
+    headers: list[str] = field(default_factory=list)
+    #: Precompile the headers only once and reuse them for all targets of the variant.
+    #: All targets must be compiled with the same compile options.
+    reuse: bool = False
+
+
+class PrecompiledHeaders:
+    """
+    Creates the precompiled headers of the targets of a generator.
+
+    Targets using the generator configuration share the precompiled headers of the ``reuse_target`` if reuse is enabled.
+    Targets with a component specific configuration always get their own precompiled headers.
+    """
+
+    def __init__(self, project_root_dir: Path, config: Optional[PrecompiledHeadersConfig], default_headers: Optional[list[str]] = None) -> None:
+        self.project_root_dir = project_root_dir
+        self.config = config
+        self.default_headers = default_headers or []
+        self.reuse_target: Optional[str] = None
+
+    def resolve_headers(self, config: PrecompiledHeadersConfig) -> list[str | CMakePath]:
+        return [header if header.startswith("<") else CMakePath(self.project_root_dir / header) for header in config.headers or self.default_headers]
+
+    def create(self, target_name: str, config: Optional[PrecompiledHeadersConfig]) -> Optional[CMakeTargetPrecompileHeaders]:
+        if not config or not config.enabled:
+            return None
+        if config is self.config and config.reuse and self.reuse_target and self.reuse_target != target_name:
+            return CMakeTargetPrecompileHeaders(target_name, reuse_from=self.reuse_target)
+        headers = self.resolve_headers(config)
+        return CMakeTargetPrecompileHeaders(target_name, headers) if headers else None
@@ -11,6 +11,10 @@ from yanga.cmake.generator import CMakeGenerator
 
 
 class ReportCMakeGenerator(CMakeGenerator):
+    # Collects the report relevant files of all generators configured before it
+    produces = (ReportRelevantFiles,)
+    consumes = (ReportRelevantFiles,)
+
     def __init__(
         self,
         execution_context: ExecutionContext,
@@ -132,9 +136,8 @@ class ReportCMakeGenerator(CMakeGenerator):
             test_results = any(
                 entry
                 for entry in self.execution_context.data_registry.find_data(ReportRelevantFiles)
-                # TODO: when test results are registered, use the TEST_RESULT type.
-                #       Currently, we assume that tests were executed if there are coverage results
-                if entry.file_type == ReportRelevantFileType.COVERAGE_RESULT and entry.target.component_name == component.name
+                # The test timing report is registered as test result. Without it, tests were executed if there are coverage results.
+                if entry.file_type in (ReportRelevantFileType.TEST_RESULT, ReportRelevantFileType.COVERAGE_RESULT) and entry.target.component_name == component.name
             )
             if test_results:
                 source_files.extend([CMakePath(source) for source in component.test_sources])
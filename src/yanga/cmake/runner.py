@@ -1,17 +1,55 @@
+import os
 from pathlib import Path
 from typing import Optional
 
 from py_app_dev.core.logging import logger
 
 
+def read_cmake_cache(cache_file: Path) -> dict[str, str]:
+    """Parse the ``NAME:TYPE=VALUE`` entries of a ``CMakeCache.txt`` file."""
+    entries: dict[str, str] = {}
+    if not cache_file.is_file():
+        return entries
+    for line in cache_file.read_text(errors="replace").splitlines():
+        if not line or line.startswith(("#", "//")) or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        entries[key.split(":", 1)[0]] = value
+    return entries
+
+
 class CMakeRunner:
     executable = "cmake"
+    ninja_executable = "ninja"
 
     def __init__(self, project_dir: Path, build_dir: Path) -> None:
         self.logger = logger.bind()
         self.project_dir = project_dir
         self.build_dir = build_dir
 
+    @property
+    def cache_file(self) -> Path:
+        return self.build_dir / "CMakeCache.txt"
+
+    @property
+    def build_ninja_file(self) -> Path:
+        return self.build_dir / "build.ninja"
+
+    def get_configure_cache_entries(
+        self, toolchain_file: Optional[str], variant_name: Optional[str], platform_name: Optional[str], build_type: Optional[str] = None
+    ) -> dict[str, str]:
+        """Cache entries passed as ``-D`` arguments to the configure command."""
+        entries: dict[str, str] = {}
+        if toolchain_file:
+            entries["CMAKE_TOOLCHAIN_FILE"] = toolchain_file
+        if variant_name:
+            entries["VARIANT"] = variant_name
+        if platform_name:
+            entries["PLATFORM"] = platform_name
+        if build_type:
+            entries["CMAKE_BUILD_TYPE"] = build_type
+        return entries
+
     def get_configure_command(self, toolchain_file: Optional[str], variant_name: Optional[str], platform_name: Optional[str], build_type: Optional[str] = None) -> list[str | Path]:
         cmake_args = [
             "-S",
@@ -21,22 +59,58 @@ class CMakeRunner:
             "-G",
             "Ninja",
         ]
-        if toolchain_file:
-            cmake_args.append(f"-DCMAKE_TOOLCHAIN_FILE={toolchain_file}")
-        if variant_name:
-            cmake_args.append(f"-DVARIANT={variant_name}")
-        if platform_name:
-            cmake_args.append(f"-DPLATFORM={platform_name}")
-        if build_type:
-            cmake_args.append(f"-DCMAKE_BUILD_TYPE={build_type}")
+        for name, value in self.get_configure_cache_entries(toolchain_file, variant_name, platform_name, build_type).items():
+            cmake_args.append(f"-D{name}={value}")
         return [self.executable, *cmake_args]
 
-    def get_build_command(self, target: str = "all") -> list[str | Path]:
+    def is_configuration_up_to_date(self, cache_entries: dict[str, str], generated_inputs: list[Path]) -> bool:
+        """
+        Check whether a previous configure can be reused as is.
+
+        The configuration is up to date if ``build.ninja`` exists, the cache holds the same values
+        for the given entries and none of the generated inputs is newer than ``build.ninja``.
+        """
+        if not self.build_ninja_file.is_file():
+            return False
+        cached_entries = read_cmake_cache(self.cache_file)
+        for name, value in cache_entries.items():
+            cached_value = cached_entries.get(name)
+            if cached_value is None or not self._same_cache_value(name, cached_value, value):
+                self.logger.debug(f"CMake cache entry {name} changed: '{cached_value}' -> '{value}'")
+                return False
+        build_ninja_mtime = self.build_ninja_file.stat().st_mtime
+        for generated_input in generated_inputs:
+            if generated_input.is_file() and generated_input.stat().st_mtime > build_ninja_mtime:
+                self.logger.debug(f"Generated input {generated_input} is newer than {self.build_ninja_file}")
+                return False
+        return True
+
+    @staticmethod
+    def _same_cache_value(name: str, cached_value: str, value: str) -> bool:
+        if name == "CMAKE_TOOLCHAIN_FILE":
+            # CMake stores the toolchain file as absolute path
+            return Path(cached_value).absolute().as_posix() == Path(value).absolute().as_posix()
+        return cached_value == value
+
+    def get_build_command(self, target: str | list[str] = "all") -> list[str | Path]:
         return [
             self.executable,
             "--build",
             self.build_dir.absolute().as_posix(),
             "--target",
-            target,
+            *([target] if isinstance(target, str) else target),
             "--",
         ]
+
+    def get_ninja_build_command(self, target: str | list[str] = "all") -> list[str | Path]:
+        command: list[str | Path] = [
+            self.ninja_executable,
+            "-C",
+            self.build_dir.absolute().as_posix(),
+        ]
+        # Honour the parallel level like `cmake --build` does
+        parallel_level = os.environ.get("CMAKE_BUILD_PARALLEL_LEVEL")
+        if parallel_level:
+            command.extend(["-j", parallel_level])
+        command.extend([target] if isinstance(target, str) else target)
+        return command
@@ -1,46 +1,95 @@
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
 
+from mashumaro import DataClassDictMixin
 from py_app_dev.core.logging import logger
 from pypeline.domain.pipeline import PipelineStep
 from yanga_core.domain.execution_context import ExecutionContext
 
+from yanga.affected import AffectedComponents, UserAffectedTestsRequest
 from yanga.cmake.builder import CMakeBuildSystemGenerator, get_toolchain_config_file
 from yanga.cmake.cmake_backend import CMakePath
+from yanga.cmake.generation_cache import GenerationCache, GenerationFingerprint, GenerationSnapshot, RecordingDataRegistry, restore_entries
+from yanga.cmake.generator import GeneratedFilesWriter
+from yanga.cmake.ninja_backend import get_ninja_toolchain_config_file
 from yanga.cmake.runner import CMakeRunner
 
 
+@dataclass
+class GenerateBuildSystemFilesConfig(DataClassDictMixin):
+    #: Number of threads used to run the CMake generators. The generators run sequentially by default.
+    max_workers: int = 1
+
+
 class GenerateBuildSystemFiles(PipelineStep[ExecutionContext]):
     """
-    Always re-runs.
+    Always runs, but only generates when a generation input changed.
 
     pypeline's runnable framework hashes input/output *files* — it cannot detect changes
     in this step's *generator code*. After a yanga upgrade, an unchanged yaml + an unchanged
     on-disk ``variant.cmake`` would be reported as MATCH, so a stale ``variant.cmake`` (written
     by an older yanga) survives the upgrade and cmake reconfigures from it. Symptom: targets
     added by the new yanga (e.g. ``<comp>_clean``) are missing → ``ninja: unknown target``.
-    Always-running the step is sub-second pure-Python work and matches ``ExecuteBuild``'s
-    "always run; build system handles its own deps" pattern.
+    The step therefore keeps its own :class:`GenerationFingerprint`, which also covers the
+    generator sources. When it matches the one stored in the variant build dir, the data
+    registry entries of the previous generation are restored and no generator runs.
+
+    Files are only rewritten when their content changed. Keeping the mtime of unchanged
+    files stops cmake from treating its inputs as dirty and reconfiguring on no-op runs.
     """
 
     def __init__(self, execution_context: ExecutionContext, group_name: Optional[str] = None, config: Optional[dict[str, Any]] = None) -> None:
         super().__init__(execution_context, group_name, config)
         self.logger = logger.bind()
         self.generated_files: list[Path] = []
+        self.written_files: list[Path] = []
+        self.skipped_files: list[Path] = []
 
     @property
     def output_dir(self) -> Path:
         return self.execution_context.spl_paths.variant_build_dir
 
+    @cached_property
+    def config_obj(self) -> GenerateBuildSystemFilesConfig:
+        return GenerateBuildSystemFilesConfig.from_dict(self.config) if self.config else GenerateBuildSystemFilesConfig()
+
     def get_name(self) -> str:
         return self.__class__.__name__
 
     def run(self) -> int:
         self.logger.info(f"Run {self.__class__.__name__} stage. Output dir: {self.output_dir}")
-        generated_files = CMakeBuildSystemGenerator(self.execution_context, self.output_dir).generate()
-        for file in generated_files:
-            file.to_file()
+        build_system_generator = CMakeBuildSystemGenerator(self.execution_context, self.output_dir, self.config_obj.max_workers)
+        fingerprint = GenerationFingerprint(self.execution_context, build_system_generator.load_generators()).digest
+        cache = GenerationCache(self.output_dir)
+        snapshot = cache.load(fingerprint)
+        if snapshot:
+            self.logger.info("Build system generation inputs unchanged. Restored the previous generation results.")
+            restore_entries(self.execution_context.data_registry, snapshot)
+            self.generated_files = snapshot.generated_files
+            self.skipped_files = list(snapshot.generated_files)
+            return 0
+
+        data_registry = self.execution_context.data_registry
+        recording_registry = RecordingDataRegistry(data_registry)
+        self.execution_context.data_registry = recording_registry
+        try:
+            generated_files = build_system_generator.generate()
+        finally:
+            self.execution_context.data_registry = data_registry
+        writer = GeneratedFilesWriter()
+        writer.write_all(generated_files)
         self.generated_files = [file.path for file in generated_files]
+        self.written_files = writer.written_files
+        self.skipped_files = writer.skipped_files
+        cache.store(
+            GenerationSnapshot(
+                fingerprint=fingerprint,
+                entries=[(entry.data, entry.provider_name) for entry in recording_registry.entries],
+                generated_files=self.generated_files,
+            )
+        )
         return 0
 
     def get_inputs(self) -> list[Path]:
@@ -53,6 +102,14 @@ class GenerateBuildSystemFiles(PipelineStep[ExecutionContext]):
         pass
 
 
+@dataclass
+class ExecuteBuildConfig(DataClassDictMixin):
+    #: Skip the cmake configure if the existing configuration is up to date (same cache entries, no newer generated inputs)
+    skip_up_to_date_configure: bool = False
+    #: Call ninja directly instead of ``cmake --build``
+    use_ninja: bool = False
+
+
 class ExecuteBuild(PipelineStep[ExecutionContext]):
     """The step is always executed. The dependencies are handled by the build system itself."""
 
@@ -60,6 +117,10 @@ class ExecuteBuild(PipelineStep[ExecutionContext]):
         super().__init__(execution_context, group_name, config)
         self.logger = logger.bind()
 
+    @cached_property
+    def config_obj(self) -> ExecuteBuildConfig:
+        return ExecuteBuildConfig.from_dict(self.config) if self.config else ExecuteBuildConfig()
+
     @property
     def output_dir(self) -> Path:
         return self.execution_context.spl_paths.variant_build_dir
@@ -77,10 +138,44 @@ class ExecuteBuild(PipelineStep[ExecutionContext]):
             raw = get_toolchain_config_file(platform)
             if raw:
                 toolchain_file = CMakePath(self.execution_context.spl_paths.locate_artifact(raw, [platform.file])).to_string()
-        self._run(cmake_runner.get_configure_command(toolchain_file, self.execution_context.variant_name, platform_name, self.execution_context.user_request.build_type))
-        self._run(cmake_runner.get_build_command(self.execution_context.user_request.target_name))
+        build_type = self.execution_context.user_request.build_type
+        target_names = self.get_target_names()
+        if not target_names:
+            self.logger.info("No component tests affected by the changes. Nothing to build.")
+            return 0
+        if get_ninja_toolchain_config_file(platform):
+            self.logger.info("Native ninja backend selected. Skip the CMake configure.")
+            self._run(cmake_runner.get_ninja_build_command(target_names))
+            return 0
+        if self.config_obj.skip_up_to_date_configure and cmake_runner.is_configuration_up_to_date(
+            cmake_runner.get_configure_cache_entries(toolchain_file, self.execution_context.variant_name, platform_name, build_type),
+            self.generated_inputs,
+        ):
+            self.logger.info("CMake configuration is up to date. Skip configure.")
+        else:
+            self._run(cmake_runner.get_configure_command(toolchain_file, self.execution_context.variant_name, platform_name, build_type))
+        if self.config_obj.use_ninja:
+            self._run(cmake_runner.get_ninja_build_command(target_names))
+        else:
+            self._run(cmake_runner.get_build_command(target_names))
         return 0
 
+    def get_target_names(self) -> list[str]:
+        user_request = self.execution_context.user_request
+        if isinstance(user_request, UserAffectedTestsRequest) and user_request.affected_since:
+            # All affected test targets are built by a single build tool invocation
+            return AffectedComponents.from_execution_context(self.execution_context).get_test_targets(user_request.affected_since)
+        return [user_request.target_name]
+
+    @property
+    def generated_inputs(self) -> list[Path]:
+        """Files the configure step reads which are (re)written by yanga."""
+        return [
+            self.project_root_dir / "CMakeLists.txt",
+            self.output_dir / "config.cmake",
+            self.output_dir / "variant.cmake",
+        ]
+
     def _run(self, cmd: list[str | Path]) -> None:
         self.execution_context.create_process_executor(cmd).execute()
 
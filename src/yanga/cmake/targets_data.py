@@ -10,6 +10,9 @@ from yanga.cmake.generator import CMakeGenerator
 
 
 class TargetsDataCMakeGenerator(CMakeGenerator):
+    produces = (ReportRelevantFiles,)
+    consumes = ()
+
     def __init__(
         self,
         execution_context: ExecutionContext,
@@ -11,8 +11,17 @@ from yanga_core.commands.fix_html_links import FixHtmlLinksCommand
 from yanga_core.commands.report_config import ReportConfigCommand
 
 from yanga import __version__
-from yanga.commands.gcovr import CreateComponentGcovrConfigCommand, CreateVariantGcovrConfigCommand
+from yanga.commands.coverage_diff import CoverageDiffCommand
+from yanga.commands.coverage_html import CoverageHtmlCommand
+from yanga.commands.coverage_merge import CoverageMergeCommand
+from yanga.commands.gcovr import ComponentCoverageReportCommand, CreateComponentGcovrConfigCommand, CreateVariantGcovrConfigCommand
+from yanga.commands.link_directory import LinkDirectoryCommand
+from yanga.commands.mockup import MockupCommand
+from yanga.commands.object_symbols import ObjectSymbolsCommand
 from yanga.commands.targets import TargetsDocCommand
+from yanga.commands.test_shards import MergeTestShardsCommand
+from yanga.commands.timing_report import TestTimingCommand
+from yanga.commands.unity import UnitySourceCommand
 
 
 def do_run() -> int:
@@ -26,8 +35,18 @@ def do_run() -> int:
             FixHtmlLinksCommand(),
             ReportConfigCommand(),
             CreateComponentGcovrConfigCommand(),
+            ComponentCoverageReportCommand(),
+            CoverageDiffCommand(),
+            CoverageMergeCommand(),
+            CoverageHtmlCommand(),
             CreateVariantGcovrConfigCommand(),
+            LinkDirectoryCommand(),
             TargetsDocCommand(),
+            UnitySourceCommand(),
+            MergeTestShardsCommand(),
+            TestTimingCommand(),
+            MockupCommand(),
+            ObjectSymbolsCommand(),
         ]
     )
     handler = builder.create()
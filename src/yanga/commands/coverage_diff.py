@@ -0,0 +1,182 @@
+"""
+Command line utility to report the coverage of the lines changed relative to a base revision.
+
+The changed lines are taken from ``git diff`` between the merge base with the base revision and the
+working tree. They are intersected with the line coverage of the component ``coverage.json`` reports
+(gcovr JSON format). A line is covered if any component covers it. Lines without coverage data
+(comments, declarations, test sources, ...) are not relevant.
+"""
+
+import json
+import os
+import re
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.logging import logger
+from yanga_core.commands.base import create_config
+
+from yanga.cmake.coverage import load_coverage_report
+from yanga.cmake.generator import GeneratedFile
+from yanga.sources import run_git
+
+HUNK_PATTERN = re.compile(r"^@@ -\S+ \+(\d+)(?:,(\d+))? @@")
+#: Environment variable overriding the base revision at build time
+BASE_REF_ENV_VARIABLE = "YANGA_COVERAGE_DIFF_BASE"
+
+
+@dataclass
+class FileDiffCoverage:
+    #: File path relative to the project directory
+    file: str
+    #: Changed lines with coverage data
+    lines: int
+    covered: int
+    uncovered_lines: list[int]
+
+
+@dataclass
+class DiffCoverage:
+    base_ref: str
+    files: list[FileDiffCoverage] = field(default_factory=list)
+
+    @property
+    def lines(self) -> int:
+        return sum(file.lines for file in self.files)
+
+    @property
+    def covered(self) -> int:
+        return sum(file.covered for file in self.files)
+
+    @property
+    def percent(self) -> Optional[float]:
+        return round(100.0 * self.covered / self.lines, 2) if self.lines else None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "base_ref": self.base_ref,
+                "summary": {"lines": self.lines, "covered": self.covered, "percent": self.percent},
+                "files": [file.__dict__ for file in self.files],
+            },
+            indent=2,
+        )
+
+    def to_markdown(self) -> str:
+        percent = "n/a" if self.percent is None else f"{self.percent}%"
+        content = [
+            "# Diff Coverage",
+            "",
+            f"Coverage of the lines changed relative to `{self.base_ref}`: **{percent}** ({self.covered}/{self.lines} lines).",
+        ]
+        if self.files:
+            content.extend(["", "| File | Covered | Lines | Uncovered lines |", "| --- | ---: | ---: | --- |"])
+            content.extend(f"| {file.file} | {file.covered} | {file.lines} | {format_line_ranges(file.uncovered_lines)} |" for file in self.files)
+        return "\n".join(content) + "\n"
+
+
+def format_line_ranges(lines: list[int]) -> str:
+    ranges: list[list[int]] = []
+    for line in lines:
+        if ranges and ranges[-1][1] == line - 1:
+            ranges[-1][1] = line
+        else:
+            ranges.append([line, line])
+    return ", ".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def parse_changed_lines(diff: str, root_dir: Path) -> dict[Path, set[int]]:
+    """Collect the added or modified lines per file from a ``git diff --unified=0`` output."""
+    changed_lines: dict[Path, set[int]] = {}
+    current_file: Optional[set[int]] = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            target = line[4:].strip()
+            current_file = None if target == "/dev/null" else changed_lines.setdefault(root_dir / target.removeprefix("b/"), set())
+        elif current_file is not None and (match := HUNK_PATTERN.match(line)):
+            start, count = int(match.group(1)), int(match.group(2) or "1")
+            current_file.update(range(start, start + count))
+    return changed_lines
+
+
+def get_changed_lines(project_dir: Path, base_ref: str) -> dict[Path, set[int]]:
+    root_dir = Path(run_git(project_dir, "rev-parse", "--show-toplevel").strip())
+    diff = run_git(project_dir, "diff", "--unified=0", "--no-color", "--no-ext-diff", "--merge-base", base_ref)
+    return parse_changed_lines(diff, root_dir)
+
+
+def collect_line_coverage(coverage_files: list[Path], project_dir: Path) -> dict[Path, dict[int, bool]]:
+    """Collect per file and line whether any of the gcovr JSON reports covers it."""
+    line_coverage: dict[Path, dict[int, bool]] = {}
+    for coverage_file in coverage_files:
+        if not coverage_file.is_file():
+            logger.warning(f"Coverage report {coverage_file} not found.")
+            continue
+        for file_data in load_coverage_report(coverage_file).get("files", []):
+            lines = line_coverage.setdefault((project_dir / file_data["file"]).resolve(), {})
+            for line in file_data.get("lines", []):
+                if line.get("gcovr/noncode"):
+                    continue
+                lines[line["line_number"]] = lines.get(line["line_number"], False) or line["count"] > 0
+    return line_coverage
+
+
+def create_diff_coverage(base_ref: str, changed_lines: dict[Path, set[int]], line_coverage: dict[Path, dict[int, bool]], project_dir: Path) -> DiffCoverage:
+    diff_coverage = DiffCoverage(base_ref)
+    project_dir = project_dir.resolve()
+    for file, lines in sorted(changed_lines.items()):
+        file = file.resolve()
+        coverage = line_coverage.get(file, {})
+        relevant_lines = sorted(line for line in lines if line in coverage)
+        if not relevant_lines:
+            continue
+        diff_coverage.files.append(
+            FileDiffCoverage(
+                file=(file.relative_to(project_dir) if file.is_relative_to(project_dir) else file).as_posix(),
+                lines=len(relevant_lines),
+                covered=sum(1 for line in relevant_lines if coverage[line]),
+                uncovered_lines=[line for line in relevant_lines if not coverage[line]],
+            )
+        )
+    return diff_coverage
+
+
+@dataclass
+class CoverageDiffCommandArgs(BaseConfigJSONMixin):
+    base_ref: str = field(metadata={"help": f"Git revision to compare against, e.g. origin/main. Overridden by the {BASE_REF_ENV_VARIABLE} environment variable."})
+    coverage_files: list[Path] = field(metadata={"help": "Component coverage JSON reports."})
+    project_dir: Path = field(metadata={"help": "Project root directory."})
+    output_file: Path = field(metadata={"help": "Output JSON report. The Markdown report is written next to it."})
+    fail_under: Optional[float] = field(default=None, metadata={"help": "Fail if the changed lines coverage is below the given percentage."})
+
+
+class CoverageDiffCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("coverage_diff", "Report the coverage of the lines changed relative to a base revision.")
+        self.logger = logger.bind()
+
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(CoverageDiffCommandArgs, args)
+        # Pull request builds know their base revision only at build time
+        base_ref = os.environ.get(BASE_REF_ENV_VARIABLE) or config.base_ref
+        diff_coverage = create_diff_coverage(
+            base_ref,
+            get_changed_lines(config.project_dir, base_ref),
+            collect_line_coverage(config.coverage_files, config.project_dir),
+            config.project_dir,
+        )
+        GeneratedFile(config.output_file, diff_coverage.to_json()).to_file()
+        GeneratedFile(config.output_file.with_suffix(".md"), diff_coverage.to_markdown()).to_file()
+        self.logger.info(f"Diff coverage relative to {base_ref}: {diff_coverage.covered}/{diff_coverage.lines} lines.")
+        if config.fail_under is not None and diff_coverage.percent is not None and diff_coverage.percent < config.fail_under:
+            self.logger.error(f"Diff coverage {diff_coverage.percent}% is below {config.fail_under}%.")
+            return 1
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, CoverageDiffCommandArgs)
@@ -0,0 +1,272 @@
+"""
+Command line utility to render the html coverage report from a gcovr JSON tracefile incrementally.
+
+gcovr renders the pages of all source files on every run. This renderer keeps a manifest in the
+output directory with a digest of the coverage data and the text of every source file. Only the
+pages of source files with a changed digest are rendered again. The index page is always rendered,
+it only needs the coverage summary of the files.
+"""
+
+import hashlib
+import html
+import json
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.logging import logger, time_it
+from yanga_core.commands.base import create_config
+
+from yanga.cmake.coverage import load_coverage_report
+
+#: Increment it when the page layout changes to render all pages again
+RENDERER_VERSION = 1
+MANIFEST_FILE_NAME = ".yanga.coverage_html.json"
+STYLESHEET_FILE_NAME = "coverage.css"
+STYLESHEET = """body { font-family: sans-serif; margin: 1em; }
+table { border-collapse: collapse; }
+th, td { padding: 0.1em 0.6em; text-align: right; }
+th.file, td.file, td.source { text-align: left; }
+td.source { font-family: monospace; white-space: pre; }
+tr.covered td.count { background-color: #cfc; }
+tr.uncovered td.count, tr.uncovered td.source { background-color: #fcc; }
+tr.partial td.branches { background-color: #ffc; }
+tr.excluded td.source { color: #888; }
+"""
+
+
+@dataclass
+class CoverageSummary(DataClassDictMixin):
+    lines_covered: int = 0
+    lines_total: int = 0
+    functions_covered: int = 0
+    functions_total: int = 0
+    branches_covered: int = 0
+    branches_total: int = 0
+
+    def add(self, other: "CoverageSummary") -> None:
+        self.lines_covered += other.lines_covered
+        self.lines_total += other.lines_total
+        self.functions_covered += other.functions_covered
+        self.functions_total += other.functions_total
+        self.branches_covered += other.branches_covered
+        self.branches_total += other.branches_total
+
+
+@dataclass
+class LineCoverage:
+    count: int = 0
+    branches_covered: int = 0
+    branches_total: int = 0
+    excluded: bool = False
+
+
+@dataclass
+class FileCoverage:
+    """Coverage of one source file, with the lines instantiated for several functions (e.g. templates) combined."""
+
+    file: str
+    lines: dict[int, LineCoverage]
+    summary: CoverageSummary
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FileCoverage":
+        lines: dict[int, LineCoverage] = {}
+        for line_data in data.get("lines", []):
+            line = lines.setdefault(line_data["line_number"], LineCoverage())
+            line.count += line_data.get("count", 0)
+            line.excluded = line.excluded or line_data.get("gcovr/excluded", False)
+            for branch in line_data.get("branches", []):
+                if not branch.get("gcovr/excluded", False):
+                    line.branches_total += 1
+                    line.branches_covered += branch.get("count", 0) > 0
+        summary = CoverageSummary()
+        for line in lines.values():
+            if line.excluded:
+                continue
+            summary.lines_total += 1
+            summary.lines_covered += line.count > 0
+            summary.branches_total += line.branches_total
+            summary.branches_covered += line.branches_covered
+        functions: dict[str, bool] = {}
+        for function in data.get("functions", []):
+            if not function.get("gcovr/excluded", False):
+                functions[function["name"]] = functions.get(function["name"], False) or function.get("execution_count", 0) > 0
+        summary.functions_total = len(functions)
+        summary.functions_covered = sum(functions.values())
+        return cls(data["file"], lines, summary)
+
+
+@dataclass
+class ManifestEntry(DataClassDictMixin):
+    digest: str
+    page: str
+
+
+def percent(covered: int, total: int) -> str:
+    return f"{100.0 * covered / total:.1f}%" if total else "-"
+
+
+def get_page_name(output_file: Path, file: str) -> str:
+    """Stable page name, independent of the other files in the report."""
+    return f"{output_file.stem}.{Path(file).name}.{hashlib.sha256(file.encode('utf-8')).hexdigest()[:12]}.html"
+
+
+def summary_cells(summary: CoverageSummary) -> str:
+    return "".join(
+        f"<td>{percent(covered, total)}</td><td>{covered}/{total}</td>"
+        for covered, total in (
+            (summary.lines_covered, summary.lines_total),
+            (summary.functions_covered, summary.functions_total),
+            (summary.branches_covered, summary.branches_total),
+        )
+    )
+
+
+def render_page(title: str, body: str) -> str:
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="en">\n'
+        f'<head><meta charset="utf-8"><title>{html.escape(title)}</title><link rel="stylesheet" href="{STYLESHEET_FILE_NAME}"></head>\n'
+        f"<body>\n<h1>{html.escape(title)}</h1>\n{body}</body>\n</html>\n"
+    )
+
+
+SUMMARY_HEADER = '<th colspan="2">Lines</th><th colspan="2">Functions</th><th colspan="2">Branches</th>'
+
+
+def render_source_page(title: str, file_coverage: FileCoverage, source_lines: Optional[list[str]], index_page: str) -> str:
+    rows = []
+    missing_source = "<p>Source file not found.</p>\n" if source_lines is None else ""
+    if source_lines is None:
+        source_lines = [""] * max(file_coverage.lines.keys(), default=0)
+    for line_number, text in enumerate(source_lines, start=1):
+        line = file_coverage.lines.get(line_number)
+        if line is None:
+            rows.append(f'<tr><td>{line_number}</td><td></td><td></td><td class="source">{html.escape(text)}</td></tr>')
+            continue
+        if line.excluded:
+            state = "excluded"
+        elif line.count == 0:
+            state = "uncovered"
+        elif line.branches_covered < line.branches_total:
+            state = "covered partial"
+        else:
+            state = "covered"
+        branches = f"{line.branches_covered}/{line.branches_total}" if line.branches_total else ""
+        rows.append(
+            f'<tr class="{state}"><td>{line_number}</td><td class="branches">{branches}</td><td class="count">{line.count}</td><td class="source">{html.escape(text)}</td></tr>'
+        )
+    return render_page(
+        f"{title}: {file_coverage.file}",
+        f'<p><a href="{index_page}">Back to the overview</a></p>\n'
+        f"<table>\n<tr>{SUMMARY_HEADER}</tr>\n<tr>{summary_cells(file_coverage.summary)}</tr>\n</table>\n"
+        f"{missing_source}"
+        '<table>\n<tr><th>Line</th><th>Branches</th><th>Count</th><th class="source">Source</th></tr>\n' + "\n".join(rows) + "\n</table>\n",
+    )
+
+
+def render_index_page(title: str, files: list[tuple[FileCoverage, str]]) -> str:
+    total = CoverageSummary()
+    rows = []
+    for file_coverage, page in files:
+        total.add(file_coverage.summary)
+        rows.append(f'<tr><td class="file"><a href="{page}">{html.escape(file_coverage.file)}</a></td>{summary_cells(file_coverage.summary)}</tr>')
+    return render_page(
+        title,
+        f'<table>\n<tr><th class="file">File</th>{SUMMARY_HEADER}</tr>\n<tr><th class="file">Total</th>{summary_cells(total)}</tr>\n' + "\n".join(rows) + "\n</table>\n",
+    )
+
+
+@dataclass
+class CoverageHtmlResult:
+    rendered: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def load_manifest(manifest_file: Path) -> dict[str, ManifestEntry]:
+    try:
+        data = json.loads(manifest_file.read_text(encoding="utf-8"))
+        if data.get("version") != RENDERER_VERSION:
+            return {}
+        return {file: ManifestEntry.from_dict(entry) for file, entry in data["files"].items()}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        # A missing or broken manifest only means that all pages are rendered again
+        return {}
+
+
+def read_source(root_dir: Path, file: str) -> Optional[bytes]:
+    try:
+        return root_dir.joinpath(file).read_bytes()
+    except OSError:
+        return None
+
+
+def render_coverage_html(tracefile: Path, output_file: Path, root_dir: Path, title: str = "Coverage Report") -> CoverageHtmlResult:
+    """Render the index page and the pages of the source files whose coverage data or text changed since the previous run."""
+    result = CoverageHtmlResult()
+    output_dir = output_file.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = output_dir / MANIFEST_FILE_NAME
+    previous_manifest = load_manifest(manifest_file)
+    manifest: dict[str, ManifestEntry] = {}
+    files: list[tuple[FileCoverage, str]] = []
+    for file_data in sorted(load_coverage_report(tracefile).get("files", []), key=lambda data: data["file"]):
+        file_coverage = FileCoverage.from_dict(file_data)
+        source = read_source(root_dir, file_coverage.file)
+        digest = hashlib.sha256(json.dumps(file_data, sort_keys=True).encode("utf-8"))
+        digest.update(source if source is not None else b"")
+        page = get_page_name(output_file, file_coverage.file)
+        manifest[file_coverage.file] = ManifestEntry(digest.hexdigest(), page)
+        files.append((file_coverage, page))
+        if previous_manifest.get(file_coverage.file) == manifest[file_coverage.file] and output_dir.joinpath(page).exists():
+            result.unchanged.append(file_coverage.file)
+            continue
+        source_lines = source.decode("utf-8", errors="replace").splitlines() if source is not None else None
+        output_dir.joinpath(page).write_text(render_source_page(title, file_coverage, source_lines, output_file.name), encoding="utf-8")
+        result.rendered.append(file_coverage.file)
+    for file in sorted(previous_manifest.keys() - manifest.keys()):
+        output_dir.joinpath(previous_manifest[file].page).unlink(missing_ok=True)
+        result.removed.append(file)
+    stylesheet = output_dir / STYLESHEET_FILE_NAME
+    if not stylesheet.exists() or stylesheet.read_text(encoding="utf-8") != STYLESHEET:
+        stylesheet.write_text(STYLESHEET, encoding="utf-8")
+    output_file.write_text(render_index_page(title, files), encoding="utf-8")
+    manifest_file.write_text(
+        json.dumps({"version": RENDERER_VERSION, "files": {file: entry.to_dict() for file, entry in manifest.items()}}, indent=2),
+        encoding="utf-8",
+    )
+    return result
+
+
+@dataclass
+class CoverageHtmlCommandArgs(BaseConfigJSONMixin):
+    tracefile: Path = field(metadata={"help": "gcovr JSON tracefile, e.g. the merged coverage report. It is gzip compressed if it ends with .gz."})
+    output_file: Path = field(metadata={"help": "Output HTML coverage report. The source file pages are written next to it."})
+    root_dir: Path = field(metadata={"help": "Root directory the source files in the tracefile are relative to."})
+    title: str = field(default="Coverage Report", metadata={"help": "Title of the report."})
+
+
+class CoverageHtmlCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("coverage_html", "Render the html coverage report, only the pages of changed source files are rendered again.")
+        self.logger = logger.bind()
+
+    @time_it("Render coverage html report")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(CoverageHtmlCommandArgs, args)
+        if not config.tracefile.is_file():
+            self.logger.error(f"Coverage tracefile {config.tracefile} not found.")
+            return 1
+        result = render_coverage_html(config.tracefile, config.output_file, config.root_dir, config.title)
+        self.logger.info(f"Rendered {len(result.rendered)}, unchanged {len(result.unchanged)} and removed {len(result.removed)} source pages.")
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, CoverageHtmlCommandArgs)
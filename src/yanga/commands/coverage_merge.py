@@ -0,0 +1,158 @@
+"""
+Command line utility to merge the component coverage reports into one gcovr JSON tracefile.
+
+gcovr keeps all coverage data of all tracefiles in memory to render a report. The merge reads one
+component report at a time and accumulates the line, branch, call and function counts in compact
+array-backed counters. The static data of a line (checksum, function, flags) is kept once per line,
+independent of the number of components covering it. The merged tracefile is written file by file.
+
+Conditions and decisions can not be summed up; they are taken from the first report with the line.
+"""
+
+import json
+from argparse import ArgumentParser, Namespace
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.logging import logger, time_it
+from yanga_core.commands.base import create_config
+
+from yanga.cmake.coverage import load_coverage_report, open_coverage_report
+
+GCOVR_FORMAT_VERSION_KEY = "gcovr/format_version"
+
+
+class Counters:
+    """Counters in a compact array, addressed by the key of the counted item."""
+
+    def __init__(self) -> None:
+        self.slots: dict[Any, int] = {}
+        self.counts = array("Q")
+
+    def add(self, key: Any, count: int) -> bool:
+        """Add the count. Returns whether the key is new."""
+        slot = self.slots.get(key)
+        if slot is None:
+            self.slots[key] = len(self.counts)
+            self.counts.append(count)
+            return True
+        self.counts[slot] += count
+        return False
+
+    def __getitem__(self, key: Any) -> int:
+        return self.counts[self.slots[key]]
+
+
+@dataclass
+class FileCoverageCounters:
+    #: Line data without the counts, by line number and function name
+    lines: dict[tuple[int, str], dict[str, Any]] = field(default_factory=dict)
+    line_counts: Counters = field(default_factory=Counters)
+    #: Branch data without the counts, by line key and branch key
+    branches: dict[tuple[int, str], list[tuple[tuple[int, int, int], dict[str, Any]]]] = field(default_factory=dict)
+    branch_counts: Counters = field(default_factory=Counters)
+    calls: dict[tuple[int, str], list[tuple[int, dict[str, Any]]]] = field(default_factory=dict)
+    call_counts: Counters = field(default_factory=Counters)
+    functions: dict[str, dict[str, Any]] = field(default_factory=dict)
+    function_counts: Counters = field(default_factory=Counters)
+
+    def add_line(self, line: dict[str, Any]) -> None:
+        line_key = (line["line_number"], line.get("function_name") or "")
+        if self.line_counts.add(line_key, line.get("count", 0)):
+            self.lines[line_key] = {key: value for key, value in line.items() if key not in ("count", "branches", "calls")}
+            self.branches[line_key] = []
+            self.calls[line_key] = []
+        for branch in line.get("branches", []):
+            branch_key = (branch.get("branchno", -1), branch.get("source_block_id", -1), branch.get("destination_block_id", -1))
+            if self.branch_counts.add((line_key, branch_key), branch.get("count", 0)):
+                self.branches[line_key].append((branch_key, {key: value for key, value in branch.items() if key != "count"}))
+        for call in line.get("calls", []):
+            if self.call_counts.add((line_key, call["callno"]), call.get("returned", 0)):
+                self.calls[line_key].append((call["callno"], {key: value for key, value in call.items() if key != "returned"}))
+
+    def add_function(self, function: dict[str, Any]) -> None:
+        name = function["name"]
+        if self.function_counts.add(name, function.get("execution_count", 0)):
+            self.functions[name] = {key: value for key, value in function.items() if key != "execution_count"}
+        elif "blocks_percent" in function:
+            # The block coverage of the components can not be combined, report the best one
+            self.functions[name]["blocks_percent"] = max(self.functions[name].get("blocks_percent", 0.0), function["blocks_percent"])
+
+    def to_dict(self, file: str) -> dict[str, Any]:
+        lines = []
+        for line_key, line in sorted(self.lines.items()):
+            merged_line = {**line, "count": self.line_counts[line_key]}
+            merged_line["branches"] = [{**branch, "count": self.branch_counts[(line_key, branch_key)]} for branch_key, branch in self.branches[line_key]]
+            if self.calls[line_key]:
+                merged_line["calls"] = [{**call, "returned": self.call_counts[(line_key, callno)]} for callno, call in self.calls[line_key]]
+            lines.append(merged_line)
+        functions = [{**function, "execution_count": self.function_counts[name]} for name, function in sorted(self.functions.items())]
+        return {"file": file, "lines": lines, "functions": functions}
+
+
+class CoverageMerger:
+    def __init__(self) -> None:
+        self.format_version: str | None = None
+        self.files: dict[str, FileCoverageCounters] = {}
+
+    def add_report(self, report: dict[str, Any]) -> None:
+        format_version = str(report.get(GCOVR_FORMAT_VERSION_KEY))
+        if self.format_version is None:
+            self.format_version = format_version
+        elif format_version != self.format_version:
+            raise ValueError(f"Coverage reports have different gcovr format versions: {self.format_version} and {format_version}.")
+        for file_data in report.get("files", []):
+            file_counters = self.files.setdefault(file_data["file"], FileCoverageCounters())
+            for line in file_data.get("lines", []):
+                file_counters.add_line(line)
+            for function in file_data.get("functions", []):
+                file_counters.add_function(function)
+
+    def add_report_file(self, report_file: Path) -> None:
+        self.add_report(load_coverage_report(report_file))
+
+    def write(self, output_file: Path) -> None:
+        """Write the merged tracefile without holding it as a whole in memory."""
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open_coverage_report(output_file, "w") as output:
+            output.write(f'{{"{GCOVR_FORMAT_VERSION_KEY}": {json.dumps(self.format_version)}, "files": [')
+            for index, (file, file_counters) in enumerate(sorted(self.files.items())):
+                if index:
+                    output.write(", ")
+                json.dump(file_counters.to_dict(file), output, separators=(",", ":"))
+            output.write("]}\n")
+
+
+@dataclass
+class CoverageMergeCommandArgs(BaseConfigJSONMixin):
+    coverage_files: list[Path] = field(metadata={"help": "Component gcovr JSON reports. Files ending with .gz are gzip compressed."})
+    output_file: Path = field(metadata={"help": "Merged gcovr JSON tracefile. It is gzip compressed if it ends with .gz."})
+
+
+class CoverageMergeCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("coverage_merge", "Merge the component coverage reports into one gcovr JSON tracefile.")
+        self.logger = logger.bind()
+
+    @time_it("Merge coverage reports")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(CoverageMergeCommandArgs, args)
+        merger = CoverageMerger()
+        for coverage_file in config.coverage_files:
+            if not coverage_file.is_file():
+                self.logger.warning(f"Coverage report {coverage_file} not found.")
+                continue
+            merger.add_report_file(coverage_file)
+        if merger.format_version is None:
+            self.logger.error("No coverage report found.")
+            return 1
+        merger.write(config.output_file)
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, CoverageMergeCommandArgs)
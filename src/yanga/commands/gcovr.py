@@ -18,12 +18,14 @@ from typing import Union
 from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
 from py_app_dev.core.config import BaseConfigJSONMixin
 from py_app_dev.core.logging import logger
+from py_app_dev.core.subprocess import SubprocessExecutor
 from yanga_core.commands.base import create_config
 from yanga_core.domain.config import StringableEnum
 from yanga_core.domain.reports import ReportData
 
 from yanga.cmake.artifacts_locator import BuildArtifact
 from yanga.cmake.generator import GeneratedFile
+from yanga.jobserver import acquire_job_slots
 
 
 class GcovReportScope(StringableEnum):
@@ -75,6 +77,14 @@ class ComponentCommandArgs(BaseConfigJSONMixin):
     )
 
 
+def create_component_gcovr_config(object_directory: Path, source_files: list[Path]) -> str:
+    gcovr_cfg_lines = [
+        f"root = {object_directory.as_posix()}",
+        *[f"filter = {source_file.as_posix()}" for source_file in source_files],
+    ]
+    return "\n".join(gcovr_cfg_lines) + "\n"
+
+
 class CreateComponentGcovrConfigCommand(Command):
     def __init__(self) -> None:
         super().__init__("gcovr_config_component", "Create a component specific gcovr configuration file.")
@@ -90,22 +100,68 @@ class CreateComponentGcovrConfigCommand(Command):
             self.logger.error("No component object files provided.")
             return 1
         # Create a gcovr config file
-        gcovr_cfg_lines = [
-            f"root = {Path(object_directory).as_posix()}",
-            *[f"filter = {source_file.as_posix()}" for source_file in config.source_files],
-        ]
-
-        GeneratedFile(config.output_file, "\n".join(gcovr_cfg_lines) + "\n").to_file()
+        GeneratedFile(config.output_file, create_component_gcovr_config(Path(object_directory), config.source_files)).to_file()
         return 0
 
     def _register_arguments(self, parser: ArgumentParser) -> None:
         register_arguments_for_config_dataclass(parser, ComponentCommandArgs)
 
 
+@dataclass
+class ComponentCoverageReportCommandArgs(BaseConfigJSONMixin):
+    component_objects: list[Path] = field(
+        metadata={
+            "help": "List of object files for the component",
+            "deserialize": _deserialize_component_objects,
+        }
+    )
+    source_files: list[Path] = field(metadata={"help": "Relevant source files."})
+    config_file: Path = field(metadata={"help": "Output Gcovr configuration file."})
+    json_file: Path = field(metadata={"help": "Output JSON coverage report."})
+    html_file: Path = field(metadata={"help": "Output HTML coverage report."})
+
+
+class ComponentCoverageReportCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("coverage_report_component", "Create the component JSON and HTML coverage reports in a single gcovr run.")
+        self.logger = logger.bind()
+
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(ComponentCoverageReportCommandArgs, args)
+        if not config.component_objects:
+            self.logger.error("No component object files provided.")
+            return 1
+        object_directory = Path(os.path.commonpath([obj.parent for obj in config.component_objects]))
+        GeneratedFile(config.config_file, create_component_gcovr_config(object_directory, config.source_files)).to_file()
+        config.html_file.parent.mkdir(parents=True, exist_ok=True)
+        # The gcda files are processed once for both reports. Only the component object directory is searched.
+        with acquire_job_slots() as jobs:
+            SubprocessExecutor(
+                [
+                    "gcovr",
+                    "--config",
+                    config.config_file,
+                    "--json",
+                    config.json_file,
+                    "--html-details",
+                    config.html_file,
+                    "-j",
+                    str(jobs),
+                    object_directory,
+                ]
+            ).execute()
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, ComponentCoverageReportCommandArgs)
+
+
 @dataclass
 class VariantCommandArgs(BaseConfigJSONMixin):
     variant_report_config: Path = field(metadata={"help": "Variant report configuration"})
     output_file: Path = field(metadata={"help": "Output Gcovr configuration file."})
+    tracefiles: list[Path] = field(default_factory=list, metadata={"help": "Tracefiles to use instead of the component JSON reports, e.g. the merged coverage report."})
 
 
 class CreateVariantGcovrConfigCommand(Command):
@@ -119,8 +175,11 @@ class CreateVariantGcovrConfigCommand(Command):
 
         report_config = ReportData.from_json_file(config.variant_report_config)
 
-        # Only include components which have coverage results
-        coverage_json_files = [component.build_dir.joinpath(BuildArtifact.COVERAGE_JSON.path) for component in report_config.components if component.coverage_results]
+        if config.tracefiles:
+            coverage_json_files = config.tracefiles
+        else:
+            # Only include components which have coverage results
+            coverage_json_files = [component.build_dir.joinpath(BuildArtifact.COVERAGE_JSON.path) for component in report_config.components if component.coverage_results]
 
         # Create a gcovr config file
         gcovr_cfg_lines = [
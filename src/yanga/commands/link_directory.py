@@ -0,0 +1,140 @@
+"""
+Command line utility to mirror a directory tree by linking its files instead of copying them.
+
+The component coverage html reports are aggregated in the variant reports directory. Copying them
+duplicates thousands of files on every coverage build. The files are hardlinked instead, falling back
+to symlinks and finally to copies if the file system supports neither.
+
+A manifest in the destination directory records the size, modification time and digest of every
+mirrored source file. Files with unchanged size and modification time are not read again and files
+with an unchanged digest are not touched. Files no longer in the source directory are removed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.logging import logger, time_it
+from yanga_core.commands.base import create_config
+
+#: Files with this prefix are the bookkeeping of the mirrored directory (stamp, manifest). They are never linked or removed.
+YANGA_FILE_PREFIX = ".yanga."
+MANIFEST_FILE_NAME = ".yanga.manifest.json"
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ManifestEntry(DataClassDictMixin):
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+@dataclass
+class LinkDirectoryResult:
+    linked: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+
+
+def file_digest(file: Path) -> str:
+    digest = hashlib.sha256()
+    with file.open("rb") as f:
+        for chunk in iter(lambda: f.read(DIGEST_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_file: Path) -> dict[str, ManifestEntry]:
+    try:
+        data = json.loads(manifest_file.read_text(encoding="utf-8"))
+        return {name: ManifestEntry.from_dict(entry) for name, entry in data.items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        # A missing or broken manifest only means that all files are linked again
+        return {}
+
+
+def link_file(source: Path, destination: Path) -> None:
+    """Replace the destination with a hardlink to the source. Falls back to a symlink and then to a copy."""
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+        return
+    except OSError:
+        pass
+    try:
+        destination.symlink_to(source.absolute())
+        return
+    except OSError:
+        pass
+    shutil.copy2(source, destination)
+
+
+def collect_source_files(source_dir: Path) -> list[Path]:
+    return sorted(path.relative_to(source_dir) for path in source_dir.rglob("*") if path.is_file() and not path.name.startswith(YANGA_FILE_PREFIX))
+
+
+def link_directory(source_dir: Path, destination_dir: Path) -> LinkDirectoryResult:
+    """Mirror the files of the source directory into the destination directory, touching only the changed files."""
+    result = LinkDirectoryResult()
+    manifest_file = destination_dir / MANIFEST_FILE_NAME
+    previous_manifest = load_manifest(manifest_file)
+    manifest: dict[str, ManifestEntry] = {}
+    for relative_path in collect_source_files(source_dir):
+        source = source_dir / relative_path
+        destination = destination_dir / relative_path
+        key = relative_path.as_posix()
+        stat = source.stat()
+        previous_entry = previous_manifest.get(key)
+        if previous_entry and previous_entry.size == stat.st_size and previous_entry.mtime_ns == stat.st_mtime_ns:
+            digest = previous_entry.digest
+        else:
+            digest = file_digest(source)
+        manifest[key] = ManifestEntry(stat.st_size, stat.st_mtime_ns, digest)
+        if previous_entry and previous_entry.digest == digest and destination.exists():
+            result.unchanged.append(relative_path)
+            continue
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        link_file(source, destination)
+        result.linked.append(relative_path)
+    for key in sorted(previous_manifest.keys() - manifest.keys()):
+        stale_file = destination_dir / key
+        if stale_file.is_file() or stale_file.is_symlink():
+            stale_file.unlink()
+            result.removed.append(Path(key))
+    destination_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file.write_text(json.dumps({key: entry.to_dict() for key, entry in manifest.items()}, indent=2), encoding="utf-8")
+    return result
+
+
+@dataclass
+class LinkDirectoryCommandArgs(BaseConfigJSONMixin):
+    source_dir: Path = field(metadata={"help": "Directory to be mirrored"})
+    destination_dir: Path = field(metadata={"help": "Directory where the source files are linked to"})
+
+
+class LinkDirectoryCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("link_directory", "Mirror a directory by linking only its changed files.")
+        self.logger = logger.bind()
+
+    @time_it("Link directory")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(LinkDirectoryCommandArgs, args)
+        if not config.source_dir.is_dir():
+            self.logger.error(f"Source directory {config.source_dir} not found.")
+            return 1
+        result = link_directory(config.source_dir, config.destination_dir)
+        self.logger.info(f"Linked {len(result.linked)}, unchanged {len(result.unchanged)} and removed {len(result.removed)} files in {config.destination_dir}.")
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, LinkDirectoryCommandArgs)
@@ -0,0 +1,164 @@
+"""
+Command line utility to generate the mockup sources of a component with clanguru.
+
+The mockup sources only change if the symbols required by the component, the headers declaring them or
+the mocking configuration change. The component sources themselves are not part of the key. The command keys the generated sources on a digest of these inputs and
+restores them from a cache directory if the key did not change. Unchanged mockup sources are never
+rewritten, so the test executable is not recompiled after a productive source changed.
+"""
+
+import hashlib
+import json
+import shlex
+import shutil
+import tempfile
+from argparse import ArgumentParser, BooleanOptionalAction, Namespace
+from dataclasses import dataclass, field
+from importlib.metadata import version
+from pathlib import Path
+from typing import Optional
+
+from clanguru.mock_generator import MocksGenerator, MocksGeneratorConfig
+from clanguru.object_analyzer import NmExecutor
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger
+from yanga_core.commands.base import create_config
+
+from yanga import __version__
+from yanga.cmake.generator import write_if_changed
+from yanga.commands.object_symbols import ObjectSymbols
+from yanga.sources import collect_included_files
+
+#: Only the project include directories are followed, the system headers are not expected to change
+INCLUDE_DIR_OPTIONS = ("-iquote", "-I")
+
+
+@dataclass
+class MockupCommandArgs(BaseConfigJSONMixin):
+    source_files: list[Path] = field(metadata={"help": "Component sources declaring the symbols."})
+    filename: str = field(metadata={"help": "Filename of the generated mockup sources."})
+    output_dir: Path = field(metadata={"help": "Output directory."})
+    cache_dir: Path = field(metadata={"help": "Directory keeping the mockup sources generated for the last inputs."})
+    partial_object_file: Optional[Path] = field(default=None, metadata={"help": "Object file to extract the required symbols from."})
+    symbols_manifest: Optional[Path] = field(default=None, metadata={"help": "Symbols manifest (see object_symbols command) to read the required symbols from."})
+    symbols: list[str] = field(default_factory=list, metadata={"help": "Symbols to mock."})
+    compilation_database: Optional[Path] = field(default=None, metadata={"help": "Compilation database with the options to parse the sources."})
+    strict: Optional[bool] = field(
+        default=None,
+        metadata={"help": "Fail if some symbols are not found or the sources have errors.", "action": BooleanOptionalAction},
+    )
+    exclude_symbol_pattern: list[str] = field(
+        default_factory=list,
+        metadata={"help": "Symbol patterns to exclude from mocking. Can be used multiple times.", "action": "append"},
+    )
+
+
+def get_include_dirs(compilation_database: Optional[Path], source_files: list[Path]) -> list[Path]:
+    """Collect the project include directories used to compile the source files from the compilation database."""
+    if not compilation_database or not compilation_database.is_file():
+        return []
+    sources = {source.absolute() for source in source_files}
+    include_dirs: list[Path] = []
+    for entry in json.loads(compilation_database.read_text()):
+        directory = Path(entry.get("directory", "."))
+        if (directory / entry["file"]).absolute() not in sources:
+            continue
+        arguments = entry.get("arguments") or shlex.split(entry.get("command", ""))
+        for index, argument in enumerate(arguments):
+            option = next((option for option in INCLUDE_DIR_OPTIONS if argument.startswith(option)), None)
+            if not option:
+                continue
+            include_dir = argument[len(option) :] or (arguments[index + 1] if index + 1 < len(arguments) else "")
+            if include_dir:
+                include_dirs.append(directory / include_dir)
+    return list(dict.fromkeys(include_dirs))
+
+
+class MockupCache:
+    """Keeps the mockup sources generated for the last key."""
+
+    KEY_FILE = "key.txt"
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def load(self, key: str) -> Optional[dict[str, str]]:
+        key_file = self.cache_dir / self.KEY_FILE
+        if not key_file.is_file() or key_file.read_text() != key:
+            return None
+        return {file.name: file.read_text() for file in self.cache_dir.iterdir() if file.name != self.KEY_FILE}
+
+    def store(self, key: str, files: dict[str, str]) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True)
+        for name, content in files.items():
+            (self.cache_dir / name).write_text(content)
+        # Written last, an interrupted store is never a cache hit
+        (self.cache_dir / self.KEY_FILE).write_text(key)
+
+
+class MockupCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("mockup", "Generate the mockup sources for the symbols required by a component.")
+        self.logger = logger.bind()
+
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(MockupCommandArgs, args)
+        symbols = self.get_symbols(config)
+        mocks_config = MocksGeneratorConfig(exclude_symbol_patterns=config.exclude_symbol_pattern or None)
+        if config.strict is not None:
+            mocks_config.strict = config.strict
+        key = self.create_key(config, symbols, mocks_config)
+        cache = MockupCache(config.cache_dir)
+        files = cache.load(key)
+        if files is None:
+            files = self.generate(config, symbols, mocks_config)
+            cache.store(key, files)
+        else:
+            self.logger.info(f"Mockup sources for {config.filename} are up to date.")
+        for name, content in files.items():
+            write_if_changed(config.output_dir / name, content)
+        return 0
+
+    def get_symbols(self, config: MockupCommandArgs) -> list[str]:
+        symbols = set(config.symbols)
+        if config.partial_object_file:
+            symbols.update(NmExecutor().run(config.partial_object_file).required_symbols)
+        if config.symbols_manifest:
+            symbols.update(ObjectSymbols.required_from_manifest(config.symbols_manifest))
+        if not (config.symbols or config.partial_object_file or config.symbols_manifest):
+            raise UserNotificationException("No symbols provided. Either specify --symbols, --partial-object-file or --symbols-manifest.")
+        if not symbols:
+            # A component without external dependencies still gets its (empty) mockup sources
+            self.logger.info(f"No required symbols found for {config.filename}. Generating empty mockup sources.")
+        return sorted(symbols)
+
+    def create_key(self, config: MockupCommandArgs, symbols: list[str], mocks_config: MocksGeneratorConfig) -> str:
+        hasher = hashlib.sha256()
+        for part in (__version__, version("clanguru"), config.filename, repr(mocks_config), *symbols):
+            hasher.update(part.encode())
+            hasher.update(b"\0")
+        # The component sources only provide the required symbols, their bodies do not change the mockup sources
+        included_files = collect_included_files(config.source_files, get_include_dirs(config.compilation_database, config.source_files))
+        for file in sorted(included_files - set(config.source_files)):
+            hasher.update(file.as_posix().encode())
+            hasher.update(hashlib.sha256(file.read_bytes()).digest())
+        return hasher.hexdigest()
+
+    def generate(self, config: MockupCommandArgs, symbols: list[str], mocks_config: MocksGeneratorConfig) -> dict[str, str]:
+        with tempfile.TemporaryDirectory(prefix="yanga_mockup_") as tmp_dir:
+            output_dir = Path(tmp_dir)
+            try:
+                MocksGenerator(config.source_files, symbols, output_dir, config.filename, config.compilation_database, mocks_config).generate()
+            finally:
+                # Keep the log for the user, also if the generation failed
+                log_file = output_dir / f"{config.filename}.log"
+                if log_file.is_file():
+                    write_if_changed(config.output_dir / log_file.name, log_file.read_text())
+            return {file.name: file.read_text() for file in output_dir.iterdir() if file.is_file()}
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, MockupCommandArgs)
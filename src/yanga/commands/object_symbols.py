@@ -0,0 +1,132 @@
+"""
+Command line utility to collect the symbols of the object files of a component.
+
+The undefined symbols of the component are the symbols it requires but none of its object files defines.
+These are the symbols to be mocked. They are read directly from the ELF symbol tables of the object files,
+which is much cheaper than a partial link of all object files. Other object file formats are read with ``nm``.
+"""
+
+import json
+import mmap
+import struct
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from clanguru.object_analyzer import NmExecutor
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger
+from yanga_core.commands.base import create_config
+
+from yanga.cmake.generator import write_if_changed
+
+ELF_MAGIC = b"\x7fELF"
+SHT_SYMTAB = 2
+SHN_UNDEF = 0
+STB_LOCAL = 0
+STB_GLOBAL = 1
+
+
+@dataclass
+class ObjectSymbols:
+    #: Symbols required by the object files
+    undefined: set[str] = field(default_factory=set)
+    #: Symbols provided by the object files
+    defined: set[str] = field(default_factory=set)
+
+    def update(self, other: "ObjectSymbols") -> None:
+        self.undefined.update(other.undefined)
+        self.defined.update(other.defined)
+
+    @property
+    def required(self) -> list[str]:
+        """Undefined symbols not resolved by any of the object files, like after a partial link."""
+        return sorted(self.undefined - self.defined)
+
+    def to_manifest(self) -> str:
+        return json.dumps({"undefined": self.required, "defined": sorted(self.defined)}, indent=2) + "\n"
+
+    @staticmethod
+    def required_from_manifest(manifest_file: Path) -> list[str]:
+        undefined: list[str] = json.loads(manifest_file.read_text())["undefined"]
+        return undefined
+
+
+def read_elf_symbols(data: bytes | mmap.mmap) -> ObjectSymbols:
+    """Read the global symbols of an ELF relocatable object file the same way ``nm`` reports them."""
+    if data[4] not in (1, 2) or data[5] not in (1, 2):
+        raise UserNotificationException("Invalid ELF header.")
+    is_64bit = data[4] == 2
+    endian = "<" if data[5] == 1 else ">"
+    header_format, section_format, symbol_format = ("HHIQQQIHHHHHH", "IIQQQQIIQQ", "IBBHQQ") if is_64bit else ("HHIIIIIHHHHHH", "IIIIIIIIII", "IIIBBH")
+    header = struct.unpack_from(endian + header_format, data, 16)
+    section_offset, section_size, section_count = header[5], header[10], header[11]
+
+    def section(index: int) -> tuple[int, ...]:
+        return struct.unpack_from(endian + section_format, data, section_offset + index * section_size)
+
+    if section_count == 0 and section_offset:
+        # Extended section numbering, the number of sections is in the first section header
+        section_count = section(0)[5]
+    symbols = ObjectSymbols()
+    for index in range(section_count):
+        _, section_type, _, _, offset, size, link, _, _, entry_size = section(index)
+        if section_type != SHT_SYMTAB or not entry_size:
+            continue
+        string_table_offset = section(link)[4]
+        for symbol_offset in range(offset + entry_size, offset + size, entry_size):
+            if is_64bit:
+                name_offset, info, _, section_index, _, _ = struct.unpack_from(endian + symbol_format, data, symbol_offset)
+            else:
+                name_offset, _, _, info, _, section_index = struct.unpack_from(endian + symbol_format, data, symbol_offset)
+            binding = info >> 4
+            if binding == STB_LOCAL or not name_offset:
+                continue
+            name_start = string_table_offset + name_offset
+            name = bytes(data[name_start : data.find(b"\0", name_start)]).decode(errors="replace")
+            if section_index != SHN_UNDEF:
+                symbols.defined.add(name)
+            elif binding == STB_GLOBAL:
+                # Undefined weak symbols are optional and not required to be mocked
+                symbols.undefined.add(name)
+    return symbols
+
+
+def read_object_symbols(object_file: Path) -> ObjectSymbols:
+    with object_file.open("rb") as file:
+        if file.read(4) == ELF_MAGIC:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return read_elf_symbols(data)
+    object_data = NmExecutor().run(object_file)
+    return ObjectSymbols(object_data.required_symbols, object_data.provided_symbols)
+
+
+def collect_object_symbols(object_files: list[Path]) -> ObjectSymbols:
+    symbols = ObjectSymbols()
+    for object_file in object_files:
+        symbols.update(read_object_symbols(object_file))
+    return symbols
+
+
+@dataclass
+class ObjectSymbolsCommandArgs(BaseConfigJSONMixin):
+    object_files: list[Path] = field(metadata={"help": "Object files of the component."})
+    output_file: Path = field(metadata={"help": "Output symbols manifest file."})
+
+
+class ObjectSymbolsCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("object_symbols", "Create the manifest of the undefined and defined symbols of object files.")
+        self.logger = logger.bind()
+
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(ObjectSymbolsCommandArgs, args)
+        # Keep the manifest untouched if the symbols did not change to avoid regenerating the mockup sources
+        write_if_changed(config.output_file, collect_object_symbols(config.object_files).to_manifest())
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, ObjectSymbolsCommandArgs)
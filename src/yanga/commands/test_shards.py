@@ -0,0 +1,99 @@
+"""
+Command line utility to merge the results of the shards of a component test executable.
+
+The JUnit reports of all shards are merged into one report. The coverage data written by the shards
+(see ``GCOV_PREFIX``) is merged with ``gcov-tool`` and copied next to the object files, where gcovr
+expects it.
+"""
+
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.logging import logger
+from py_app_dev.core.subprocess import SubprocessExecutor
+from yanga_core.commands.base import create_config
+
+#: Counters of the gtest JUnit report which are summed up over all shards
+JUNIT_COUNTERS = ("tests", "failures", "disabled", "skipped", "errors")
+
+
+@dataclass
+class MergeTestShardsCommandArgs(BaseConfigJSONMixin):
+    junit_files: list[Path] = field(metadata={"help": "JUnit reports of all shards."})
+    output_file: Path = field(metadata={"help": "Merged JUnit report."})
+    coverage_dirs: list[Path] = field(default_factory=list, metadata={"help": "Coverage data directories (GCOV_PREFIX) of all shards."})
+    build_dir: Path | None = field(default=None, metadata={"help": "Build directory the coverage data paths are relative to (see GCOV_PREFIX_STRIP)."})
+    gcov_tool: str = field(default="gcov-tool", metadata={"help": "gcov-tool executable used to merge the coverage data."})
+
+
+def _add_counters(target: ET.Element, source: ET.Element) -> None:
+    for counter in JUNIT_COUNTERS:
+        if counter in source.attrib:
+            target.set(counter, str(int(target.get(counter, "0")) + int(source.get(counter, "0"))))
+    if "time" in source.attrib:
+        target.set("time", f"{float(target.get('time', '0')) + float(source.get('time', '0')):.3f}")
+
+
+def merge_junit_reports(junit_files: list[Path]) -> ET.Element:
+    """Merge the test suites with the same name. Every shard runs a part of the test cases of a test suite."""
+    merged = ET.Element("testsuites", {"name": "AllTests"})
+    suites: dict[str, ET.Element] = {}
+    for junit_file in junit_files:
+        if not junit_file.is_file():
+            # The shard executable crashed before writing its report
+            logger.warning(f"JUnit report {junit_file} not found.")
+            continue
+        root = ET.parse(junit_file).getroot()  # noqa: S314
+        _add_counters(merged, root)
+        for suite in root.iter("testsuite"):
+            name = suite.get("name", "")
+            if name not in suites:
+                suites[name] = ET.SubElement(merged, "testsuite", {key: value for key, value in suite.attrib.items() if key not in (*JUNIT_COUNTERS, "time")})
+            _add_counters(suites[name], suite)
+            suites[name].extend(list(suite))
+    return merged
+
+
+def merge_coverage_data(coverage_dirs: list[Path], build_dir: Path, gcov_tool: str = "gcov-tool") -> None:
+    """Merge the coverage data of all shards and copy it to the build directory, replacing the data of previous runs."""
+    coverage_dirs = [coverage_dir for coverage_dir in coverage_dirs if coverage_dir.is_dir()]
+    if not coverage_dirs:
+        return
+    with tempfile.TemporaryDirectory(prefix="yanga_shards_") as tmp_dir:
+        merged = coverage_dirs[0]
+        for index, coverage_dir in enumerate(coverage_dirs[1:]):
+            output_dir = Path(tmp_dir) / str(index)
+            SubprocessExecutor([gcov_tool, "merge", "-o", output_dir, merged, coverage_dir]).execute()
+            merged = output_dir
+        for gcda_file in merged.rglob("*.gcda"):
+            target = build_dir / gcda_file.relative_to(merged)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(gcda_file, target)
+
+
+class MergeTestShardsCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("merge_test_shards", "Merge the JUnit reports and the coverage data of the test executable shards.")
+        self.logger = logger.bind()
+
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(MergeTestShardsCommandArgs, args)
+        if config.coverage_dirs:
+            if not config.build_dir:
+                self.logger.error("The build directory is required to merge the coverage data.")
+                return 1
+            merge_coverage_data(config.coverage_dirs, config.build_dir, config.gcov_tool)
+        merged = merge_junit_reports(config.junit_files)
+        config.output_file.parent.mkdir(parents=True, exist_ok=True)
+        ET.ElementTree(merged).write(config.output_file, encoding="utf-8", xml_declaration=True)
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, MergeTestShardsCommandArgs)
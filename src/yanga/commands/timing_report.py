@@ -0,0 +1,157 @@
+"""
+Command line utility to report the test execution times from the gtest JUnit reports.
+
+The report lists the total test time per component and the slowest test cases. Every run is appended
+to a history file in the build directory. The times are compared with the average of the previous runs
+in the history, so tests which got slower stand out.
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.logging import logger
+from yanga_core.commands.base import create_config
+
+from yanga.cmake.generator import GeneratedFile
+
+#: The component JUnit reports are named ``<component>_junit.xml``
+JUNIT_REPORT_SUFFIX = "_junit"
+
+
+@dataclass
+class TimedTestCase:
+    component: str
+    #: Test case name as used by ``--gtest_filter``, e.g. ``Suite.Test``
+    name: str
+    time: float
+
+    @property
+    def id(self) -> str:
+        return f"{self.component}/{self.name}"
+
+
+def read_junit_test_times(junit_file: Path) -> list[TimedTestCase]:
+    if not junit_file.is_file():
+        # The test executable crashed before writing its report
+        logger.warning(f"JUnit report {junit_file} not found.")
+        return []
+    component = junit_file.stem.removesuffix(JUNIT_REPORT_SUFFIX)
+    test_times = []
+    for suite in ET.parse(junit_file).getroot().iter("testsuite"):  # noqa: S314
+        for test_case in suite.iter("testcase"):
+            # Disabled tests are reported but not executed
+            if test_case.get("status") == "notrun":
+                continue
+            name = f"{test_case.get('classname', suite.get('name', ''))}.{test_case.get('name', '')}"
+            test_times.append(TimedTestCase(component, name, float(test_case.get("time", "0"))))
+    return test_times
+
+
+def format_trend(time: float, previous: Optional[float]) -> str:
+    if previous is None:
+        return "new"
+    if not previous:
+        return "n/a"
+    return f"{100.0 * (time - previous) / previous:+.0f}%"
+
+
+@dataclass
+class TimingReport:
+    test_times: list[TimedTestCase]
+    #: Previous runs, oldest first
+    history: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def component_times(self) -> dict[str, float]:
+        component_times: dict[str, float] = {}
+        for test_time in self.test_times:
+            component_times[test_time.component] = component_times.get(test_time.component, 0.0) + test_time.time
+        return dict(sorted(component_times.items(), key=lambda item: item[1], reverse=True))
+
+    def get_previous_average(self, category: str, key: str) -> Optional[float]:
+        """Average time of a component or a test in the previous runs which contain it."""
+        times = [run[category][key] for run in self.history if key in run.get(category, {})]
+        return sum(times) / len(times) if times else None
+
+    def to_history_entry(self) -> dict[str, Any]:
+        return {
+            "components": {component: round(time, 3) for component, time in self.component_times.items()},
+            "tests": {test_time.id: test_time.time for test_time in self.test_times},
+        }
+
+    def to_markdown(self, slowest: int) -> str:
+        total_time = sum(test_time.time for test_time in self.test_times)
+        summary = f"{len(self.test_times)} tests in {len(self.component_times)} components took {total_time:.3f} s."
+        if self.history:
+            summary += f" Trends are relative to the average of the previous {len(self.history)} runs."
+        content = [
+            "# Test Timing",
+            "",
+            summary,
+            "",
+            "## Components",
+            "",
+            "| Component | Tests | Time [s] | Trend |",
+            "| --- | ---: | ---: | ---: |",
+        ]
+        for component, time in self.component_times.items():
+            tests = sum(1 for test_time in self.test_times if test_time.component == component)
+            content.append(f"| {component} | {tests} | {time:.3f} | {format_trend(time, self.get_previous_average('components', component))} |")
+        content.extend(["", "## Slowest Tests", "", "| Test | Component | Time [s] | Trend |", "| --- | --- | ---: | ---: |"])
+        for test_time in sorted(self.test_times, key=lambda test_time: test_time.time, reverse=True)[:slowest]:
+            content.append(
+                f"| {test_time.name} | {test_time.component} | {test_time.time:.3f} | {format_trend(test_time.time, self.get_previous_average('tests', test_time.id))} |"
+            )
+        return "\n".join(content) + "\n"
+
+
+def load_history(history_file: Path) -> list[dict[str, Any]]:
+    if not history_file.is_file():
+        return []
+    try:
+        runs: list[dict[str, Any]] = json.loads(history_file.read_text()).get("runs", [])
+    except json.JSONDecodeError:
+        logger.warning(f"Test timing history {history_file} is corrupt. Starting a new history.")
+        return []
+    return runs
+
+
+def create_timing_report(junit_files: list[Path], output_file: Path, history_file: Path, history_size: int = 10, slowest: int = 20) -> TimingReport:
+    """Write the Markdown report for the JUnit reports and append the run to the history."""
+    test_times = [test_time for junit_file in junit_files for test_time in read_junit_test_times(junit_file)]
+    history = load_history(history_file)[-history_size:] if history_size > 0 else []
+    report = TimingReport(test_times, history)
+    GeneratedFile(output_file, report.to_markdown(slowest)).to_file()
+    runs = [*history, report.to_history_entry()][-history_size:] if history_size > 0 else []
+    GeneratedFile(history_file, json.dumps({"runs": runs}, indent=2)).to_file()
+    return report
+
+
+@dataclass
+class TestTimingCommandArgs(BaseConfigJSONMixin):
+    junit_files: list[Path] = field(metadata={"help": "Component JUnit reports (<component>_junit.xml)."})
+    output_file: Path = field(metadata={"help": "Output Markdown report."})
+    history_file: Path = field(metadata={"help": "JSON file with the test times of the previous runs. The current run is appended."})
+    history_size: int = field(default=10, metadata={"help": "Number of previous runs to keep in the history."})
+    slowest: int = field(default=20, metadata={"help": "Number of slowest tests to report."})
+
+
+class TestTimingCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("test_timing", "Report the slowest tests and the test time trends from the JUnit reports.")
+        self.logger = logger.bind()
+
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(TestTimingCommandArgs, args)
+        create_timing_report(config.junit_files, config.output_file, config.history_file, config.history_size, config.slowest)
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, TestTimingCommandArgs)
@@ -0,0 +1,38 @@
+"""Command line utility to create a unity (jumbo) translation unit including several sources."""
+
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.config import BaseConfigJSONMixin
+from py_app_dev.core.logging import logger
+from yanga_core.commands.base import create_config
+
+from yanga.cmake.generator import write_if_changed
+
+
+@dataclass
+class UnitySourceCommandArgs(BaseConfigJSONMixin):
+    source_files: list[Path] = field(metadata={"help": "Sources to be included in the unity translation unit."})
+    output_file: Path = field(metadata={"help": "Output unity source file."})
+
+
+def create_unity_source(source_files: list[Path]) -> str:
+    return "\n".join(["// Generated by yanga. Do not edit.", *[f'#include "{source.as_posix()}"' for source in source_files]]) + "\n"
+
+
+class UnitySourceCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("unity_source", "Create a unity source file including all given sources.")
+        self.logger = logger.bind()
+
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        config = create_config(UnitySourceCommandArgs, args)
+        # Keep the file untouched if nothing changed to avoid recompiling the unity source
+        write_if_changed(config.output_file, create_unity_source(config.source_files))
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, UnitySourceCommandArgs)
@@ -0,0 +1,94 @@
+"""
+Share a build job budget between processes.
+
+The builds join a GNU make jobserver (fifo style, honoured by ninja >= 1.13) on POSIX systems. Build
+steps running parallel work acquire their job slots from it, falling back to ``CMAKE_BUILD_PARALLEL_LEVEL``.
+"""
+
+import os
+import re
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+
+class JobServer:
+    """
+    GNU make jobserver (fifo style) shared by the builds of all variants.
+
+    Every build process owns one implicit job slot, so the fifo is filled with the tokens left
+    after one slot per concurrent build.
+    """
+
+    def __init__(self, jobs: int, clients: int) -> None:
+        self.jobs = jobs
+        self.tokens = max(0, jobs - clients)
+        self.fifo: Optional[Path] = None
+        self._fd: Optional[int] = None
+        self._tmp_dir: Optional[tempfile.TemporaryDirectory[str]] = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        return hasattr(os, "mkfifo")
+
+    @property
+    def env(self) -> dict[str, str]:
+        if not self.fifo:
+            return {}
+        return {"MAKEFLAGS": f"-j{self.jobs} --jobserver-auth=fifo:{self.fifo}"}
+
+    def start(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory(prefix="yanga_jobserver_")
+        self.fifo = Path(self._tmp_dir.name) / "jobserver"
+        os.mkfifo(self.fifo, 0o600)
+        # Keep the fifo open for reading and writing so the clients never see an EOF
+        self._fd = os.open(self.fifo, os.O_RDWR | os.O_NONBLOCK)
+        os.write(self._fd, b"+" * self.tokens)
+
+    def stop(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self._tmp_dir:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+        self.fifo = None
+
+    @contextmanager
+    def running(self) -> Iterator["JobServer"]:
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+
+@contextmanager
+def acquire_job_slots(limit: Optional[int] = None) -> Iterator[int]:
+    """
+    Acquire up to ``limit`` (default: number of CPUs) job slots for a build step running parallel work, its own implicit slot included.
+
+    Within a jobserver build (see ``MAKEFLAGS``) only the currently free tokens are taken, they are given back on exit.
+    Otherwise the slots are limited by ``CMAKE_BUILD_PARALLEL_LEVEL``.
+    """
+    limit = max(1, limit or os.cpu_count() or 1)
+    match = re.search(r"--jobserver-auth=fifo:(\S+)", os.environ.get("MAKEFLAGS", ""))
+    if not match or not Path(match.group(1)).exists():
+        parallel_level = os.environ.get("CMAKE_BUILD_PARALLEL_LEVEL", "")
+        yield min(limit, int(parallel_level)) if parallel_level.isdigit() and int(parallel_level) > 0 else limit
+        return
+    fd = os.open(match.group(1), os.O_RDWR | os.O_NONBLOCK)
+    tokens = b""
+    try:
+        if limit > 1:
+            try:
+                tokens = os.read(fd, limit - 1)
+            except BlockingIOError:
+                tokens = b""
+        yield 1 + len(tokens)
+    finally:
+        if tokens:
+            os.write(fd, tokens)
+        os.close(fd)
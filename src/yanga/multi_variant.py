@@ -0,0 +1,191 @@
+"""
+Build several variants concurrently under one job budget.
+
+The steps of the shared pipeline stages (e.g. ``install``) create the virtual environment and install
+the tools and dependencies into common locations. They run first, one variant after the other, so
+they never race. Afterwards every variant runs its pipeline in its own ``yanga run`` process, so the
+generation and the CMake configure of all variants run concurrently. The shared steps are up to date
+by then and are not executed again, but they still update the execution context of the variant
+process (e.g. the installed dependencies and the ``PATH`` of the tools). The build jobs of all
+variants share one budget: on POSIX systems the builds join a GNU make jobserver (honoured by
+ninja >= 1.13), otherwise the budget is split between the variants through ``CMAKE_BUILD_PARALLEL_LEVEL``.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger
+from pypeline.domain.pipeline import PipelineConfig, PipelineConfigIterator
+from pypeline.pypeline import PipelineScheduler
+
+from .jobserver import JobServer
+
+#: Selects all variants of the project
+ALL_VARIANTS = "all"
+#: Pipeline stages shared by all variants, e.g. creating the virtual environment and installing the tools
+SHARED_STAGES = ("install",)
+
+
+def resolve_variant_names(selection: str, available: list[str]) -> list[str]:
+    """Resolve a comma separated list of variant names (or ``all``) against the project variants."""
+    if selection.strip() == ALL_VARIANTS:
+        if not available:
+            raise UserNotificationException("No variants found in the configuration.")
+        return list(available)
+    names = list(dict.fromkeys(name.strip() for name in selection.split(",") if name.strip()))
+    if not names:
+        raise UserNotificationException(f"No variant selected with '{selection}'.")
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise UserNotificationException(f"Unknown variant(s): {', '.join(unknown)}. Available variants: {', '.join(available)}.")
+    return names
+
+
+def split_pipeline_steps(
+    pipeline: Optional[PipelineConfig],
+    step: Optional[str] = None,
+    single: bool = False,
+    shared_stages: tuple[str, ...] = SHARED_STAGES,
+) -> tuple[list[str], list[str]]:
+    """Split the steps scheduled for ``step`` and ``single`` into the steps of the shared stages and the steps run for every variant."""
+    if not pipeline:
+        raise UserNotificationException("No pipeline found in the configuration.")
+    shared_steps: list[str] = []
+    variant_steps: list[str] = []
+    for group_name, steps_config in PipelineConfigIterator(PipelineScheduler.filter_steps(pipeline, [step] if step else None, single)):
+        steps = shared_steps if group_name in shared_stages else variant_steps
+        for step_config in steps_config:
+            step_name = step_config.class_name or step_config.step
+            if step_name:
+                steps.append(step_name)
+    return shared_steps, variant_steps
+
+
+@dataclass
+class MultiVariantRunConfig:
+    project_dir: Path
+    variants: list[str]
+    #: Steps run for one variant after the other before the variant steps
+    shared_steps: list[str] = field(default_factory=list)
+    #: Steps run concurrently for all variants
+    variant_steps: list[str] = field(default_factory=list)
+    #: Run only the selected step, without the previous steps of the pipeline
+    single: bool = False
+    platform: Optional[str] = None
+    component_name: Optional[str] = None
+    target: Optional[str] = None
+    build_type: Optional[str] = None
+    force_run: bool = False
+    pristine: bool = False
+    #: Total number of build jobs shared by all variants. Defaults to the number of CPUs.
+    jobs: Optional[int] = None
+
+
+@dataclass
+class VariantRunResult:
+    variant: str
+    returncode: int
+    duration: float
+    output: str = field(repr=False, default="")
+
+    @property
+    def succeeded(self) -> bool:
+        return self.returncode == 0
+
+    def extend(self, other: "VariantRunResult") -> "VariantRunResult":
+        """Result of running the steps of the other result after the steps of this one."""
+        return VariantRunResult(self.variant, other.returncode, self.duration + other.duration, self.output + other.output)
+
+
+class MultiVariantRunner:
+    def __init__(self, config: MultiVariantRunConfig) -> None:
+        self.logger = logger.bind()
+        self.config = config
+        self.jobs = config.jobs or os.cpu_count() or 1
+        self._output_lock = threading.Lock()
+
+    def run(self) -> list[VariantRunResult]:
+        config = self.config
+        self.logger.info(f"Run {len(config.variants)} variants with a budget of {self.jobs} jobs: {', '.join(config.variants)}")
+        # The shared steps write to common locations (e.g. the virtual environment), they must not run concurrently
+        shared_results = {variant: self._run_variant(variant, config.shared_steps, {}, config.pristine, config.force_run) for variant in config.variants}
+        variants = [variant for variant in config.variants if shared_results[variant].succeeded]
+        variant_results = {}
+        if variants:
+            if JobServer.is_supported():
+                with JobServer(self.jobs, len(variants)).running() as job_server:
+                    variant_results = {result.variant: result for result in self._run_variants(variants, job_server.env)}
+            else:
+                # No jobserver available, give every variant an equal share of the budget
+                variant_results = {result.variant: result for result in self._run_variants(variants, {"CMAKE_BUILD_PARALLEL_LEVEL": str(max(1, self.jobs // len(variants)))})}
+        results = [shared_results[variant].extend(variant_results[variant]) if variant in variant_results else shared_results[variant] for variant in config.variants]
+        self._report(results)
+        return results
+
+    def _run_variants(self, variants: list[str], env: dict[str, str]) -> list[VariantRunResult]:
+        config = self.config
+        # The pristine run already wiped the build directory before the shared steps.
+        # Forcing the variant pipeline would execute the shared steps again, concurrently for all variants.
+        pristine = config.pristine and not config.shared_steps
+        force_run = config.force_run and not config.shared_steps
+        if config.force_run and config.shared_steps:
+            shared_steps = ", ".join(config.shared_steps)
+            self.logger.warning(f"Only the shared steps {shared_steps} are forced, the variant steps run if they are dirty. Use --pristine to rebuild the variants.")
+        with ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="yanga_variant") as executor:
+            return list(executor.map(lambda variant: self._run_variant(variant, config.variant_steps, env, pristine, force_run), variants))
+
+    def _run_variant(self, variant: str, steps: list[str], env: dict[str, str], pristine: bool = False, force_run: bool = False) -> VariantRunResult:
+        """Run the pipeline up to the last of the steps in one process, so the steps get the execution context of the previous steps."""
+        if not steps:
+            return VariantRunResult(variant, 0, 0.0)
+        process_env = {**os.environ, **env}
+        # The jobserver and the parallel level are exclusive, an explicit -j disables the jobserver
+        if "MAKEFLAGS" in env:
+            process_env.pop("CMAKE_BUILD_PARALLEL_LEVEL", None)
+        start = time.perf_counter()
+        process = subprocess.run(  # noqa: S603
+            self.create_command(variant, steps[-1], pristine, force_run),
+            cwd=self.config.project_dir,
+            env=process_env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            check=False,
+        )
+        result = VariantRunResult(variant, process.returncode, time.perf_counter() - start, process.stdout)
+        with self._output_lock:
+            status = "succeeded" if result.succeeded else f"failed with exit code {result.returncode}"
+            self.logger.info(f"Variant {variant} pipeline up to {steps[-1]} {status} after {result.duration:.1f}s. Output:\n{result.output.rstrip()}")
+        return result
+
+    def create_command(self, variant: str, step: str, pristine: bool = False, force_run: bool = False) -> list[str]:
+        config = self.config
+        command = [sys.executable, "-m", "yanga.ymain", "run", "--project-dir", str(config.project_dir), "--variant", variant, "--not-interactive", "--step", step]
+        for option, value in (
+            ("--platform", config.platform),
+            ("--component", config.component_name),
+            ("--target", config.target),
+            ("--build-type", config.build_type),
+        ):
+            if value:
+                command.extend([option, value])
+        for flag, enabled in (("--single", config.single), ("--force-run", force_run), ("--pristine", pristine)):
+            if enabled:
+                command.append(flag)
+        return command
+
+    def _report(self, results: list[VariantRunResult]) -> None:
+        for result in results:
+            self.logger.info(f"{result.variant}: {'OK' if result.succeeded else 'FAILED'} ({result.duration:.1f}s)")
+        failed = [result.variant for result in results if not result.succeeded]
+        if failed:
+            raise UserNotificationException(f"{len(failed)} of {len(results)} variants failed: {', '.join(failed)}")
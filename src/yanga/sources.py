@@ -0,0 +1,55 @@
+"""
+Helpers to classify and scan the project sources and to find the files changed in git.
+
+Shared by the build system generators, the commands and the test impact analysis.
+"""
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.subprocess import SubprocessExecutor
+
+C_SOURCE_SUFFIXES = {".c"}
+CXX_SOURCE_SUFFIXES = {".cc", ".cpp", ".cxx", ".c++", ".C"}
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s*([<"])([^>"]+)[>"]', re.MULTILINE)
+
+
+def collect_included_files(source_files: Iterable[Path], include_dirs: list[Path]) -> set[Path]:
+    """
+    Collect the source files and all files they include, following the includes found in the include directories.
+
+    Includes are not preprocessed: all conditional includes are followed and headers not found in the
+    include directories (e.g. the system headers) are ignored.
+    """
+    collected: set[Path] = set()
+    pending = [source for source in source_files if source.is_file()]
+    while pending:
+        file = pending.pop()
+        if file in collected:
+            continue
+        collected.add(file)
+        for delimiter, name in INCLUDE_PATTERN.findall(file.read_text(errors="replace")):
+            search_dirs = [file.parent, *include_dirs] if delimiter == '"' else include_dirs
+            included = next((directory / name for directory in search_dirs if (directory / name).is_file()), None)
+            if included:
+                pending.append(included)
+    return collected
+
+
+def run_git(project_dir: Path, *args: str) -> str:
+    completed_process = SubprocessExecutor(["git", *args], cwd=project_dir, print_output=False).execute(handle_errors=False)
+    if not completed_process or completed_process.returncode != 0:
+        output = completed_process.stdout if completed_process else ""
+        raise UserNotificationException(f"Command 'git {' '.join(args)}' failed: {output}")
+    stdout: str = completed_process.stdout
+    return stdout
+
+
+def get_changed_files(project_dir: Path, base_ref: str) -> list[Path]:
+    """Files changed since the merge base with the base revision, including the untracked files."""
+    root_dir = Path(run_git(project_dir, "rev-parse", "--show-toplevel").strip())
+    changed_files = run_git(project_dir, "diff", "--name-only", "--no-renames", "--merge-base", base_ref).splitlines()
+    changed_files.extend(run_git(project_dir, "ls-files", "--others", "--exclude-standard", "--full-name").splitlines())
+    return [root_dir / file for file in dict.fromkeys(changed_files) if file]
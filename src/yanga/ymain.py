@@ -11,7 +11,9 @@ from yanga_core.commands.run import RunCommand, RunCommandConfig
 
 from yanga import __version__
 
+from .affected import run_affected_tests
 from .kickstart.create import KickstartProject
+from .multi_variant import MultiVariantRunConfig, MultiVariantRunner, resolve_variant_names, split_pipeline_steps
 from .yide import IDEProjectGenerator
 
 package_name = "yanga"
@@ -94,7 +96,63 @@ def run(
         False,
         help="Recursively delete the variant build directory before running. Works even if cmake configure is currently broken (e.g. variant rename, schema change).",
     ),
+    variants: Optional[str] = typer.Option(
+        None,
+        help="Comma separated list of variants (or 'all') to run concurrently. Their builds share the --jobs budget.",
+    ),
+    jobs: Optional[int] = typer.Option(
+        None,
+        min=1,
+        help="Total number of build jobs shared by all variants selected with --variants. Defaults to the number of CPUs.",
+    ),
+    affected_since: Optional[str] = typer.Option(
+        None,
+        help="Build and run only the component tests affected by the changes since the given git revision.",
+    ),
 ) -> None:
+    if affected_since:
+        if variants or component or target:
+            raise UserNotificationException("The --affected-since option selects the component test targets and can not be combined with --variants, --component or --target.")
+        if pristine:
+            raise UserNotificationException("The --affected-since option uses the coverage reports of the previous run and can not be combined with --pristine.")
+        run_affected_tests(
+            RunCommandConfig(
+                project_dir,
+                platform,
+                variant,
+                build_type=build_type,
+                step=step,
+                single=single,
+                force_run=force_run,
+                not_interactive=not_interactive,
+            ),
+            affected_since,
+        )
+        return
+    if variants:
+        if variant:
+            raise UserNotificationException("Use either --variant or --variants, not both.")
+        project_slurper = RunCommand.create_project_slurper(project_dir)
+        # The variant processes run non-interactive, so the platform has to be selected upfront
+        platform_name = platform if not_interactive else RunCommand().determine_platform_name(platform, project_slurper.platforms)
+        shared_steps, variant_steps = split_pipeline_steps(project_slurper.pipeline, step, single)
+        MultiVariantRunner(
+            MultiVariantRunConfig(
+                project_dir,
+                resolve_variant_names(variants, [variant_config.name for variant_config in project_slurper.variants]),
+                shared_steps=shared_steps,
+                variant_steps=variant_steps,
+                single=single,
+                platform=platform_name,
+                component_name=component,
+                target=target,
+                build_type=build_type,
+                force_run=force_run,
+                pristine=pristine,
+                jobs=jobs,
+            )
+        ).run()
+        return
     RunCommand().do_run(
         RunCommandConfig(
             project_dir,
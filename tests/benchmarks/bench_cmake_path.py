@@ -0,0 +1,63 @@
+"""
+Benchmark the CMake path handling for a variant with many components.
+
+Run it with ``python -m tests.benchmarks.bench_cmake_path``.
+"""
+
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import Mock
+
+from yanga.cmake.artifacts_locator import CMakeArtifactsLocator
+from yanga.cmake.cmake_backend import CMakeCommand, CMakeCustomCommand, CMakeCustomTarget
+from yanga.cmake.generator import CMakeFile
+
+COMPONENTS = 3000
+
+
+def create_variant_cmake_file() -> CMakeFile:
+    spl_paths = Mock()
+    spl_paths.project_root_dir = Path("/project")
+    locator = CMakeArtifactsLocator(Path("/project/build/Variant/Platform"), spl_paths)
+    cmake_file = CMakeFile(Path("/project/build/Variant/Platform/variant.cmake"))
+    for index in range(COMPONENTS):
+        name = f"Comp{index}"
+        outputs = [locator.get_component_build_dir(name).joinpath(f"out{output}.txt") for output in range(5)]
+        depends = [locator.get_component_build_dir(name).joinpath(f"in{source}.c") for source in range(10)]
+        depends.extend(locator.get_component_reports_dir(name) for _ in range(5))
+        cmake_file.append(CMakeCustomCommand(f"Command {name}", [CMakeCommand("${CMAKE_COMMAND}", ["-E", "touch", *outputs])], outputs=outputs, depends=depends))
+        cmake_file.append(CMakeCustomTarget(f"{name}_target", f"Target {name}", [], depends=outputs))
+    return cmake_file
+
+
+def best_time(function: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    build_time = best_time(create_variant_cmake_file, repeat=3)
+    gc.collect()
+    tracemalloc.start()
+    cmake_file = create_variant_cmake_file()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    custom_commands = cmake_file.find_elements_of_type(CMakeCustomCommand)
+    render_time = best_time(cmake_file.to_string)
+    to_path_time = best_time(lambda: [path.to_path() for command in custom_commands for path in command.depends or [] if not isinstance(path, str)])
+    print(f"components: {COMPONENTS}")
+    print(f"build:      {build_time:.3f} s")
+    print(f"memory:     {memory / 1e6:.1f} MB")
+    print(f"render:     {render_time:.3f} s")
+    print(f"to_path:    {to_path_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Scalability benchmarks of the build system generation on synthetic SPL projects.
+
+Every scenario runs for all project sizes (number of components). The report contains the best wall
+time, the peak traced memory and the scaling exponent ``k`` of ``time ~ components^k``.
+
+Run it with ``python -m tests.benchmarks.bench_generation``. Use ``--save-baseline`` to store the
+results as new baseline and ``--check`` to fail if the results regressed against the baseline.
+The absolute times depend on the host, so the check only compares ratios: the scaling between
+consecutive sizes and the time of a scenario relative to its reference scenario (e.g. cached vs cold).
+"""
+
+import argparse
+import gc
+import json
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import Namespace
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from py_app_dev.core.logging import logger
+from yanga_core.domain.execution_context import UserRequest, UserRequestScope
+from yanga_core.domain.reports import ComponentReportData, ReportData, ReportRelevantFiles, ReportRelevantFileType
+
+from tests.benchmarks.synthetic_project import SyntheticProject
+from yanga.cmake.builder import CMakeBuildSystemGenerator
+from yanga.cmake.concurrency import CMakeGeneratorsRunner
+from yanga.cmake.generator import CMakeGenerator
+from yanga.cmake.steps import GenerateBuildSystemFiles
+from yanga.cmake.targets import TargetsData
+from yanga.commands.gcovr import CreateComponentGcovrConfigCommand, CreateVariantGcovrConfigCommand
+from yanga.commands.targets import TargetsDocCommand
+from yanga.yview import YangaKConfigData
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+DEFAULT_SIZES = [10, 100, 1000]
+#: Times below this are considered noise
+NOISE_SECONDS = 0.05
+#: Scenarios compared relative to a reference scenario measured on the same host
+SCENARIO_REFERENCES = {"CMakeBuildSystemGenerator.generate (cached)": "CMakeBuildSystemGenerator.generate"}
+
+
+@dataclass
+class Measurement:
+    seconds: float
+    peak_memory_mb: float
+
+
+@dataclass
+class BenchmarkResults:
+    sizes: list[int]
+    variants: int
+    platforms: int
+    #: Measurements per scenario and size
+    measurements: dict[str, dict[int, Measurement]] = field(default_factory=dict)
+
+    def add(self, scenario: str, size: int, measurement: Measurement) -> None:
+        self.measurements.setdefault(scenario, {})[size] = measurement
+
+    @property
+    def exponents(self) -> dict[str, float]:
+        return {scenario: scaling_exponent({size: m.seconds for size, m in by_size.items()}) for scenario, by_size in self.measurements.items()}
+
+    @property
+    def local_exponents(self) -> dict[str, dict[tuple[int, int], float]]:
+        """Scaling exponent between every two consecutive sizes. Sizes with times below the noise are skipped."""
+        result: dict[str, dict[tuple[int, int], float]] = {}
+        for scenario, by_size in self.measurements.items():
+            sizes = sorted(size for size, m in by_size.items() if m.seconds >= NOISE_SECONDS)
+            result[scenario] = {(small, large): scaling_exponent({small: by_size[small].seconds, large: by_size[large].seconds}) for small, large in zip(sizes, sizes[1:])}
+        return result
+
+    @property
+    def ratios(self) -> dict[str, dict[int, float]]:
+        """Time of the scenarios relative to their reference scenario (see ``SCENARIO_REFERENCES``)."""
+        result: dict[str, dict[int, float]] = {}
+        for scenario, reference in SCENARIO_REFERENCES.items():
+            by_size, reference_by_size = self.measurements.get(scenario, {}), self.measurements.get(reference, {})
+            result[scenario] = {
+                size: m.seconds / reference_by_size[size].seconds for size, m in by_size.items() if size in reference_by_size and reference_by_size[size].seconds > 0
+            }
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sizes": self.sizes,
+            "variants": self.variants,
+            "platforms": self.platforms,
+            "measurements": {scenario: {str(size): asdict(m) for size, m in by_size.items()} for scenario, by_size in self.measurements.items()},
+            "exponents": self.exponents,
+            "ratios": {scenario: {str(size): ratio for size, ratio in by_size.items()} for scenario, by_size in self.ratios.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BenchmarkResults":
+        results = cls(data["sizes"], data["variants"], data["platforms"])
+        for scenario, by_size in data["measurements"].items():
+            for size, measurement in by_size.items():
+                results.add(scenario, int(size), Measurement(**measurement))
+        return results
+
+
+def scaling_exponent(seconds_by_size: dict[int, float]) -> float:
+    """Least squares slope of log(time) over log(size). 1.0 means linear scaling."""
+    points = [(math.log(size), math.log(seconds)) for size, seconds in seconds_by_size.items() if size > 0 and seconds > 0]
+    if len(points) < 2:
+        return float("nan")
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if not denominator:
+        return float("nan")
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def measure(setup: Callable[[], Callable[[], object]], repeat: int) -> Measurement:
+    """Best wall time of ``repeat`` runs and the peak memory of an extra traced run. The setup is not measured."""
+    best = float("inf")
+    for _ in range(repeat):
+        function = setup()
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    function = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(best, peak / 1e6)
+
+
+def measure_generators(project: SyntheticProject, work_dir: Path, repeat: int) -> dict[str, Measurement]:
+    """Measure every generator of the platform as part of a (sequential) generation run, so it gets the registry data of the previous ones."""
+    seconds: dict[str, float] = {}
+    peaks: dict[str, float] = {}
+
+    def run(traced: bool) -> None:
+        execution_context = project.create_execution_context()
+        generators = CMakeBuildSystemGenerator(execution_context, work_dir).load_generators()
+        instances = [reference._class(execution_context, work_dir, reference.config) for reference in generators]
+
+        def generate(generator: CMakeGenerator) -> list[Any]:
+            name = generator.__class__.__name__
+            if traced:
+                tracemalloc.reset_peak()
+                current, _ = tracemalloc.get_traced_memory()
+            start = time.perf_counter()
+            elements = generator.generate()
+            elapsed = time.perf_counter() - start
+            if traced:
+                peaks[name] = (tracemalloc.get_traced_memory()[1] - current) / 1e6
+            else:
+                seconds[name] = min(seconds.get(name, float("inf")), elapsed)
+            return elements
+
+        CMakeGeneratorsRunner(execution_context, max_workers=1).run(instances, generate)
+
+    for _ in range(repeat):
+        run(traced=False)
+    tracemalloc.start()
+    try:
+        run(traced=True)
+    finally:
+        tracemalloc.stop()
+    return {name: Measurement(seconds[name], peaks[name]) for name in seconds}
+
+
+def run_benchmarks(sizes: list[int], variants: int = 3, platforms: int = 2, repeat: int = 3, log: Callable[[str], None] = print) -> BenchmarkResults:
+    results = BenchmarkResults(sizes, variants, platforms)
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="yanga_bench_") as tmp_dir:
+            project_dir = Path(tmp_dir) / "project"
+            project = SyntheticProject(project_dir, size, variants, platforms).create()
+            build_dir = Path(tmp_dir) / "build"
+            for scenario, measurement in measure_scenarios(project, build_dir, repeat).items():
+                results.add(scenario, size, measurement)
+                log(f"{size:>6} {scenario:<44} {measurement.seconds:>9.3f} s {measurement.peak_memory_mb:>9.1f} MB")
+    return results
+
+
+def measure_scenarios(project: SyntheticProject, build_dir: Path, repeat: int) -> dict[str, Measurement]:
+    measurements: dict[str, Measurement] = {}
+    run_index = iter(range(sys.maxsize))
+
+    def generate_cold() -> Callable[[], object]:
+        # A new output dir for every run, nothing can be reused
+        execution_context = project.create_execution_context()
+        return CMakeBuildSystemGenerator(execution_context, build_dir / f"cold{next(run_index)}").generate
+
+    # The generation step of a no-op run: the fingerprint matches and the previous results are restored
+    GenerateBuildSystemFiles(project.create_execution_context()).run()
+
+    def generate_warm() -> Callable[[], object]:
+        return GenerateBuildSystemFiles(project.create_execution_context()).run
+
+    warm_dir = project.create_execution_context().spl_paths.variant_build_dir
+
+    measurements["CMakeBuildSystemGenerator.generate"] = measure(generate_cold, repeat)
+    measurements["CMakeBuildSystemGenerator.generate (cached)"] = measure(generate_warm, repeat)
+    measurements.update(measure_generators(project, build_dir / "generators", repeat))
+
+    targets_data_file = warm_dir / "targets_data.json"
+    target_names = {target.name for target in TargetsData.from_json_file(targets_data_file).targets}
+    doc_targets = [name for name in ("all", "report", "coverage", "lint") if name in target_names]
+    targets_doc_args = Namespace(variant_targets_data_file=targets_data_file, output_file=build_dir / "targets_data.md", targets=doc_targets)
+    measurements["TargetsDocCommand"] = measure(lambda: lambda: TargetsDocCommand().run(targets_doc_args), repeat)
+
+    component_gcovr_args = Namespace(
+        component_objects=[build_dir / f"CMakeFiles/{name}.dir/{name}.c.o" for name in project.component_names],
+        source_files=[project.project_dir / f"src/{name}/{name}.c" for name in project.component_names],
+        output_file=build_dir / "component_gcovr.cfg",
+    )
+    measurements["CreateComponentGcovrConfigCommand"] = measure(lambda: lambda: CreateComponentGcovrConfigCommand().run(component_gcovr_args), repeat)
+
+    report_config = build_dir / "report_config.json"
+    ReportData(
+        variant_name=project.variant_names[0],
+        platform_name=project.platform_names[0],
+        project_dir=project.project_dir,
+        components=[
+            ComponentReportData(
+                name=name,
+                build_dir=build_dir / name,
+                files=[
+                    ReportRelevantFiles(
+                        target=UserRequest(UserRequestScope.COMPONENT, component_name=name),
+                        files_to_be_included=[build_dir / f"{name}/coverage.json"],
+                        file_type=ReportRelevantFileType.COVERAGE_RESULT,
+                    )
+                ],
+            )
+            for name in project.component_names
+        ],
+    ).to_json_file(report_config)
+    variant_gcovr_args = Namespace(variant_report_config=report_config, output_file=build_dir / "variant_gcovr.cfg")
+    measurements["CreateVariantGcovrConfigCommand"] = measure(lambda: lambda: CreateVariantGcovrConfigCommand().run(variant_gcovr_args), repeat)
+
+    measurements["YangaKConfigData"] = measure(lambda: lambda: YangaKConfigData(project.project_dir), repeat)
+    return measurements
+
+
+def find_regressions(results: BenchmarkResults, baseline: BenchmarkResults, tolerance: float = 0.25, exponent_tolerance: float = 0.25) -> list[str]:
+    """
+    Compare the host independent ratios of the results against the baseline. Only scenarios and sizes present in both are compared.
+
+    A scenario regressed if it scales worse between two sizes or if it got slower relative to its reference scenario.
+    """
+    regressions = []
+    baseline_exponents = baseline.local_exponents
+    for scenario, by_sizes in results.local_exponents.items():
+        for (small, large), exponent in by_sizes.items():
+            reference_exponent = baseline_exponents.get(scenario, {}).get((small, large), float("nan"))
+            # NaN never compares greater, missing exponents are skipped
+            if exponent > reference_exponent + exponent_tolerance:
+                regressions.append(f"{scenario} [{small}-{large}]: scaling exponent {exponent:.2f} (baseline {reference_exponent:.2f})")
+    baseline_ratios = baseline.ratios
+    for scenario, by_size in results.ratios.items():
+        for size, ratio in by_size.items():
+            reference_ratio = baseline_ratios.get(scenario, {}).get(size)
+            # The slowdown is only significant if the additional time is above the noise
+            additional_seconds = (ratio - (reference_ratio or 0)) * results.measurements[SCENARIO_REFERENCES[scenario]][size].seconds
+            if reference_ratio and ratio > reference_ratio * (1 + tolerance) and additional_seconds > NOISE_SECONDS:
+                regressions.append(f"{scenario} [{size}]: {ratio:.3f} of {SCENARIO_REFERENCES[scenario]} (baseline {reference_ratio:.3f})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Comma separated numbers of components, e.g. 10,100,1000,5000.")
+    parser.add_argument("--variants", type=int, default=3, help="Number of variants of the synthetic project.")
+    parser.add_argument("--platforms", type=int, default=2, help="Number of platforms of the synthetic project.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per scenario. The best one is reported.")
+    parser.add_argument("--output", type=Path, help="Write the results JSON to this file.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline results JSON.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as new baseline.")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if the results regressed against the baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown of a scenario against its reference scenario, compared to the baseline.")
+    parser.add_argument("--exponent-tolerance", type=float, default=0.25, help="Allowed increase of the scaling exponents against the baseline.")
+    args = parser.parse_args(argv)
+    # The commands log every run, keep the output readable
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    results = run_benchmarks([int(size) for size in args.sizes.split(",")], args.variants, args.platforms, args.repeat)
+    print()
+    for scenario, exponent in results.exponents.items():
+        print(f"{scenario:<51} k = {exponent:.2f}")
+    content = json.dumps(results.to_dict(), indent=2) + "\n"
+    if args.output:
+        args.output.write_text(content)
+    if args.save_baseline:
+        args.baseline.write_text(content)
+    if args.check:
+        regressions = find_regressions(results, BenchmarkResults.from_dict(json.loads(args.baseline.read_text())), args.tolerance, args.exponent_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
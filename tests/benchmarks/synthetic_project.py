@@ -0,0 +1,95 @@
+"""Synthetic SPL projects with a configurable number of components, variants and platforms."""
+
+from pathlib import Path
+
+from pypeline.domain.external_project import ExternalProject
+from yanga_core.domain.execution_context import ExecutionContext, UserRequest, UserRequestScope
+from yanga_core.domain.project_slurper import YangaProjectSlurper
+
+from tests.utils import write_file
+
+#: All generators of the yanga.cmake package, in a valid execution order
+GENERATORS = [
+    ("CreateExecutableCMakeGenerator", "yanga.cmake.create_executable"),
+    ("GTestCMakeGenerator", "yanga.cmake.gtest"),
+    ("CppCheckCMakeGenerator", "yanga.cmake.cppcheck"),
+    ("ObjectsDepsCMakeGenerator", "yanga.cmake.objects_deps"),
+    ("TargetsDataCMakeGenerator", "yanga.cmake.targets_data"),
+    ("ReportCMakeGenerator", "yanga.cmake.reports"),
+]
+
+
+class SyntheticProject:
+    """
+    Writes a yanga project with ``components`` components, ``variants`` variants and ``platforms`` platforms.
+
+    Every variant selects all components and has its own features selection file.
+    Every platform runs all the yanga CMake generators.
+    """
+
+    def __init__(self, project_dir: Path, components: int, variants: int = 1, platforms: int = 1) -> None:
+        self.project_dir = project_dir
+        self.component_names = [f"comp{index}" for index in range(components)]
+        self.variant_names = [f"Variant{index}" for index in range(variants)]
+        self.platform_names = [f"platform{index}" for index in range(platforms)]
+
+    def create(self) -> "SyntheticProject":
+        write_file(self.project_dir / "yanga.yaml", self._yanga_yaml())
+        write_file(self.project_dir / "KConfig", "".join(f'config FEATURE_{name.upper()}\n    bool "Enable {name}"\n    default y\n\n' for name in self.component_names))
+        for index, variant in enumerate(self.variant_names):
+            disabled = self.component_names[index % len(self.component_names)] if self.component_names else None
+            write_file(self.project_dir / f"variants/{variant}/config.txt", f"CONFIG_FEATURE_{disabled.upper()}=n\n" if disabled else "")
+        for name in self.component_names:
+            write_file(self.project_dir / f"src/{name}/{name}.h", f"int {name}(void);\n")
+            write_file(self.project_dir / f"src/{name}/{name}.c", f'#include "{name}.h"\nint {name}(void) {{ return 0; }}\n')
+            write_file(
+                self.project_dir / f"src/{name}/test_{name}.cc",
+                f'#include <gtest/gtest.h>\nextern "C" {{\n#include "{name}.h"\n}}\nTEST({name}, returns_zero) {{ EXPECT_EQ(0, {name}()); }}\n',
+            )
+        return self
+
+    def _yanga_yaml(self) -> str:
+        lines = ["platforms:"]
+        for platform in self.platform_names:
+            lines.extend([f"  - name: {platform}", "    generators:"])
+            for step, module in GENERATORS:
+                lines.extend([f"      - step: {step}", f"        module: {module}"])
+        lines.append("components:")
+        for name in self.component_names:
+            lines.extend(
+                [
+                    f"  - name: {name}",
+                    f"    path: src/{name}",
+                    "    sources:",
+                    f"      - {name}.c",
+                    "    testing:",
+                    "      sources:",
+                    f"        - test_{name}.cc",
+                ]
+            )
+        lines.append("variants:")
+        for variant in self.variant_names:
+            lines.extend(
+                [f"  - name: {variant}", "    components:", *[f"      - {name}" for name in self.component_names], f"    features_selection_file: variants/{variant}/config.txt"]
+            )
+        return "\n".join(lines) + "\n"
+
+    def create_execution_context(self, variant: str | None = None, platform: str | None = None) -> ExecutionContext:
+        """Create the execution context the same way ``yanga run`` does, with GoogleTest already installed."""
+        variant = variant or self.variant_names[0]
+        platform = platform or self.platform_names[0]
+        project_slurper = YangaProjectSlurper(self.project_dir)
+        execution_context = ExecutionContext(
+            project_root_dir=self.project_dir,
+            variant_name=variant,
+            user_request=UserRequest(UserRequestScope.VARIANT, variant_name=variant),
+            selected_component_names=project_slurper.get_selected_component_names(variant, platform),
+            user_config_files=project_slurper.user_config_files,
+            features_selection_file=project_slurper.get_variant_config_file(variant),
+            platform=project_slurper.get_platform(platform),
+            variant=project_slurper.get_variant_config(variant),
+            project_configs=project_slurper.project_configs,
+        )
+        project_slurper.register_components(execution_context.data_registry)
+        execution_context.data_registry.insert(ExternalProject(name="googletest", revision="v1.17.0", path=self.project_dir / "ext/gtest"), "WestInstall")
+        return execution_context
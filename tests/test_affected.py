@@ -0,0 +1,123 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from py_app_dev.core.data_registry import DataRegistry
+from yanga_core.domain.component_resolver import ComponentResolver
+from yanga_core.domain.config import ComponentConfig, IncludeDirectory, IncludeDirectoryScope, TestingConfig
+from yanga_core.domain.execution_context import ExecutionContext, UserRequest, UserRequestScope, UserRequestTarget
+from yanga_core.domain.spl_paths import SPLPaths
+
+from tests.utils import write_file
+from yanga.affected import AffectedComponents, create_affected_tests_request
+from yanga.cmake.cmake_backend import CMakePath
+from yanga.cmake.coverage import CoverageRelevantFile
+from yanga.cmake.steps import ExecuteBuild
+
+
+@pytest.fixture
+def env(tmp_path: Path) -> ExecutionContext:
+    write_file(tmp_path / "compA/compA.c", '#include "util.h"\nint a(void) { return util(); }\n')
+    write_file(tmp_path / "compA/test_compA.cc", '#include "compA.h"\n')
+    write_file(tmp_path / "compA/compA.h", "int a(void);\n")
+    write_file(tmp_path / "compB/compB.c", '#include "compB.h"\nint b(void) { return 1; }\n')
+    write_file(tmp_path / "compB/test_compB.cc", '#include "compB.h"\n')
+    write_file(tmp_path / "compB/compB.h", "int b(void);\n")
+    write_file(tmp_path / "util/include/util.h", "static inline int util(void) { return 0; }\n")
+    write_file(tmp_path / "util/util.c", "int util_unused(void) { return 0; }\n")
+    configs = [
+        ComponentConfig(name="CompA", path=Path("compA"), sources=["compA.c"], testing=TestingConfig(sources=["test_compA.cc"])),
+        ComponentConfig(name="CompB", path=Path("compB"), sources=["compB.c"], testing=TestingConfig(sources=["test_compB.cc"])),
+        ComponentConfig(
+            name="Util",
+            path=Path("util"),
+            sources=["util.c"],
+            include_directories=[IncludeDirectory("include", IncludeDirectoryScope.PUBLIC)],
+        ),
+    ]
+    spl_paths = SPLPaths(tmp_path, "mock_variant", "mock_platform", None)
+    env = Mock(spec=ExecutionContext)
+    env.project_root_dir = tmp_path
+    env.variant_name = "mock_variant"
+    env.spl_paths = spl_paths
+    env.platform = None
+    env.data_registry = DataRegistry()
+    env.components = ComponentResolver(configs, [config.name for config in configs], spl_paths).selected_components
+    env.user_config_files = [write_file(tmp_path / "yanga.yaml", "variants: []")]
+    # Only components with tests register a coverage report
+    for name in ("CompA", "CompB"):
+        env.data_registry.insert(
+            CoverageRelevantFile(
+                target=UserRequest(UserRequestScope.COMPONENT, component_name=name, target=UserRequestTarget.COVERAGE),
+                json_report=CMakePath(spl_paths.variant_build_dir / name / "coverage.json"),
+            ),
+            name,
+        )
+    return env
+
+
+def test_select_affected_components(env: ExecutionContext) -> None:
+    root = env.project_root_dir
+    affected_components = AffectedComponents.from_execution_context(env)
+
+    assert affected_components.select([root / "compB/compB.c"]) == ["CompB"]
+    assert affected_components.select([root / "compA/test_compA.cc", root / "docs/index.md"]) == ["CompA"]
+    # Headers are mapped to all components including them
+    assert affected_components.select([root / "util/include/util.h"]) == ["CompA"]
+    # Components without tests have no test targets
+    assert affected_components.select([root / "util/util.c"]) == []
+    assert affected_components.select([root / "yanga.yaml"]) == ["CompA", "CompB"]
+
+
+def test_select_affected_components_from_previous_coverage(env: ExecutionContext) -> None:
+    generated_source = env.project_root_dir / "generated/compB_config.c"
+    write_file(
+        env.spl_paths.variant_build_dir / "CompB/coverage.json",
+        json.dumps({"files": [{"file": generated_source.as_posix(), "lines": []}]}),
+    )
+
+    assert AffectedComponents.from_execution_context(env).select([generated_source]) == ["CompB"]
+
+
+def test_select_affected_components_without_coverage(env: ExecutionContext) -> None:
+    root = env.project_root_dir
+    env.data_registry = DataRegistry()
+    affected_components = AffectedComponents.from_execution_context(env)
+
+    assert affected_components.select([root / "compB/compB.c"]) == ["CompB"]
+    assert affected_components.select([root / "util/include/util.h"]) == ["CompA"]
+    assert affected_components.select([root / "yanga.yaml"]) == ["CompA", "CompB"]
+
+
+@pytest.mark.skipif(not shutil.which("git"), reason="Requires git")
+def test_execute_build_runs_affected_tests_in_one_invocation(env: ExecutionContext) -> None:
+    def git(*args: str) -> None:
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@test", *args], cwd=env.project_root_dir, check=True, capture_output=True)  # noqa: S603, S607
+
+    git("init", "-b", "main")
+    git("add", ".")
+    git("commit", "-m", "base")
+    write_file(env.project_root_dir / "compA/compA.h", "int a(void);\nint a2(void);\n")
+    # Untracked files are changes too
+    write_file(env.project_root_dir / "compB/test_compB_new.cc", "")
+    build_dir = env.spl_paths.variant_build_dir
+    write_file(build_dir / "CMakeCache.txt", "VARIANT:UNINITIALIZED=mock_variant\n")
+    write_file(build_dir / "build.ninja", "")
+
+    executed: list[list[str]] = []
+    env.user_request = create_affected_tests_request("mock_variant", "main")
+    with patch.object(ExecuteBuild, "_run", side_effect=lambda cmd: executed.append([str(arg) for arg in cmd])):
+        ExecuteBuild(env, None, {"skip_up_to_date_configure": True, "use_ninja": True}).run()
+    assert len(executed) == 1
+    assert executed[0][-2:] == ["CompA_test", "CompB_test"]
+
+    # Nothing to build without affected components
+    git("add", ".")
+    git("commit", "-m", "change")
+    executed.clear()
+    with patch.object(ExecuteBuild, "_run", side_effect=lambda cmd: executed.append([str(arg) for arg in cmd])):
+        ExecuteBuild(env, None, {"skip_up_to_date_configure": True, "use_ninja": True}).run()
+    assert executed == []
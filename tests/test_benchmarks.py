@@ -0,0 +1,78 @@
+import json
+import math
+from pathlib import Path
+from unittest.mock import patch
+
+from tests.benchmarks.bench_generation import BASELINE_FILE, BenchmarkResults, Measurement, find_regressions, run_benchmarks, scaling_exponent
+from tests.benchmarks.synthetic_project import SyntheticProject
+from yanga.cmake.builder import CMakeBuildSystemGenerator
+from yanga.cmake.steps import GenerateBuildSystemFiles
+
+
+def test_scaling_exponent() -> None:
+    assert scaling_exponent({10: 1.0, 100: 10.0, 1000: 100.0}) == 1.0
+    assert math.isclose(scaling_exponent({10: 1.0, 100: 100.0}), 2.0)
+    assert math.isnan(scaling_exponent({10: 1.0}))
+
+
+def test_synthetic_project(tmp_path: Path) -> None:
+    project = SyntheticProject(tmp_path, components=3, variants=2, platforms=2).create()
+
+    execution_context = project.create_execution_context("Variant1", "platform1")
+
+    assert [component.name for component in execution_context.components] == ["comp0", "comp1", "comp2"]
+    assert execution_context.platform and execution_context.platform.name == "platform1"
+    assert execution_context.features_selection_file == tmp_path / "variants/Variant1/config.txt"
+
+
+def test_run_benchmarks_and_find_regressions() -> None:
+    results = run_benchmarks([2, 4], variants=1, platforms=1, repeat=1, log=lambda _: None)
+
+    assert "CMakeBuildSystemGenerator.generate" in results.measurements
+    assert "GTestCMakeGenerator" in results.measurements
+    assert set(results.measurements["YangaKConfigData"]) == {2, 4}
+    assert BenchmarkResults.from_dict(json.loads(json.dumps(results.to_dict()))).measurements == results.measurements
+    assert find_regressions(results, results) == []
+
+
+def create_results(seconds: dict[str, dict[int, float]]) -> BenchmarkResults:
+    results = BenchmarkResults(sorted({size for by_size in seconds.values() for size in by_size}), 1, 1)
+    for scenario, by_size in seconds.items():
+        for size, value in by_size.items():
+            results.add(scenario, size, Measurement(value, 1.0))
+    return results
+
+
+def test_find_regressions_compares_ratios() -> None:
+    cold, cached = "CMakeBuildSystemGenerator.generate", "CMakeBuildSystemGenerator.generate (cached)"
+    baseline = create_results({cold: {100: 0.2, 1000: 2.0}, cached: {100: 0.1, 1000: 0.2}})
+
+    # A slower host is no regression
+    assert find_regressions(create_results({cold: {100: 0.6, 1000: 6.0}, cached: {100: 0.3, 1000: 0.6}}), baseline) == []
+    assert find_regressions(create_results({cold: {100: 0.2, 1000: 20.0}, cached: {100: 0.1, 1000: 0.2}}), baseline) == [
+        f"{cold} [100-1000]: scaling exponent 2.00 (baseline 1.00)"
+    ]
+    assert find_regressions(create_results({cold: {100: 0.2, 1000: 2.0}, cached: {100: 0.1, 1000: 1.0}}), baseline) == [
+        f"{cached} [100-1000]: scaling exponent 1.00 (baseline 0.30)",
+        f"{cached} [1000]: 0.500 of {cold} (baseline 0.100)",
+    ]
+
+
+def test_cached_generation_scenario_skips_the_generators(tmp_path: Path) -> None:
+    project = SyntheticProject(tmp_path, components=5).create()
+
+    with patch.object(CMakeBuildSystemGenerator, "generate", autospec=True, side_effect=CMakeBuildSystemGenerator.generate) as generate:
+        GenerateBuildSystemFiles(project.create_execution_context()).run()
+        # The cached scenario measures a no-op run: no generator runs and no file is written
+        step = GenerateBuildSystemFiles(project.create_execution_context())
+        step.run()
+
+    assert generate.call_count == 1
+    assert step.generated_files
+    assert step.written_files == []
+
+
+def test_baseline_is_readable() -> None:
+    baseline = BenchmarkResults.from_dict(json.loads(BASELINE_FILE.read_text()))
+
+    assert baseline.sizes == sorted({size for by_size in baseline.measurements.values() for size in by_size})
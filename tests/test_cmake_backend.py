@@ -1,11 +1,15 @@
+import pickle
 import textwrap
 from pathlib import Path
 
+import pytest
+
 from yanga.cmake.cmake_backend import (
     CMakeAddExecutable,
     CMakeAddLibrary,
     CMakeAddSubdirectory,
     CMakeAddTargetCleanFiles,
+    CMakeAddTest,
     CMakeBuildEvent,
     CMakeCommand,
     CMakeCustomCommand,
@@ -16,8 +20,11 @@ from yanga.cmake.cmake_backend import (
     CMakeListAppend,
     CMakeMinimumVersion,
     CMakePath,
+    CMakePathInterner,
     CMakeProject,
+    CMakeSetTestsProperties,
     CMakeTargetIncludeDirectories,
+    CMakeTargetPrecompileHeaders,
     CMakeVariable,
     IncludeScope,
     cmake_directory_provider,
@@ -101,6 +108,27 @@ def test_cmake_path():
     assert CMakePath(Path("some/file.txt")).with_suffix(".md").to_path() == Path("some/file.md")
 
 
+def test_cmake_path_is_immutable_and_hashable():
+    cmake_path = CMakePath(Path("/build"), "CMAKE_BUILD_DIR", Path("CompA"))
+    assert {cmake_path, CMakePath(Path("/build"), None, Path("CompA"))} == {cmake_path}
+    assert {cmake_path: 1}[CMakePath(Path("/build"), "CMAKE_BUILD_DIR", Path("CompA"))] == 1
+    with pytest.raises(AttributeError):
+        cmake_path.path = Path("/other")
+    restored = pickle.loads(pickle.dumps(cmake_path))  # noqa: S301
+    assert restored == cmake_path
+    assert restored.to_string() == "${CMAKE_BUILD_DIR}/CompA"
+
+
+def test_cmake_path_interner():
+    interner = CMakePathInterner()
+    build_dir = interner.intern(CMakePath(Path("/build"), "CMAKE_BUILD_DIR"))
+    assert interner.joinpath(build_dir, "CompA") is interner.joinpath(build_dir, "CompA")
+    assert interner.intern(CMakePath(Path("/build"), "CMAKE_BUILD_DIR", Path("CompA"))) is interner.joinpath(build_dir, "CompA")
+    # The variable changes the rendering, so the paths are not shared
+    assert interner.intern(CMakePath(Path("/build/CompA"))) is not interner.joinpath(build_dir, "CompA")
+    assert len(interner) == 3
+
+
 def test_cmake_include():
     cmake_include = CMakeInclude("TestInclude.cmake")
     assert cmake_include.to_string() == "include(TestInclude.cmake)"
@@ -269,6 +297,12 @@ def test_cmake_enable_testing():
     assert cmake_enable_testing.to_string() == "enable_testing()"
 
 
+def test_cmake_add_test():
+    assert CMakeAddTest("CompA", "CompA", ["--gtest_brief=1"]).to_string() == "add_test(NAME CompA COMMAND CompA --gtest_brief=1)"
+    properties = CMakeSetTestsProperties(["CompA", "CompB"], {"TIMEOUT": "60", "ENVIRONMENT": "GTEST_TOTAL_SHARDS=2;GTEST_SHARD_INDEX=0"})
+    assert properties.to_string() == 'set_tests_properties(CompA CompB PROPERTIES TIMEOUT "60" ENVIRONMENT "GTEST_TOTAL_SHARDS=2;GTEST_SHARD_INDEX=0")'
+
+
 def test_cmake_add_target_clean_files():
     elem = CMakeAddTargetCleanFiles("my_target", [CMakePath(Path("dir/one")), "dir/two"])
     assert elem.to_string() == "set_property(TARGET my_target APPEND PROPERTY ADDITIONAL_CLEAN_FILES dir/one dir/two)"
@@ -303,3 +337,10 @@ def test_cmake_target_include_directories():
     # Test with empty paths
     empty_include_dirs = CMakeTargetIncludeDirectories("my_target", [], IncludeScope.PRIVATE)
     assert empty_include_dirs.to_string() == ""
+
+
+def test_cmake_target_precompile_headers():
+    headers: list[str | CMakePath] = ["<gtest/gtest.h>", CMakePath(Path("/include/common.h"))]
+    assert CMakeTargetPrecompileHeaders("my_target", headers).to_string() == "target_precompile_headers(my_target PRIVATE <gtest/gtest.h> /include/common.h)"
+    assert CMakeTargetPrecompileHeaders("other_target", reuse_from="my_target").to_string() == "target_precompile_headers(other_target REUSE_FROM my_target)"
+    assert CMakeTargetPrecompileHeaders("my_target", []).to_string() == ""
@@ -0,0 +1,145 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, ClassVar, Optional
+
+from py_app_dev.core.data_registry import DataRegistry
+from pypeline.domain.external_project import ExternalProject
+from yanga_core.domain.execution_context import ExecutionContext
+
+from yanga.cmake.cmake_backend import CMakeComment, CMakeElement
+from yanga.cmake.concurrency import CMakeGeneratorsRunner, ScopedDataRegistry, generate_in_order
+from yanga.cmake.coverage import CoverageRelevantFile
+from yanga.cmake.generator import CMakeGenerator
+from yanga.cmake.gtest import GTestCMakeGenerator
+
+
+class Produced:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class ProducingGenerator(CMakeGenerator):
+    produces = (Produced,)
+    consumes = ()
+    delay: ClassVar[float] = 0.05
+
+    def generate(self) -> list[CMakeElement]:
+        name = (self.config or {})["name"]
+        time.sleep(self.delay)
+        self.execution_context.data_registry.insert(Produced(name), name)
+        return [CMakeComment(name)]
+
+
+class ConsumingGenerator(CMakeGenerator):
+    produces = ()
+    consumes = (Produced,)
+
+    def generate(self) -> list[CMakeElement]:
+        return [CMakeComment(entry.name) for entry in self.execution_context.data_registry.find_data(Produced)]
+
+
+class UndeclaredGenerator(CMakeGenerator):
+    running: ClassVar[int] = 0
+    max_running: ClassVar[int] = 0
+    lock = threading.Lock()
+
+    def generate(self) -> list[CMakeElement]:
+        with self.lock:
+            UndeclaredGenerator.running += 1
+            UndeclaredGenerator.max_running = max(UndeclaredGenerator.max_running, UndeclaredGenerator.running)
+        time.sleep(0.02)
+        with self.lock:
+            UndeclaredGenerator.running -= 1
+        return []
+
+
+def run_generators(execution_context: ExecutionContext, output_dir: Path, generators: list[tuple[type[CMakeGenerator], Optional[dict[str, Any]]]]) -> list[str]:
+    instances = [generator(execution_context, output_dir, config) for generator, config in generators]
+    results = CMakeGeneratorsRunner(execution_context, max_workers=4).run(instances, lambda generator: generator.generate())
+    return [str(element) for elements in results for element in elements]
+
+
+def test_results_and_registry_entries_keep_the_generators_order(execution_context: ExecutionContext, output_dir: Path) -> None:
+    class SlowGenerator(ProducingGenerator):
+        delay = 0.2
+
+    registry = execution_context.data_registry
+    elements = run_generators(execution_context, output_dir, [(SlowGenerator, {"name": "first"}), (ProducingGenerator, {"name": "second"})])
+
+    assert elements == ["# first", "# second"]
+    assert [entry.name for entry in registry.find_data(Produced)] == ["first", "second"]
+    assert execution_context.data_registry is registry
+
+
+def test_consumer_sees_the_entries_of_previous_producers_only(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = run_generators(
+        execution_context,
+        output_dir,
+        [(ProducingGenerator, {"name": "before"}), (ConsumingGenerator, None), (ProducingGenerator, {"name": "after"})],
+    )
+
+    assert elements == ["# before", "# before", "# after"]
+
+
+def test_undeclared_generators_do_not_run_concurrently(execution_context: ExecutionContext, output_dir: Path) -> None:
+    UndeclaredGenerator.max_running = 0
+    run_generators(execution_context, output_dir, [(UndeclaredGenerator, None), (ProducingGenerator, {"name": "a"}), (UndeclaredGenerator, None), (UndeclaredGenerator, None)])
+
+    assert UndeclaredGenerator.max_running == 1
+
+
+def test_generate_in_order_commits_per_item(execution_context: ExecutionContext, output_dir: Path) -> None:
+    def generate(name: str) -> list[str]:
+        time.sleep(0.05 if name == "a" else 0)
+        execution_context.data_registry.insert(Produced(name), name)
+        return [name]
+
+    class ItemsGenerator(CMakeGenerator):
+        produces = (Produced,)
+        consumes = ()
+
+        def generate(self) -> list[CMakeElement]:
+            return [CMakeComment(name) for name in generate_in_order(["a", "b", "c"], generate)]
+
+    elements = run_generators(execution_context, output_dir, [(ItemsGenerator, None), (ConsumingGenerator, None)])
+
+    assert elements == ["# a", "# b", "# c", "# a", "# b", "# c"]
+    # Outside a generators run, the items are processed sequentially
+    assert generate_in_order(["x", "y"], generate) == ["x", "y"]
+
+
+def test_scoped_registry_forwards_outside_of_generators() -> None:
+    registry = DataRegistry()
+    ScopedDataRegistry(registry).insert(Produced("main"), "main")
+    assert [entry.name for entry in registry.find_data(Produced)] == ["main"]
+
+
+def test_gtest_generation_is_identical_when_run_concurrently(execution_context: ExecutionContext, output_dir: Path) -> None:
+    def new_registry() -> DataRegistry:
+        registry = DataRegistry()
+        registry.insert(ExternalProject(name="googletest", revision="v1.17.0", path=Path("ext/gtest/v1.17.0")), provider="WestInstall")
+        return registry
+
+    execution_context.data_registry = new_registry()
+    sequential = [str(element) for element in GTestCMakeGenerator(execution_context, output_dir).generate()]
+    sequential_entries = [str(entry) for entry in execution_context.data_registry.find_data(CoverageRelevantFile)]
+
+    execution_context.data_registry = new_registry()
+    concurrent = run_generators(execution_context, output_dir, [(GTestCMakeGenerator, None), (ConsumingGenerator, None)])
+
+    assert concurrent == sequential
+    assert [str(entry) for entry in execution_context.data_registry.find_data(CoverageRelevantFile)] == sequential_entries
+
+
+def test_generators_run_sequentially_by_default(execution_context: ExecutionContext, output_dir: Path) -> None:
+    threads: list[threading.Thread] = []
+
+    def generate(generator: CMakeGenerator) -> list[CMakeElement]:
+        threads.append(threading.current_thread())
+        return generator.generate()
+
+    instances = [ProducingGenerator(execution_context, output_dir, {"name": name}) for name in ("first", "second")]
+    CMakeGeneratorsRunner(execution_context).run(instances, generate)
+
+    assert threads == [threading.main_thread(), threading.main_thread()]
@@ -9,6 +9,7 @@ from yanga.cmake.cmake_backend import (
     CMakeAddExecutable,
     CMakeAddLibrary,
     CMakeCustomTarget,
+    CMakeTargetPrecompileHeaders,
 )
 from yanga.cmake.create_executable import CreateExecutableCMakeGenerator
 
@@ -70,3 +71,22 @@ def test_create_components_cmake_elements(
         "CompBNotTestable_compile",
         "CompBNotTestable_build",
     ]
+
+
+def test_precompiled_headers_are_reused_by_all_component_libraries(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = CreateExecutableCMakeGenerator(execution_context, output_dir, {"precompiled_headers": {"headers": ["include/common.h", "<stdint.h>"], "reuse": True}}).generate()
+
+    precompile_headers = assert_elements_of_type(elements, CMakeTargetPrecompileHeaders, 2)
+    assert precompile_headers[0].to_string() == f"target_precompile_headers(CompA_lib PRIVATE {execution_context.project_root_dir.as_posix()}/include/common.h <stdint.h>)"
+    assert precompile_headers[1].to_string() == "target_precompile_headers(CompBNotTestable_lib REUSE_FROM CompA_lib)"
+
+
+def test_component_precompiled_headers_config_overrides_global(execution_context: ExecutionContext, output_dir: Path) -> None:
+    config = {
+        "precompiled_headers": {"headers": ["<stdint.h>"], "reuse": True},
+        "component_precompiled_headers": {"CompA": {"headers": ["<stdio.h>"]}, "CompBNotTestable": {"enabled": False}},
+    }
+    elements = CreateExecutableCMakeGenerator(execution_context, output_dir, config).generate()
+
+    precompile_headers = assert_element_of_type(elements, CMakeTargetPrecompileHeaders)
+    assert precompile_headers.to_string() == "target_precompile_headers(CompA_lib PRIVATE <stdio.h>)"
@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+from yanga.cmake.cmake_backend import CMakeAddExecutable, CMakeAddLibrary, CMakeComment, CMakeCustomTarget, CMakeProject
+from yanga.cmake.generator import CMakeFile, GeneratedFile, GeneratedFilesWriter, write_if_changed
+
+
+def test_write_if_changed_keeps_unchanged_file_untouched(tmp_path: Path) -> None:
+    file = tmp_path / "sub" / "config.cmake"
+    assert write_if_changed(file, "set(A 1)")
+    os.utime(file, (0, 0))
+
+    assert not write_if_changed(file, "set(A 1)")
+    assert file.stat().st_mtime == 0
+
+    assert write_if_changed(file, "set(A 2)")
+    assert file.read_text() == "set(A 2)"
+    assert file.stat().st_mtime != 0
+    assert [path.name for path in file.parent.iterdir()] == ["config.cmake"]
+
+
+def test_generated_files_writer_counts_written_and_skipped(tmp_path: Path) -> None:
+    cmake_file = CMakeFile(tmp_path / "variant.cmake").append(CMakeProject("MyProject"))
+    json_file = GeneratedFile(tmp_path / "targets_data.json", "{}")
+
+    writer = GeneratedFilesWriter()
+    writer.write_all([cmake_file, json_file])
+    assert writer.written_files == [cmake_file.path, json_file.path]
+    assert writer.skipped_files == []
+
+    writer = GeneratedFilesWriter()
+    writer.write_all([cmake_file, GeneratedFile(json_file.path, '{"targets": []}')])
+    assert writer.written_files == [json_file.path]
+    assert writer.skipped_files == [cmake_file.path]
+
+
+def test_cmake_file_index_keeps_insertion_order(tmp_path: Path) -> None:
+    comp_lib = CMakeAddLibrary("CompA", [tmp_path / "a.c"], component_name="CompA")
+    other_lib = CMakeAddLibrary("CompB", [tmp_path / "b.c"], component_name="CompB")
+    executable = CMakeAddExecutable("CompA_test", [], component_name="CompA")
+    comment = CMakeComment("first")
+    cmake_file = CMakeFile(tmp_path / "variant.cmake").extend([comment, comp_lib, CMakeProject("MyProject"), executable, other_lib])
+
+    assert cmake_file.find_elements_of_type(CMakeAddLibrary) == [comp_lib, other_lib]
+    assert cmake_file.find_elements_of_type(object) == cmake_file.content
+    assert cmake_file.find_elements_of_type(CMakeCustomTarget) == []
+    assert cmake_file.index.find_component_elements("CompA") == [comp_lib, executable]
+    assert cmake_file.index.find_component_elements("CompC") == []
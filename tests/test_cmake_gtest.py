@@ -7,21 +7,31 @@ from pypeline.domain.external_project import ExternalProject
 from yanga_core.domain.components import Component
 from yanga_core.domain.config import MockingConfig, TestingConfig
 from yanga_core.domain.execution_context import ExecutionContext
+from yanga_core.domain.reports import ReportRelevantFiles, ReportRelevantFileType
 
 from tests.utils import assert_element_of_type, assert_elements_of_type, find_elements_of_type
+from yanga.affected import AffectedComponents
 from yanga.cmake.cmake_backend import (
     CMakeAddExecutable,
     CMakeAddLibrary,
+    CMakeAddSubdirectory,
     CMakeAddTargetCleanFiles,
+    CMakeAddTest,
     CMakeCustomCommand,
     CMakeCustomTarget,
+    CMakeEnableTesting,
     CMakeInclude,
     CMakeIncludeDirectories,
+    CMakePath,
+    CMakeSetTestsProperties,
     CMakeTargetIncludeDirectories,
+    CMakeTargetPrecompileHeaders,
     CMakeVariable,
     IncludeScope,
 )
+from yanga.cmake.coverage import CoverageRelevantFile
 from yanga.cmake.gtest import GTestCMakeArtifactsLocator, GTestCMakeGenerator, GTestCMakeGeneratorConfig, GTestComponentCMakeGenerator
+from yanga.cmake.prebuilt_gtest import CMakePrebuiltGTest, is_fixed_revision
 
 
 @pytest.fixture
@@ -56,6 +66,41 @@ def test_generate(gtest_cmake_generator: GTestCMakeGenerator) -> None:
     assert_elements_of_type(elements, CMakeInclude, 0)
 
 
+def test_gtest_is_added_as_subdirectory_by_default(gtest_cmake_generator: GTestCMakeGenerator) -> None:
+    elements = gtest_cmake_generator.create_gtest_integration_cmake_elements()
+
+    assert assert_element_of_type(elements, CMakeAddSubdirectory).source_dir.to_path() == Path("ext/gtest/v1.17.0")
+    assert_elements_of_type(elements, CMakePrebuiltGTest, 0)
+
+
+def test_prebuilt_gtest_is_imported_from_the_cache(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"prebuilt_gtest": {"cache_dir": ".cache/gtest"}}).create_gtest_integration_cmake_elements()
+
+    assert_elements_of_type(elements, CMakeAddSubdirectory, 0)
+    prebuilt_gtest = assert_element_of_type(elements, CMakePrebuiltGTest)
+    assert prebuilt_gtest.revision == "v1.17.0"
+    assert prebuilt_gtest.cache_dir.to_path() == execution_context.project_root_dir / ".cache/gtest"
+    content = prebuilt_gtest.to_string()
+    assert f"set(YANGA_GTEST_PREFIX {(execution_context.project_root_dir / '.cache/gtest').as_posix()}/v1.17.0-${{_yanga_gtest_key}})" in content
+    assert 'find_package(GTest CONFIG REQUIRED PATHS "${YANGA_GTEST_PREFIX}" NO_DEFAULT_PATH)' in content
+    # The cache key uses the sources checked out, the release tag is only the fallback without git
+    assert 'COMMAND "${GIT_EXECUTABLE}" rev-parse HEAD:./' in content
+    assert 'set(_yanga_gtest_sources "v1.17.0")' in content
+    assert 'set(_yanga_gtest_key "${_yanga_gtest_sources};' in content
+
+
+@pytest.mark.parametrize(
+    ("revision", "fixed"),
+    [("v1.17.0", True), ("release-1.8.1", True), ("1.14", True), ("52eb8108c5bdec04579160ae17225d66034bd723", True), ("52eb810", True), ("main", False), ("feature/v1.17", False)],
+)
+def test_only_fixed_revisions_are_cached_without_git(revision: str, fixed: bool) -> None:
+    assert is_fixed_revision(revision) == fixed
+    content = CMakePrebuiltGTest(CMakePath(Path("ext/gtest")), revision, CMakePath(Path("cache")), CMakePath(Path("build/.gtest"))).to_string()
+    assert (f'set(_yanga_gtest_sources "{revision}")' in content) == fixed
+    assert f'message(STATUS "GoogleTest revision {revision} can not be resolved to a commit, it is not cached")' in content
+    assert "add_subdirectory(ext/gtest build/.gtest)" in content
+
+
 def test_create_variant_cmake_elements(
     gtest_cmake_generator: GTestCMakeGenerator,
 ) -> None:
@@ -113,9 +158,99 @@ def test_gtest_cmake_generator_coverage(execution_context: ExecutionContext, out
 
     # Test that the right tools are used
     assert component_cmd.commands, "Component coverage command should have subcommands"
-    command_tools = [str(cmd.command) for cmd in component_cmd.commands]
-    assert any("yanga_cmd" in tool for tool in command_tools), "Should use yanga_cmd for config"
-    assert any("gcovr" in tool for tool in command_tools), "Should use gcovr for reports"
+    assert [(str(cmd.command), str(cmd.arguments[0])) for cmd in component_cmd.commands] == [("yanga_cmd", "coverage_report_component")], "Should create all reports in one run"
+
+
+def test_fast_test_build_without_coverage(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"coverage": False}).generate()
+
+    targets = assert_elements_of_type(elements, CMakeCustomTarget, 3)
+    assert {target.name for target in targets} == {"CompA_mockup", "CompA_test", "CompA_build"}
+    assert "--coverage" not in assert_element_of_type(elements, CMakeAddLibrary, lambda lib: lib.name == "CompA_PC").compile_options
+    assert not assert_element_of_type(elements, CMakeAddExecutable).link_options
+    assert not [cmd for cmd in find_elements_of_type(elements, CMakeCustomCommand) if "coverage report" in cmd.description]
+    assert not execution_context.data_registry.find_data(CoverageRelevantFile)
+
+
+def test_fast_test_build_keeps_the_affected_test_targets(execution_context: ExecutionContext, output_dir: Path) -> None:
+    execution_context.user_config_files = []
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"coverage": False, "coverage_diff": {}}).generate()
+
+    # Without coverage data the affected components are found from their sources
+    affected = AffectedComponents.from_execution_context(execution_context).select([execution_context.project_root_dir / "compA/compA_source.cpp"])
+    assert affected == ["CompA"]
+    assert "CompA_test" in {target.name for target in find_elements_of_type(elements, CMakeCustomTarget)}
+    # No coverage_diff target without coverage data
+    assert "coverage_diff" not in {target.name for target in find_elements_of_type(elements, CMakeCustomTarget)}
+
+
+def test_test_executable_links_with_the_component_coverage_flag(execution_context: ExecutionContext, output_dir: Path) -> None:
+    generator = GTestComponentCMakeGenerator(execution_context, output_dir, GTestCMakeGeneratorConfig(coverage=True))
+
+    executable = generator.add_executable("CompA", [], "CompA_PC_lib", "CompA", GTestCMakeGeneratorConfig(coverage=False))
+
+    assert not executable.link_options
+
+
+def test_coverage_diff_target(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"coverage_diff": {"base_ref": "origin/develop", "fail_under": 80}}).generate()
+
+    target = assert_element_of_type(elements, CMakeCustomTarget, lambda tgt: tgt.name == "coverage_diff")
+    assert target.depends and [str(dep) for dep in target.depends] == ["${CMAKE_BUILD_DIR}/CompA/coverage.json"]
+    args = [str(arg) for arg in target.commands[0].arguments]
+    assert args[:3] == ["coverage_diff", "--base-ref", "origin/develop"]
+    assert args[args.index("--output-file") + 1] == "${CMAKE_BUILD_DIR}/coverage_diff.json"
+    assert args[-2:] == ["--fail-under", "80.0"]
+    # The target is only created on request
+    assert "coverage_diff" not in {target.name for target in find_elements_of_type(GTestCMakeGenerator(execution_context, output_dir).generate(), CMakeCustomTarget)}
+
+
+@pytest.mark.parametrize(
+    ("config", "coverage_json", "merged_json"), [({}, "coverage.json", "coverage_merged.json"), ({"compress_coverage_json": True}, "coverage.json.gz", "coverage_merged.json.gz")]
+)
+def test_variant_coverage_report_uses_merged_tracefile(
+    execution_context: ExecutionContext, output_dir: Path, config: dict[str, bool], coverage_json: str, merged_json: str
+) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, config).generate()
+
+    variant_coverage_cmd = assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description == "Generate coverage report for the variant")
+    merge_args, config_args = ([str(arg) for arg in command.arguments] for command in variant_coverage_cmd.commands[:2])
+    assert merge_args == ["coverage_merge", "--coverage-files", f"${{CMAKE_BUILD_DIR}}/CompA/{coverage_json}", "--output-file", f"${{CMAKE_BUILD_DIR}}/{merged_json}"]
+    assert config_args[-2:] == ["--tracefiles", f"${{CMAKE_BUILD_DIR}}/{merged_json}"]
+    component_coverage_cmd = assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description == "Generate coverage report for component CompA")
+    assert component_coverage_cmd.outputs and f"${{CMAKE_BUILD_DIR}}/CompA/{coverage_json}" in [str(output) for output in component_coverage_cmd.outputs]
+
+
+def test_variant_coverage_report_rendered_incrementally(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"incremental_coverage_html": True}).generate()
+
+    variant_coverage_cmd = assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description == "Generate coverage report for the variant")
+    assert [command.command for command in variant_coverage_cmd.commands] == ["yanga_cmd", "yanga_cmd"]
+    render_args = [str(arg) for arg in variant_coverage_cmd.commands[1].arguments]
+    assert render_args[:3] == ["coverage_html", "--tracefile", "${CMAKE_BUILD_DIR}/coverage_merged.json"]
+    assert variant_coverage_cmd.outputs and [str(output) for output in variant_coverage_cmd.outputs] == [
+        "${CMAKE_BUILD_DIR}/coverage_merged.json",
+        "${CMAKE_BUILD_DIR}/reports/coverage/index.html",
+    ]
+
+
+def test_test_timing_report_targets(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"test_timing": {"history_size": 5}}).generate()
+
+    commands = {cmd.description: cmd for cmd in find_elements_of_type(elements, CMakeCustomCommand) if "test timing" in cmd.description}
+    component_command = commands["Create the test timing report for CompA"]
+    assert component_command.depends and [str(dep) for dep in component_command.depends] == ["${CMAKE_BUILD_DIR}/CompA/CompA_junit.xml"]
+    args = [str(arg) for arg in component_command.commands[0].arguments]
+    assert args[args.index("--history-size") + 1] == "5"
+    variant_command = commands["Create the test timing report for the variant"]
+    assert variant_command.outputs and [str(output) for output in variant_command.outputs] == ["${CMAKE_BUILD_DIR}/test_timing.md"]
+
+    test_results = [entry for entry in execution_context.data_registry.find_data(ReportRelevantFiles) if entry.file_type == ReportRelevantFileType.TEST_RESULT]
+    assert {entry.target.target_name: entry.files_to_be_included[0].name for entry in test_results} == {"CompA_test_timing": "test_timing.md", "test_timing": "test_timing.md"}
+
+    # The test timing report is opt-in
+    elements = GTestCMakeGenerator(execution_context, output_dir).generate()
+    assert not {"CompA_test_timing", "test_timing"} & {target.name for target in find_elements_of_type(elements, CMakeCustomTarget)}
 
 
 def test_coverage_targets_register_clean_files(execution_context: ExecutionContext, output_dir: Path) -> None:
@@ -165,7 +300,7 @@ def test_automock_enabled_by_default(execution_context: ExecutionContext, output
     # Run IUT
     elements = GTestCMakeGenerator(execution_context, output_dir).generate()
 
-    # Expect the partial link library required to find the symbols to be mocked
+    # Expect the object library required to find the symbols to be mocked
     executable = assert_element_of_type(elements, CMakeAddExecutable, lambda exec: exec.name == "CompA")
     expected_test_source = f"{execution_context.project_root_dir.as_posix()}/compA/test_compA_source.cpp"
     assert [str(source) for source in executable.sources] == [expected_test_source, f"{output_dir.as_posix()}/CompA/mockup_CompA.cc"]
@@ -182,6 +317,28 @@ def test_automock_enabled_by_default(execution_context: ExecutionContext, output
     assert "CompA" in junit_arg, f"Component-specific path not found in JUnit argument: {junit_arg}"
 
 
+def test_mockup_sources_are_generated_with_cache(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"mocking": {"exclude_symbol_patterns": ["std::*"]}}).generate()
+
+    custom_command = assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description == "Run clanguru to generate mockup sources")
+    assert custom_command.outputs
+    assert {str(output) for output in custom_command.outputs} == {f"{output_dir.as_posix()}/CompA/mockup_CompA.{ext}" for ext in ("log", "h", "cc")}
+    command = custom_command.commands[0]
+    assert command.command == "yanga_cmd"
+    args = [str(arg) for arg in command.arguments]
+    assert args[0] == "mockup"
+    assert args[args.index("--cache-dir") + 1] == "${CMAKE_BUILD_DIR}/CompA/.mockup_cache"
+    assert args[args.index("--symbols-manifest") + 1] == "${CMAKE_BUILD_DIR}/CompA/CompA_PC_symbols.json"
+    assert args[args.index("--source-files") + 1] == f"{execution_context.project_root_dir.as_posix()}/compA/compA_source.cpp"
+    assert args[-2:] == ["--exclude-symbol-pattern", '"std::*"']
+    # The mockup command runs on every rebuild of the component objects, its cache turns an unchanged run into a no-op
+    assert [str(dependency) for dependency in custom_command.depends or []] == [
+        "${CMAKE_BUILD_DIR}/CompA/CompA_PC_symbols.json",
+        "CompA_PC_lib",
+        f"{execution_context.project_root_dir.as_posix()}/compA/compA_source.cpp",
+    ]
+
+
 def test_automock_disabled_generates_no_mock_targets(execution_context: ExecutionContext, output_dir: Path) -> None:
     # Run IUT
     elements = GTestCMakeGenerator(execution_context, output_dir, {"mocking": {"enabled": False}}).generate()
@@ -316,3 +473,142 @@ def test_component_mocking_config_overrides_global(execution_context: ExecutionC
     assert config.mocking.enabled is True, "Inherited global mocking enabled"
     assert config.mocking.exclude_symbol_patterns == ["CompAPattern1"], "Overridden exclude patterns"
     assert config.mocking.strict is True, "Overridden strict setting"
+
+
+def test_unity_build_batches_test_and_mockup_sources(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"unity_build": {"batch_size": 8}}).generate()
+
+    unity_source = f"{output_dir.as_posix()}/CompA/CompA_unity_0.cc"
+    executable = assert_element_of_type(elements, CMakeAddExecutable, lambda exec: exec.name == "CompA")
+    assert [str(source) for source in executable.sources] == [unity_source]
+    command = assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description.startswith("Create unity source"))
+    assert [output.to_path().as_posix() for output in command.outputs or []] == [unity_source]
+    # The mockup source must be generated before the unity source including it is compiled
+    assert [str(depend) for depend in command.depends or []] == [
+        f"{execution_context.project_root_dir.as_posix()}/compA/test_compA_source.cpp",
+        f"{output_dir.as_posix()}/CompA/mockup_CompA.cc",
+    ]
+    assert [str(arg) for arg in command.commands[0].arguments][:2] == ["unity_source", "--source-files"]
+
+
+def test_unity_build_batches_and_excluded_sources(execution_context: ExecutionContext, output_dir: Path) -> None:
+    config = GTestCMakeGeneratorConfig.from_dict({"unity_build": {"batch_size": 2, "exclude": ["test_isr*.cc"]}})
+    generator = GTestComponentCMakeGenerator(execution_context, output_dir, config)
+    sources = [Path("test_a.cc"), Path("test_b.cc"), Path("test_c.cc"), Path("test_d.c"), Path("sub/test_isr.cc")]
+
+    commands, compiled_sources = generator.create_unity_sources("CompA", sources, config.unity_build)
+
+    assert len(commands) == 1
+    assert [str(depend) for depend in commands[0].depends or []] == ["test_a.cc", "test_b.cc"]
+    # A single remaining source and the sources which can not be merged are compiled standalone
+    assert compiled_sources == [output_dir / "CompA/CompA_unity_0.cc", Path("test_c.cc"), Path("test_d.c"), Path("sub/test_isr.cc")]
+
+
+def test_unity_build_invalid_batch_size(execution_context: ExecutionContext, output_dir: Path) -> None:
+    config = GTestCMakeGeneratorConfig.from_dict({"unity_build": {"batch_size": 0}})
+    generator = GTestComponentCMakeGenerator(execution_context, output_dir, config)
+
+    with pytest.raises(UserNotificationException, match="batch size"):
+        generator.create_unity_sources("CompA", [Path("test_a.cc"), Path("test_b.cc")], config.unity_build)
+
+
+def test_component_unity_build_config_overrides_global(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(
+        execution_context,
+        output_dir,
+        {"unity_build": {"batch_size": 8}, "component_unity_build": {"CompA": {"enabled": False}}},
+    ).generate()
+
+    executable = assert_element_of_type(elements, CMakeAddExecutable, lambda exec: exec.name == "CompA")
+    assert len(executable.sources) == 2
+    assert_elements_of_type(elements, CMakeCustomCommand, 0, lambda cmd: cmd.description.startswith("Create unity source"))
+
+
+def test_precompiled_headers_default_to_gtest_and_gmock(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"precompiled_headers": {}}).generate()
+
+    precompile_headers = assert_element_of_type(elements, CMakeTargetPrecompileHeaders)
+    assert precompile_headers.to_string() == "target_precompile_headers(CompA PRIVATE <gtest/gtest.h> <gmock/gmock.h>)"
+
+
+def test_precompiled_headers_are_reused_by_all_test_executables(execution_context: ExecutionContext, output_dir: Path) -> None:
+    config = GTestCMakeGeneratorConfig.from_dict({"precompiled_headers": {"reuse": True}, "component_precompiled_headers": {"CompC": {"headers": ["<vector>"]}}})
+    generator = GTestComponentCMakeGenerator(execution_context, output_dir, config)
+    components = [Component(name=name, path=Path(name), test_sources=[Path(f"{name}/test.cc")]) for name in ["CompA", "CompB", "CompC"]]
+
+    precompile_headers = [
+        generator.precompiled_headers.create(component.name, generator._determine_component_generator_config(component).precompiled_headers) for component in components
+    ]
+
+    assert [str(element) for element in precompile_headers] == [
+        "target_precompile_headers(CompA PRIVATE <gtest/gtest.h> <gmock/gmock.h>)",
+        "target_precompile_headers(CompB REUSE_FROM CompA)",
+        "target_precompile_headers(CompC PRIVATE <vector>)",
+    ]
+
+
+def test_test_shards_run_in_parallel_and_are_merged(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"test_shards": 3}).generate()
+
+    shard_commands = assert_elements_of_type(elements, CMakeCustomCommand, 3, lambda cmd: cmd.description.startswith("Run the test executable shard"))
+    for index, command in enumerate(shard_commands):
+        arguments = [str(arg) for arg in command.commands[1].arguments]
+        assert "GTEST_TOTAL_SHARDS=3" in arguments
+        assert f"GTEST_SHARD_INDEX={index}" in arguments
+        assert f"GCOV_PREFIX=${{CMAKE_BUILD_DIR}}/CompA/shards/{index}/gcov" in arguments
+        assert [str(output) for output in command.outputs or []] == [f"${{CMAKE_BUILD_DIR}}/CompA/shards/{index}/CompA_junit.xml"]
+    merge_command = assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description.startswith("Merge the JUnit reports"))
+    assert [str(output) for output in merge_command.outputs or []] == ["${CMAKE_BUILD_DIR}/CompA/CompA_junit.xml"]
+    assert list(merge_command.depends or []) == [output for command in shard_commands for output in command.outputs or []]
+    # The coverage report and the test target use the merged results
+    coverage_command = assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description == "Generate coverage report for component CompA")
+    assert coverage_command.depends == merge_command.outputs
+    assert_elements_of_type(elements, CMakeCustomCommand, 0, lambda cmd: cmd.description.startswith("Run the test executable, generate"))
+
+
+def test_component_test_shards_override_global(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"test_shards": 3, "component_test_shards": {"CompA": 1}}).generate()
+
+    assert_elements_of_type(elements, CMakeCustomCommand, 0, lambda cmd: cmd.description.startswith("Run the test executable shard"))
+    assert_element_of_type(elements, CMakeCustomCommand, lambda cmd: cmd.description.startswith("Run the test executable, generate"))
+
+
+def test_ctest_runs_the_test_shards(execution_context: ExecutionContext, output_dir: Path) -> None:
+    elements = GTestCMakeGenerator(execution_context, output_dir, {"test_shards": 2, "ctest": {"timeout": 60, "parallel_level": 4}}).generate()
+
+    assert_element_of_type(elements, CMakeEnableTesting)
+    tests = assert_elements_of_type(elements, CMakeAddTest, 3)
+    assert [(test.name, test.command) for test in tests] == [("CompA_clean_test_shards", "${CMAKE_COMMAND}"), ("CompA_shard_0", "CompA"), ("CompA_shard_1", "CompA")]
+    assert [str(arg) for arg in tests[0].arguments] == ["-E", "rm", "-rf", "${CMAKE_BUILD_DIR}/CompA/shards/0/gcov", "${CMAKE_BUILD_DIR}/CompA/shards/1/gcov"]
+    assert [str(arg) for arg in tests[2].arguments] == ["--gtest_output=xml:${CMAKE_BUILD_DIR}/CompA/shards/1/CompA_junit.xml"]
+    properties = assert_element_of_type(elements, CMakeSetTestsProperties, lambda props: props.tests == ["CompA_shard_1"]).properties
+    gcov_prefix_strip = len(Path(output_dir).absolute().parts) - 1
+    assert properties == {
+        "TIMEOUT": "60",
+        "LABELS": "CompA",
+        "FIXTURES_REQUIRED": "CompA_test_shards",
+        "ENVIRONMENT": f"GTEST_TOTAL_SHARDS=2;GTEST_SHARD_INDEX=1;GCOV_PREFIX=${{CMAKE_BUILD_DIR}}/CompA/shards/1/gcov;GCOV_PREFIX_STRIP={gcov_prefix_strip}",
+    }
+    clean_properties = assert_element_of_type(elements, CMakeSetTestsProperties, lambda props: props.tests == ["CompA_clean_test_shards"]).properties
+    assert clean_properties == {"LABELS": "CompA", "FIXTURES_SETUP": "CompA_test_shards"}
+    ctest_target = assert_element_of_type(elements, CMakeCustomTarget, lambda target: target.name == "ctest")
+    assert ctest_target.depends == ["CompA"]
+    assert [str(arg) for arg in ctest_target.commands[0].arguments] == [
+        "--test-dir",
+        "${CMAKE_BUILD_DIR}",
+        "--parallel",
+        "4",
+        "--output-on-failure",
+        "--output-junit",
+        "${CMAKE_BUILD_DIR}/ctest_junit.xml",
+    ]
+
+    # CTest is only used on request
+    elements = GTestCMakeGenerator(execution_context, output_dir).generate()
+    assert_elements_of_type(elements, CMakeAddTest, 0)
+    assert_elements_of_type(elements, CMakeEnableTesting, 0)
+
+
+def test_invalid_test_shards(execution_context: ExecutionContext, output_dir: Path) -> None:
+    with pytest.raises(UserNotificationException, match="test shards"):
+        GTestCMakeGenerator(execution_context, output_dir, {"test_shards": 0}).generate()
@@ -0,0 +1,147 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from tests.utils import write_file
+from yanga.cmake.cmake_backend import (
+    CMakeAddExecutable,
+    CMakeAddLibrary,
+    CMakeAddTest,
+    CMakeCommand,
+    CMakeContent,
+    CMakeCustomCommand,
+    CMakeCustomTarget,
+    CMakeElement,
+    CMakeIncludeDirectories,
+    CMakePath,
+    CMakeTargetIncludeDirectories,
+    CMakeTargetPrecompileHeaders,
+    CMakeVariable,
+    IncludeScope,
+)
+from yanga.cmake.ninja_backend import NinjaBuildFileGenerator, NinjaToolchainConfig, ninja_escape_path
+
+
+def create_elements(project_dir: Path, build_dir: Path) -> list[CMakeElement]:
+    write_file(project_dir / "src/comp/comp.h", "int comp(void);\n")
+    write_file(project_dir / "src/comp/comp.c", '#include "comp.h"\nint comp(void) { return 3; }\n')
+    write_file(project_dir / "src/main.c", '#include "comp.h"\nint main(void) { return comp() - 3; }\n')
+    build_dir_path = CMakePath(build_dir, "CMAKE_BUILD_DIR")
+    library = CMakeAddLibrary("comp", [project_dir / "src/comp/comp.c"], component_name="comp")
+    report = build_dir_path.joinpath("report.txt")
+    return [
+        CMakeVariable("CMAKE_BUILD_DIR", build_dir.as_posix()),
+        CMakeIncludeDirectories([CMakePath(project_dir / "src")]),
+        library,
+        CMakeTargetIncludeDirectories(library.target_name, [CMakePath(project_dir / "src/comp")], IncludeScope.PUBLIC),
+        CMakeAddExecutable("${PROJECT_NAME}", [CMakePath(project_dir / "src/main.c"), library]),
+        CMakeCustomCommand(
+            "Write report",
+            [CMakeCommand("${CMAKE_COMMAND}", ["-E", "touch", report])],
+            outputs=[report],
+            depends=["${PROJECT_NAME}"],
+        ),
+        CMakeCustomTarget("report", "Report target", [], depends=[report], default_target=True),
+    ]
+
+
+def test_generate_build_ninja(tmp_path: Path) -> None:
+    project_dir = tmp_path / "project"
+    build_dir = tmp_path / "build"
+    generator = NinjaBuildFileGenerator(create_elements(project_dir, build_dir), NinjaToolchainConfig(), build_dir, project_dir, "MyVariant", "Debug")
+
+    ninja_file, compile_commands = generator.generate()
+
+    assert ninja_file.path == build_dir / "build.ninja"
+    content = ninja_file.to_string()
+    comp_object = ninja_escape_path((build_dir / "CMakeFiles/comp_lib.dir/src/comp/comp.c.o").as_posix())
+    assert f"build {comp_object}: c_compile" in content
+    assert "restat = 1" in content
+    assert "build MyVariant: phony" in content
+    assert "build comp_lib: phony" in content
+    assert "build report: phony" in content
+    assert "default all" in content
+    # The executable gets the PUBLIC include dirs of the linked object library
+    assert f"-I{(project_dir / 'src/comp').as_posix()}" in content
+    assert "cmake -E touch" in content
+    assert compile_commands.path == build_dir / "compile_commands.json"
+    assert "comp.c" in compile_commands.to_string()
+
+
+def test_private_include_dirs_are_not_propagated(tmp_path: Path) -> None:
+    library = CMakeAddLibrary("comp", [tmp_path / "comp.c"])
+    elements = [
+        library,
+        CMakeTargetIncludeDirectories(library.target_name, [CMakePath(tmp_path / "private")], IncludeScope.PRIVATE),
+        CMakeAddExecutable("app", [CMakePath(tmp_path / "main.c"), library]),
+    ]
+    generator = NinjaBuildFileGenerator(elements, NinjaToolchainConfig(), tmp_path / "build", tmp_path, "app")
+    generator.generate()
+
+    assert generator._include_dirs("app", [library.target_name]) == []
+    assert generator._include_dirs(library.target_name, []) == [tmp_path / "private"]
+
+
+def test_external_libraries_are_mapped_by_the_toolchain(tmp_path: Path) -> None:
+    elements: list[CMakeElement] = [CMakeAddExecutable("app", [CMakePath(tmp_path / "main.cc")], libraries=["GTest::gtest_main", "pthread"])]
+    toolchain = NinjaToolchainConfig(link_libraries={"GTest::gtest_main": ["-lgtest_main", "-lgtest"]})
+
+    content = NinjaBuildFileGenerator(elements, toolchain, tmp_path / "build", tmp_path, "app").generate()[0].to_string()
+
+    assert "libs = -lgtest_main -lgtest -lpthread" in content
+
+
+def test_precompile_headers_are_force_included(tmp_path: Path) -> None:
+    elements: list[CMakeElement] = [
+        CMakeAddExecutable("test_a", [CMakePath(tmp_path / "test_a.cc")]),
+        CMakeAddExecutable("test_b", [CMakePath(tmp_path / "test_b.cc")]),
+        CMakeTargetPrecompileHeaders("test_a", ["<gtest/gtest.h>", CMakePath(tmp_path / "common.h")]),
+        CMakeTargetPrecompileHeaders("test_b", reuse_from="test_a"),
+    ]
+
+    generator = NinjaBuildFileGenerator(elements, NinjaToolchainConfig(), tmp_path / "build", tmp_path, "app")
+    generator.generate()
+
+    expected = ["-include gtest/gtest.h", f"-include {(tmp_path / 'common.h').as_posix()}"]
+    assert generator._force_included_headers("test_a") == expected
+    assert generator._force_included_headers("test_b") == expected
+    assert all("-include gtest/gtest.h" in command["command"] for command in generator.compile_commands)
+
+
+@pytest.mark.parametrize(
+    "elements",
+    [
+        [CMakeAddExecutable("app", [CMakePath(Path("main.cc"))], libraries=["GTest::gmock"])],
+        [CMakeContent("message(STATUS hello)")],
+        [CMakeCustomTarget("dump", "Dump", [CMakeCommand("echo", ["${UNKNOWN_VARIABLE}"])])],
+    ],
+)
+def test_unsupported_input_is_reported(tmp_path: Path, elements: list[CMakeElement]) -> None:
+    with pytest.raises(UserNotificationException):
+        NinjaBuildFileGenerator(elements, NinjaToolchainConfig(), tmp_path / "build", tmp_path, "app").generate()
+
+
+def test_ctest_is_rejected(tmp_path: Path) -> None:
+    elements = [*create_elements(tmp_path / "project", tmp_path / "build"), CMakeAddTest("app", "app")]
+
+    with pytest.raises(UserNotificationException, match="CTest is not supported by the ninja backend"):
+        NinjaBuildFileGenerator(elements, NinjaToolchainConfig(), tmp_path / "build", tmp_path / "project", "app").generate()
+
+
+@pytest.mark.skipif(not (shutil.which("ninja") and shutil.which("gcc") and shutil.which("cmake")), reason="Requires ninja, gcc and cmake")
+def test_build_with_ninja(tmp_path: Path) -> None:
+    project_dir = tmp_path / "project"
+    build_dir = tmp_path / "build"
+    for file in NinjaBuildFileGenerator(create_elements(project_dir, build_dir), NinjaToolchainConfig(), build_dir, project_dir, "MyVariant").generate():
+        file.to_file()
+
+    subprocess.run(["ninja", "-C", build_dir.as_posix()], check=True)  # noqa: S603, S607
+
+    assert (build_dir / "MyVariant").is_file()
+    assert (build_dir / "report.txt").is_file()
+    # Nothing to do on the second run
+    result = subprocess.run(["ninja", "-C", build_dir.as_posix(), "-n", "MyVariant"], check=True, capture_output=True, text=True)  # noqa: S603, S607
+    assert "no work to do" in result.stdout
@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.utils import write_file
+from yanga.cmake.runner import CMakeRunner, read_cmake_cache
+
+CMAKE_CACHE = """# This is the CMakeCache file.
+//Choose the type of build
+CMAKE_BUILD_TYPE:STRING=Debug
+VARIANT:UNINITIALIZED=MyVariant
+PLATFORM:UNINITIALIZED=gtest
+CMAKE_TOOLCHAIN_FILE:FILEPATH={toolchain}
+"""
+
+
+def create_configured_build_dir(build_dir: Path, toolchain: Path) -> None:
+    write_file(build_dir / "CMakeCache.txt", CMAKE_CACHE.format(toolchain=toolchain.as_posix()))
+    write_file(build_dir / "build.ninja", "")
+
+
+def test_read_cmake_cache(tmp_path: Path) -> None:
+    cache_file = write_file(tmp_path / "CMakeCache.txt", CMAKE_CACHE.format(toolchain="/tools/gcc.cmake"))
+    assert read_cmake_cache(cache_file) == {
+        "CMAKE_BUILD_TYPE": "Debug",
+        "VARIANT": "MyVariant",
+        "PLATFORM": "gtest",
+        "CMAKE_TOOLCHAIN_FILE": "/tools/gcc.cmake",
+    }
+    assert read_cmake_cache(tmp_path / "missing.txt") == {}
+
+
+def test_configure_command_uses_cache_entries(tmp_path: Path) -> None:
+    runner = CMakeRunner(tmp_path, tmp_path / "build")
+    command = runner.get_configure_command("gcc.cmake", "MyVariant", None, "Debug")
+    assert command[-3:] == ["-DCMAKE_TOOLCHAIN_FILE=gcc.cmake", "-DVARIANT=MyVariant", "-DCMAKE_BUILD_TYPE=Debug"]
+
+
+def test_configuration_up_to_date(tmp_path: Path) -> None:
+    build_dir = tmp_path / "build"
+    toolchain = tmp_path / "gcc.cmake"
+    variant_cmake = write_file(build_dir / "variant.cmake", "")
+    os.utime(variant_cmake, (0, 0))
+    runner = CMakeRunner(tmp_path, build_dir)
+    entries = runner.get_configure_cache_entries(toolchain.as_posix(), "MyVariant", "gtest", "Debug")
+
+    assert not runner.is_configuration_up_to_date(entries, [variant_cmake])
+
+    create_configured_build_dir(build_dir, toolchain)
+    assert runner.is_configuration_up_to_date(entries, [variant_cmake])
+    assert not runner.is_configuration_up_to_date(runner.get_configure_cache_entries(toolchain.as_posix(), "MyVariant", "gtest", "Release"), [variant_cmake])
+    assert not runner.is_configuration_up_to_date(runner.get_configure_cache_entries("clang.cmake", "MyVariant", "gtest", "Debug"), [variant_cmake])
+
+    # Generated input changed after the last configure
+    os.utime(variant_cmake)
+    os.utime(build_dir / "build.ninja", (0, 0))
+    assert not runner.is_configuration_up_to_date(entries, [variant_cmake])
+
+
+def test_ninja_build_command_honours_the_parallel_level(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    runner = CMakeRunner(tmp_path, tmp_path / "build")
+    monkeypatch.delenv("CMAKE_BUILD_PARALLEL_LEVEL", raising=False)
+    assert "-j" not in runner.get_ninja_build_command()
+
+    monkeypatch.setenv("CMAKE_BUILD_PARALLEL_LEVEL", "3")
+    assert runner.get_ninja_build_command("all")[-3:] == ["-j", "3", "all"]
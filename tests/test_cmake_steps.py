@@ -1,10 +1,18 @@
 from pathlib import Path
-from unittest.mock import Mock
+from typing import Any, Optional
+from unittest.mock import Mock, patch
 
 import pytest
-from yanga_core.domain.execution_context import ExecutionContext
+from py_app_dev.core.data_registry import DataRegistry
+from py_app_dev.core.pipeline import PipelineStepConfig
+from yanga_core.domain.config import ConfigFile, PlatformConfig
+from yanga_core.domain.execution_context import ExecutionContext, UserRequest, UserRequestScope
+from yanga_core.domain.reports import ReportRelevantFiles
+from yanga_core.domain.spl_paths import SPLPaths
 
-from yanga.cmake.steps import GenerateBuildSystemFiles
+from tests.utils import write_file
+from yanga.cmake.steps import ExecuteBuild, GenerateBuildSystemFiles
+from yanga.cmake.targets_data import TargetsDataCMakeGenerator
 
 
 @pytest.fixture
@@ -30,3 +38,100 @@ def test_generate_build_system_files_always_runs(env: ExecutionContext) -> None:
 
     assert step.get_inputs() == []
     assert step.get_outputs() == []
+
+
+@pytest.fixture
+def generation_env(tmp_path: Path) -> ExecutionContext:
+    env = Mock(spec=ExecutionContext)
+    env.project_root_dir = tmp_path
+    env.variant_name = "mock_variant"
+    env.spl_paths = SPLPaths(tmp_path, "mock_variant", "mock_platform", None)
+    env.data_registry = DataRegistry()
+    env.platform = PlatformConfig(
+        name="mock_platform",
+        generators=[PipelineStepConfig(step="TargetsDataCMakeGenerator", module="yanga.cmake.targets_data")],
+    )
+    env.variant = None
+    env.project_configs = []
+    env.components = []
+    env.user_config_files = [write_file(tmp_path / "yanga.yaml", "variants: []")]
+    env.features_selection_file = None
+    return env
+
+
+def test_generate_build_system_files_restores_registry_when_inputs_unchanged(generation_env: ExecutionContext) -> None:
+    step = GenerateBuildSystemFiles(generation_env)
+    step.run()
+    assert len(generation_env.data_registry.find_data(ReportRelevantFiles)) == 1
+    assert step.written_files
+
+    # A new run starts with an empty registry
+    generation_env.data_registry = DataRegistry()
+    with patch.object(TargetsDataCMakeGenerator, "generate") as generate:
+        step = GenerateBuildSystemFiles(generation_env)
+        step.run()
+    generate.assert_not_called()
+    assert [entry.target.target_name for entry in generation_env.data_registry.find_data(ReportRelevantFiles)] == ["targets_data"]
+    assert step.written_files == []
+    assert step.skipped_files == step.generated_files
+
+
+def test_generate_build_system_files_regenerates_when_inputs_changed(generation_env: ExecutionContext) -> None:
+    GenerateBuildSystemFiles(generation_env).run()
+
+    write_file(generation_env.project_root_dir / "yanga.yaml", "variants: [] # changed")
+    generation_env.data_registry = DataRegistry()
+    with patch.object(TargetsDataCMakeGenerator, "generate", return_value=[]) as generate:
+        GenerateBuildSystemFiles(generation_env).run()
+    generate.assert_called_once()
+
+
+def test_generate_build_system_files_regenerates_when_generated_file_is_missing(generation_env: ExecutionContext) -> None:
+    step = GenerateBuildSystemFiles(generation_env)
+    step.run()
+
+    step.generated_files[0].unlink()
+    generation_env.data_registry = DataRegistry()
+    step = GenerateBuildSystemFiles(generation_env)
+    step.run()
+    assert step.written_files == [step.generated_files[0]]
+    assert len(generation_env.data_registry.find_data(ReportRelevantFiles)) == 1
+
+
+@pytest.mark.parametrize(
+    ("config", "expected_commands"),
+    [
+        (None, ["cmake -S", "cmake --build"]),
+        ({"skip_up_to_date_configure": True}, ["cmake --build"]),
+        ({"skip_up_to_date_configure": True, "use_ninja": True}, ["ninja -C"]),
+    ],
+)
+def test_execute_build_skips_up_to_date_configure(generation_env: ExecutionContext, config: Optional[dict[str, Any]], expected_commands: list[str]) -> None:
+    generation_env.platform = None
+    generation_env.user_request = UserRequest(UserRequestScope.VARIANT, target="all")
+    build_dir = generation_env.spl_paths.variant_build_dir
+    write_file(build_dir / "CMakeCache.txt", "VARIANT:UNINITIALIZED=mock_variant\n")
+    write_file(build_dir / "build.ninja", "")
+
+    executed: list[str] = []
+    step = ExecuteBuild(generation_env, None, config)
+    with patch.object(ExecuteBuild, "_run", side_effect=lambda cmd: executed.append(" ".join(str(arg) for arg in cmd[:2]))):
+        step.run()
+    assert executed == expected_commands
+
+
+def test_ninja_backend_generates_build_ninja_and_skips_configure(generation_env: ExecutionContext) -> None:
+    generation_env.platform = PlatformConfig(
+        name="mock_platform",
+        generators=[PipelineStepConfig(step="TargetsDataCMakeGenerator", module="yanga.cmake.targets_data")],
+        configs=[ConfigFile(id="ninja_toolchain", content={"c_compiler": "clang"})],
+    )
+    generation_env.user_request = UserRequest(UserRequestScope.VARIANT, target="all")
+    generate_step = GenerateBuildSystemFiles(generation_env)
+    generate_step.run()
+    assert generation_env.spl_paths.variant_build_dir / "build.ninja" in generate_step.written_files
+
+    executed: list[str] = []
+    with patch.object(ExecuteBuild, "_run", side_effect=lambda cmd: executed.append(" ".join(str(arg) for arg in cmd[:2]))):
+        ExecuteBuild(generation_env, None).run()
+    assert executed == ["ninja -C"]
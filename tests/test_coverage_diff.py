@@ -0,0 +1,79 @@
+import json
+import shutil
+import subprocess
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from tests.utils import write_file
+from yanga.commands.coverage_diff import CoverageDiffCommand, format_line_ranges, parse_changed_lines
+
+DIFF = """\
+diff --git a/src/comp.c b/src/comp.c
+index 1111111..2222222 100644
+--- a/src/comp.c
++++ b/src/comp.c
+@@ -2,0 +3,2 @@ int comp(void)
++  int x = 1;
++  return x;
+@@ -10 +12 @@ int other(void)
+-  return 0;
++  return 1;
+@@ -20,3 +22,0 @@ int removed(void)
+diff --git a/old.c b/old.c
+deleted file mode 100644
+--- a/old.c
++++ /dev/null
+@@ -1 +0,0 @@
+-int old;
+"""
+
+
+def test_parse_changed_lines(tmp_path: Path) -> None:
+    assert parse_changed_lines(DIFF, tmp_path) == {tmp_path / "src/comp.c": {3, 4, 12}}
+
+
+def test_format_line_ranges() -> None:
+    assert format_line_ranges([1, 2, 3, 5, 7, 8]) == "1-3, 5, 7-8"
+    assert format_line_ranges([]) == ""
+
+
+def write_coverage_report(file: Path, source: Path, line_counts: dict[int, int]) -> Path:
+    lines = [{"line_number": line, "count": count} for line, count in line_counts.items()]
+    return write_file(file, json.dumps({"gcovr/format_version": "0.14", "files": [{"file": source.as_posix(), "lines": lines}]}))
+
+
+@pytest.mark.skipif(not shutil.which("git"), reason="Requires git")
+def test_coverage_of_changed_lines(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def git(*args: str) -> None:
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@test", *args], cwd=tmp_path, check=True, capture_output=True)  # noqa: S603, S607
+
+    source = write_file(tmp_path / "src/comp.c", "int comp(int x) {\n  return x;\n}\n")
+    git("init", "-b", "main")
+    git("add", ".")
+    git("commit", "-m", "base")
+    git("checkout", "-b", "feature")
+    write_file(source, "int comp(int x) {\n  if (x) {\n    return 1;\n  }\n  return x;\n}\n")
+    git("commit", "-am", "change")
+    # Changed lines 2-4: line 2 is not covered, line 3 is covered by the second component only, line 4 has no coverage data
+    coverage_files = [
+        write_coverage_report(tmp_path / "build/CompA/coverage.json", source, {1: 1, 2: 0, 3: 0, 5: 0}),
+        write_coverage_report(tmp_path / "build/CompB/coverage.json", source, {1: 1, 2: 0, 3: 1, 5: 0}),
+    ]
+    output_file = tmp_path / "build/coverage_diff.json"
+    monkeypatch.delenv("YANGA_COVERAGE_DIFF_BASE", raising=False)
+
+    assert CoverageDiffCommand().run(Namespace(base_ref="main", coverage_files=coverage_files, project_dir=tmp_path, output_file=output_file, fail_under=None)) == 0
+
+    report = json.loads(output_file.read_text())
+    assert report["summary"] == {"lines": 2, "covered": 1, "percent": 50.0}
+    assert report["files"] == [{"file": "src/comp.c", "lines": 2, "covered": 1, "uncovered_lines": [2]}]
+    assert "| src/comp.c | 1 | 2 | 2 |" in output_file.with_suffix(".md").read_text()
+
+    assert CoverageDiffCommand().run(Namespace(base_ref="main", coverage_files=coverage_files, project_dir=tmp_path, output_file=output_file, fail_under=80.0)) == 1
+
+    # The environment variable overrides the configured base revision
+    monkeypatch.setenv("YANGA_COVERAGE_DIFF_BASE", "feature")
+    assert CoverageDiffCommand().run(Namespace(base_ref="main", coverage_files=coverage_files, project_dir=tmp_path, output_file=output_file, fail_under=80.0)) == 0
+    assert json.loads(output_file.read_text())["summary"] == {"lines": 0, "covered": 0, "percent": None}
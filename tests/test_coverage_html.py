@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from tests.utils import write_file
+from yanga.commands.coverage_html import FileCoverage, get_page_name, render_coverage_html
+
+
+def create_file_data(file: str, count: int) -> dict[str, Any]:
+    return {
+        "file": file,
+        "lines": [
+            {"line_number": 1, "function_name": "comp", "count": count, "branches": []},
+            {
+                "line_number": 2,
+                "function_name": "comp",
+                "count": count,
+                "branches": [{"branchno": 0, "count": count}, {"branchno": 1, "count": 0}],
+            },
+            {"line_number": 3, "function_name": "comp", "count": 0, "branches": [], "gcovr/excluded": True},
+        ],
+        "functions": [{"name": "comp", "lineno": 1, "execution_count": count}],
+    }
+
+
+def write_tracefile(file: Path, files: list[dict[str, Any]]) -> Path:
+    return write_file(file, json.dumps({"gcovr/format_version": "0.14", "files": files}))
+
+
+def test_file_coverage_summary() -> None:
+    summary = FileCoverage.from_dict(create_file_data("src/comp.c", 1)).summary
+
+    assert (summary.lines_covered, summary.lines_total) == (2, 2)
+    assert (summary.functions_covered, summary.functions_total) == (1, 1)
+    assert (summary.branches_covered, summary.branches_total) == (1, 2)
+
+
+def test_render_only_changed_source_pages(tmp_path: Path) -> None:
+    write_file(tmp_path / "src/comp_a.c", "int a(void) {\n  return x ? 1 : 0;\n  // <excluded>\n}\n")
+    write_file(tmp_path / "src/comp_b.c", "int b(void) {\n  return 1;\n}\n")
+    tracefile = tmp_path / "build/coverage_merged.json"
+    output_file = tmp_path / "build/reports/coverage/index.html"
+
+    write_tracefile(tracefile, [create_file_data("src/comp_a.c", 1), create_file_data("src/comp_b.c", 0)])
+    result = render_coverage_html(tracefile, output_file, tmp_path)
+    assert result.rendered == ["src/comp_a.c", "src/comp_b.c"]
+    page_a = output_file.parent / get_page_name(output_file, "src/comp_a.c")
+    assert "&lt;excluded&gt;" in page_a.read_text()
+    assert f'href="{page_a.name}"' in output_file.read_text()
+
+    # Nothing changed
+    result = render_coverage_html(tracefile, output_file, tmp_path)
+    assert (result.rendered, result.unchanged) == ([], ["src/comp_a.c", "src/comp_b.c"])
+
+    # Coverage of one file and the text of the other file changed
+    write_tracefile(tracefile, [create_file_data("src/comp_a.c", 2), create_file_data("src/comp_b.c", 0)])
+    write_file(tmp_path / "src/comp_b.c", "int b(void) {\n  return 2;\n}\n")
+    assert render_coverage_html(tracefile, output_file, tmp_path).rendered == ["src/comp_a.c", "src/comp_b.c"]
+
+    # Pages of files no longer covered are removed and the index is up to date
+    write_tracefile(tracefile, [create_file_data("src/comp_a.c", 2)])
+    result = render_coverage_html(tracefile, output_file, tmp_path)
+    assert (result.rendered, result.removed) == ([], ["src/comp_b.c"])
+    assert not (output_file.parent / get_page_name(output_file, "src/comp_b.c")).exists()
+    assert "comp_b.c" not in output_file.read_text()
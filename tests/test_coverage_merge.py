@@ -0,0 +1,91 @@
+import json
+import shutil
+import subprocess
+from argparse import Namespace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from tests.utils import write_file
+from yanga.cmake.coverage import load_coverage_report
+from yanga.commands.coverage_merge import CoverageMergeCommand, CoverageMerger
+
+
+def create_report(count: int, branch_count: int, covered_function: str) -> dict[str, Any]:
+    return {
+        "gcovr/format_version": "0.14",
+        "files": [
+            {
+                "file": "src/comp.c",
+                "lines": [
+                    {
+                        "line_number": 2,
+                        "function_name": "comp",
+                        "count": count,
+                        "branches": [
+                            {"branchno": 0, "count": branch_count, "fallthrough": True, "throw": False, "source_block_id": 0},
+                            {"branchno": 1, "count": 0, "fallthrough": False, "throw": False, "source_block_id": 0},
+                        ],
+                        "calls": [{"callno": 0, "source_block_id": 0, "returned": count}],
+                        "gcovr/md5": "dd14c7786fae08d07c2359c8e55e4901",
+                    },
+                ],
+                "functions": [
+                    {"name": "comp", "lineno": 1, "execution_count": count, "blocks_percent": 50.0},
+                    {"name": covered_function, "lineno": 5, "execution_count": 1, "blocks_percent": 100.0},
+                ],
+            }
+        ],
+    }
+
+
+def test_merge_coverage_reports(tmp_path: Path) -> None:
+    merger = CoverageMerger()
+    merger.add_report(create_report(1, 1, "other"))
+    merger.add_report(create_report(2, 0, "another"))
+    merger.write(tmp_path / "merged.json.gz")
+
+    merged = load_coverage_report(tmp_path / "merged.json.gz")
+    assert merged["gcovr/format_version"] == "0.14"
+    file_data = merged["files"][0]
+    assert file_data["file"] == "src/comp.c"
+    line = file_data["lines"][0]
+    assert (line["count"], line["gcovr/md5"]) == (3, "dd14c7786fae08d07c2359c8e55e4901")
+    assert [(branch["branchno"], branch["count"], branch["fallthrough"]) for branch in line["branches"]] == [(0, 1, True), (1, 0, False)]
+    assert line["calls"] == [{"callno": 0, "source_block_id": 0, "returned": 3}]
+    assert [(function["name"], function["execution_count"]) for function in file_data["functions"]] == [("another", 1), ("comp", 3), ("other", 1)]
+
+
+def test_reports_with_different_format_versions_are_rejected() -> None:
+    merger = CoverageMerger()
+    merger.add_report(create_report(1, 1, "other"))
+    with pytest.raises(ValueError, match="different gcovr format versions"):
+        merger.add_report({"gcovr/format_version": "0.5", "files": []})
+
+
+@pytest.mark.skipif(not (shutil.which("gcc") and shutil.which("gcov") and shutil.which("gcovr")), reason="Requires gcc, gcov and gcovr")
+def test_merged_tracefile_has_the_gcovr_summary(tmp_path: Path) -> None:
+    source = write_file(
+        tmp_path / "src/comp.c", "int comp(int x) {\n  if (x > 1 && x < 5) return 1;\n  return 0;\n}\nint main(int argc, char **argv) { (void)argv; return comp(argc); }\n"
+    )
+    reports = []
+    for name, args in (("CompA", []), ("CompB", ["a", "b"])):
+        build_dir = tmp_path / "build" / name
+        build_dir.mkdir(parents=True)
+        subprocess.run(["gcc", "--coverage", "-c", source, "-o", build_dir / "comp.o"], check=True)  # noqa: S603, S607
+        subprocess.run(["gcc", "--coverage", build_dir / "comp.o", "-o", build_dir / "app"], check=True)  # noqa: S603, S607
+        subprocess.run([build_dir / "app", *args], check=False)  # noqa: S603
+        report = build_dir / ("coverage.json.gz" if name == "CompB" else "coverage.json")
+        subprocess.run(["gcovr", "--root", tmp_path, "--json", report, build_dir], check=True, capture_output=True)  # noqa: S603, S607
+        reports.append(report)
+    merged_file = tmp_path / "build/coverage_merged.json"
+
+    assert CoverageMergeCommand().run(Namespace(coverage_files=[*reports, tmp_path / "missing.json"], output_file=merged_file)) == 0
+
+    def summary(*tracefiles: Path) -> dict[str, Any]:
+        args = [argument for tracefile in tracefiles for argument in ("--json-add-tracefile", tracefile)]
+        completed_process = subprocess.run(["gcovr", "--root", tmp_path, *args, "--json-summary"], check=True, capture_output=True, text=True)  # noqa: S603, S607
+        return json.loads(completed_process.stdout)
+
+    assert summary(merged_file) == summary(*reports)
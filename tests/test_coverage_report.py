@@ -0,0 +1,50 @@
+import json
+import shutil
+import subprocess
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from tests.utils import write_file
+from yanga.commands.gcovr import ComponentCoverageReportCommand, create_component_gcovr_config
+
+
+def test_create_component_gcovr_config(tmp_path: Path) -> None:
+    assert create_component_gcovr_config(tmp_path / "obj", [tmp_path / "a.c", tmp_path / "b.c"]).splitlines() == [
+        f"root = {(tmp_path / 'obj').as_posix()}",
+        f"filter = {(tmp_path / 'a.c').as_posix()}",
+        f"filter = {(tmp_path / 'b.c').as_posix()}",
+    ]
+
+
+@pytest.mark.skipif(not (shutil.which("gcc") and shutil.which("gcov") and shutil.which("gcovr")), reason="Requires gcc, gcov and gcovr")
+def test_json_and_html_reports_are_created_in_one_run(tmp_path: Path) -> None:
+    component_source = write_file(tmp_path / "comp/comp.c", "int comp(int x) {\n  if (x) return 1;\n  return 0;\n}\n")
+    other_source = write_file(tmp_path / "other/other.c", "int other(void) { return 2; }\n")
+    test_source = write_file(tmp_path / "test/test.c", "int comp(int x);\nint other(void);\nint main(void) { return comp(1) - 1 + other() - 2; }\n")
+    build_dir = tmp_path / "build"
+    objects = {}
+    for source in (component_source, other_source, test_source):
+        objects[source] = build_dir / source.parent.name / f"{source.stem}.o"
+        objects[source].parent.mkdir(parents=True)
+        subprocess.run(["gcc", "--coverage", "-c", source, "-o", objects[source]], check=True)  # noqa: S603, S607
+    subprocess.run(["gcc", "--coverage", *objects.values(), "-o", build_dir / "app"], check=True)  # noqa: S603, S607
+    subprocess.run([build_dir / "app"], check=True)  # noqa: S603
+    report_dir = tmp_path / "reports"
+
+    ComponentCoverageReportCommand().run(
+        Namespace(
+            component_objects=[objects[component_source]],
+            source_files=[component_source, other_source],
+            config_file=build_dir / "comp/gcovr.cfg",
+            json_file=build_dir / "comp/coverage.json",
+            html_file=report_dir / "index.html",
+        )
+    )
+
+    # Only the coverage data of the component object directory is processed
+    coverage = json.loads((build_dir / "comp/coverage.json").read_text())
+    assert [Path(file["file"]).name for file in coverage["files"]] == ["comp.c"]
+    assert {line["line_number"]: line["count"] for line in coverage["files"][0]["lines"]} == {1: 1, 2: 1, 3: 0}
+    assert (report_dir / "index.html").is_file()
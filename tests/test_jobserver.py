@@ -0,0 +1,37 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from yanga.jobserver import JobServer, acquire_job_slots
+
+
+@pytest.mark.skipif(not JobServer.is_supported(), reason="Requires named pipes")
+def test_job_server_provides_the_tokens_left_after_the_implicit_slots() -> None:
+    with JobServer(jobs=8, clients=3).running() as job_server:
+        assert job_server.fifo
+        assert job_server.env["MAKEFLAGS"] == f"-j8 --jobserver-auth=fifo:{job_server.fifo}"
+        fd = os.open(job_server.fifo, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            assert os.read(fd, 100) == b"+++++"
+        finally:
+            os.close(fd)
+    assert not job_server.env
+
+
+@pytest.mark.skipif(not JobServer.is_supported(), reason="Requires named pipes")
+def test_acquire_the_free_job_slots_of_the_job_server() -> None:
+    with JobServer(jobs=4, clients=1).running() as job_server, patch.dict(os.environ, job_server.env):
+        with acquire_job_slots(8) as slots:
+            assert slots == 4
+            with acquire_job_slots(8) as nested_slots:
+                assert nested_slots == 1
+        with acquire_job_slots(2) as slots:
+            assert slots == 2
+
+
+def test_acquire_job_slots_without_job_server() -> None:
+    with patch.dict(os.environ, {"MAKEFLAGS": "", "CMAKE_BUILD_PARALLEL_LEVEL": "3"}), acquire_job_slots(8) as slots:
+        assert slots == 3
+    with patch.dict(os.environ, {"MAKEFLAGS": "", "CMAKE_BUILD_PARALLEL_LEVEL": ""}), acquire_job_slots(8) as slots:
+        assert slots == 8
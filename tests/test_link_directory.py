@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from tests.utils import write_file
+from yanga.commands.link_directory import MANIFEST_FILE_NAME, link_directory
+
+
+def test_link_directory_touches_only_changed_files(tmp_path: Path) -> None:
+    source_dir = tmp_path / "component"
+    destination_dir = tmp_path / "variant/component"
+    write_file(source_dir / "index.html", "index")
+    write_file(source_dir / "details/file.c.html", "details")
+    write_file(source_dir / "removed.html", "removed")
+    write_file(source_dir / ".yanga.stamp", "")
+
+    result = link_directory(source_dir, destination_dir)
+
+    assert result.linked == [Path("details/file.c.html"), Path("index.html"), Path("removed.html")]
+    assert os.path.samefile(source_dir / "index.html", destination_dir / "index.html")
+    assert (destination_dir / MANIFEST_FILE_NAME).is_file()
+    # The stamp of the source directory must not be linked, touching it in the destination would change the source
+    assert not (destination_dir / ".yanga.stamp").exists()
+
+    # gcovr writes new files for the next report
+    (source_dir / "index.html").unlink()
+    write_file(source_dir / "index.html", "index")
+    (source_dir / "details/file.c.html").unlink()
+    write_file(source_dir / "details/file.c.html", "changed details")
+    (source_dir / "removed.html").unlink()
+    write_file(destination_dir / ".yanga.stamp", "")
+
+    result = link_directory(source_dir, destination_dir)
+
+    assert result.linked == [Path("details/file.c.html")]
+    # The content did not change, the destination file is kept
+    assert result.unchanged == [Path("index.html")]
+    assert result.removed == [Path("removed.html")]
+    assert (destination_dir / "details/file.c.html").read_text() == "changed details"
+    assert not (destination_dir / "removed.html").exists()
+    assert (destination_dir / ".yanga.stamp").exists()
+
+
+def test_link_directory_falls_back_to_copy(tmp_path: Path) -> None:
+    source_dir = tmp_path / "component"
+    destination_dir = tmp_path / "variant/component"
+    write_file(source_dir / "index.html", "index")
+
+    with patch("os.link", side_effect=OSError), patch.object(Path, "symlink_to", side_effect=OSError):
+        assert link_directory(source_dir, destination_dir).linked == [Path("index.html")]
+
+    assert (destination_dir / "index.html").read_text() == "index"
+    assert not os.path.samefile(source_dir / "index.html", destination_dir / "index.html")
+    # A broken manifest links all files again
+    write_file(destination_dir / MANIFEST_FILE_NAME, "[")
+    assert link_directory(source_dir, destination_dir).linked == [Path("index.html")]
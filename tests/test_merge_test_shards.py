@@ -0,0 +1,53 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests.utils import write_file
+from yanga.commands.test_shards import merge_coverage_data, merge_junit_reports
+
+
+def write_junit_report(file: Path, suite: str, test_cases: list[str], failures: int = 0) -> Path:
+    cases = "".join(f'<testcase name="{name}" classname="{suite}" time="0.5"/>' for name in test_cases)
+    return write_file(
+        file,
+        f'<?xml version="1.0"?><testsuites tests="{len(test_cases)}" failures="{failures}" name="AllTests" time="1.0">'
+        f'<testsuite name="{suite}" tests="{len(test_cases)}" failures="{failures}" disabled="0" errors="0" time="1.0">{cases}</testsuite></testsuites>',
+    )
+
+
+def test_merge_junit_reports(tmp_path: Path) -> None:
+    junit_files = [
+        write_junit_report(tmp_path / "0/junit.xml", "Suite", ["a", "b"]),
+        write_junit_report(tmp_path / "1/junit.xml", "Suite", ["c"], failures=1),
+        write_junit_report(tmp_path / "2/junit.xml", "Other", ["d"]),
+        tmp_path / "crashed/junit.xml",
+    ]
+
+    merged = merge_junit_reports(junit_files)
+
+    assert (merged.get("tests"), merged.get("failures"), merged.get("time")) == ("4", "1", "3.000")
+    suites = merged.findall("testsuite")
+    assert [(suite.get("name"), suite.get("tests"), suite.get("failures")) for suite in suites] == [("Suite", "3", "1"), ("Other", "1", "0")]
+    assert [case.get("name") for case in suites[0].iter("testcase")] == ["a", "b", "c"]
+
+
+@pytest.mark.skipif(not (shutil.which("gcc") and shutil.which("gcov-tool") and shutil.which("gcov")), reason="Requires gcc, gcov and gcov-tool")
+def test_merge_coverage_data(tmp_path: Path) -> None:
+    source = write_file(tmp_path / "app.c", "#include <stdlib.h>\nint main(int argc, char **argv) {\n  if (atoi(argv[1])) return 0;\n  return 0;\n}\n")
+    build_dir = tmp_path / "build"
+    (build_dir / "obj").mkdir(parents=True)
+    subprocess.run(["gcc", "--coverage", "-c", source, "-o", build_dir / "obj/app.o"], check=True)  # noqa: S603, S607
+    subprocess.run(["gcc", "--coverage", build_dir / "obj/app.o", "-o", build_dir / "app"], check=True)  # noqa: S603, S607
+    strip = str(len(build_dir.parts) - 1)
+    for shard, argument in enumerate(["0", "1", "1"]):
+        subprocess.run([build_dir / "app", argument], check=True, env={"GCOV_PREFIX": str(tmp_path / f"shard{shard}"), "GCOV_PREFIX_STRIP": strip})  # noqa: S603
+
+    merge_coverage_data([tmp_path / f"shard{shard}" for shard in range(3)], build_dir)
+
+    assert (build_dir / "obj/app.gcda").is_file()
+    subprocess.run(["gcov", "-o", build_dir / "obj", source], check=True, cwd=tmp_path, capture_output=True)  # noqa: S603, S607
+    line_counts = {int(line.split(":")[1]): line.split(":")[0].strip() for line in (tmp_path / "app.c.gcov").read_text().splitlines()}
+    # main runs once per shard, the condition is false for one of them
+    assert [line_counts[line] for line in (2, 3, 4)] == ["3", "3", "1"]
@@ -0,0 +1,118 @@
+import json
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from tests.utils import write_file
+from yanga.commands.mockup import MockupCommand, get_include_dirs
+from yanga.sources import collect_included_files
+
+
+class FakeMocksGenerator:
+    calls = 0
+
+    def __init__(self, source_files: list[Path], symbols: list[str], output_dir: Path, filename: str, *_: object) -> None:
+        self.symbols = symbols
+        self.output_dir = output_dir
+        self.filename = filename
+
+    def generate(self) -> None:
+        FakeMocksGenerator.calls += 1
+        (self.output_dir / f"{self.filename}.h").write_text("\n".join(self.symbols))
+        (self.output_dir / f"{self.filename}.cc").write_text("// mocks")
+        (self.output_dir / f"{self.filename}.log").write_text("log")
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    write_file(tmp_path / "src/comp.c", '#include "comp.h"\n#include <stdio.h>\n#include <other.h>\n')
+    write_file(tmp_path / "src/comp.h", "void comp(void);\n")
+    write_file(tmp_path / "inc/other.h", '#include "nested.h"\nvoid other(void);\n')
+    write_file(tmp_path / "inc/nested.h", "void nested(void);\n")
+    write_file(tmp_path / "inc/unused.h", "void unused(void);\n")
+    write_file(
+        tmp_path / "build/compile_commands.json",
+        json.dumps([{"directory": tmp_path.as_posix(), "file": "src/comp.c", "command": "gcc -Iinc -isystem /usr/include -c src/comp.c"}]),
+    )
+    return tmp_path
+
+
+def run_mockup(project: Path, symbols: list[str], extra_args: Optional[list[str]] = None) -> None:
+    command = MockupCommand()
+    parser = ArgumentParser()
+    command._register_arguments(parser)
+    args = parser.parse_args(
+        [
+            "--source-files",
+            str(project / "src/comp.c"),
+            "--filename",
+            "mockup_comp",
+            "--output-dir",
+            str(project / "build/comp"),
+            "--cache-dir",
+            str(project / "build/comp/.mockup_cache"),
+            "--compilation-database",
+            str(project / "build/compile_commands.json"),
+            *(["--symbols", *symbols] if symbols else []),
+            *(extra_args or []),
+        ]
+    )
+    with patch("yanga.commands.mockup.MocksGenerator", FakeMocksGenerator):
+        assert command.run(args) == 0
+
+
+def test_collect_included_files(project: Path) -> None:
+    include_dirs = get_include_dirs(project / "build/compile_commands.json", [project / "src/comp.c"])
+
+    assert include_dirs == [project / "inc"]
+    assert collect_included_files([project / "src/comp.c"], include_dirs) == {project / "src/comp.c", project / "src/comp.h", project / "inc/other.h", project / "inc/nested.h"}
+
+
+def test_mockup_sources_are_restored_from_cache(project: Path) -> None:
+    FakeMocksGenerator.calls = 0
+    mockup_header = project / "build/comp/mockup_comp.h"
+
+    run_mockup(project, ["other", "comp"])
+    assert FakeMocksGenerator.calls == 1
+    assert mockup_header.read_text() == "comp\nother"
+    mtime = mockup_header.stat().st_mtime_ns
+
+    # Same symbols in a different order and unrelated header changes are a cache hit
+    write_file(project / "inc/unused.h", "void unused(int);\n")
+    run_mockup(project, ["comp", "other"])
+    assert FakeMocksGenerator.calls == 1
+    assert mockup_header.stat().st_mtime_ns == mtime
+
+    # Editing a component source body does not change the declarations of the mocked symbols
+    write_file(project / "src/comp.c", '#include "comp.h"\n#include <stdio.h>\n#include <other.h>\nvoid comp(void) { other(); }\n')
+    run_mockup(project, ["comp", "other"])
+    assert FakeMocksGenerator.calls == 1
+    assert mockup_header.stat().st_mtime_ns == mtime
+
+    # A change of a (transitively) included header regenerates the mockup sources
+    write_file(project / "inc/nested.h", "void nested(int);\n")
+    run_mockup(project, ["comp", "other"])
+    assert FakeMocksGenerator.calls == 2
+
+    run_mockup(project, ["comp"])
+    assert FakeMocksGenerator.calls == 3
+    assert mockup_header.read_text() == "comp"
+
+
+def test_mockup_without_symbols_fails(project: Path) -> None:
+    with pytest.raises(UserNotificationException, match="No symbols"):
+        run_mockup(project, [])
+
+
+def test_mockup_without_required_symbols_is_generated(project: Path) -> None:
+    FakeMocksGenerator.calls = 0
+    write_file(project / "build/comp/symbols.json", json.dumps({"undefined": []}))
+
+    run_mockup(project, [], ["--symbols-manifest", str(project / "build/comp/symbols.json")])
+
+    assert FakeMocksGenerator.calls == 1
+    assert (project / "build/comp/mockup_comp.h").read_text() == ""
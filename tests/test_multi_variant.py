@@ -0,0 +1,127 @@
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+from pypeline.domain.pipeline import PipelineConfig, PipelineStepConfig
+from typer.testing import CliRunner
+
+from yanga.multi_variant import MultiVariantRunConfig, MultiVariantRunner, resolve_variant_names, split_pipeline_steps
+from yanga.ymain import app
+
+
+@pytest.mark.parametrize(
+    ("selection", "expected"),
+    [
+        ("all", ["A", "B", "C"]),
+        ("C, A", ["C", "A"]),
+        ("A,A,B", ["A", "B"]),
+    ],
+)
+def test_resolve_variant_names(selection: str, expected: list[str]) -> None:
+    assert resolve_variant_names(selection, ["A", "B", "C"]) == expected
+
+
+@pytest.mark.parametrize("selection", ["A,D", ",", "all"])
+def test_resolve_unknown_variant_names(selection: str) -> None:
+    with pytest.raises(UserNotificationException):
+        resolve_variant_names(selection, [] if selection == "all" else ["A", "B"])
+
+
+def create_pipeline() -> PipelineConfig:
+    return OrderedDict(
+        install=[PipelineStepConfig(step="CreateVEnv"), PipelineStepConfig(step="WestInstall")],
+        gen=[PipelineStepConfig(step="KConfigGen")],
+        build=[PipelineStepConfig(step="GenerateBuildSystemFiles"), PipelineStepConfig(step="ExecuteBuild")],
+    )
+
+
+@pytest.mark.parametrize(
+    ("step", "single", "expected"),
+    [
+        (None, False, (["CreateVEnv", "WestInstall"], ["KConfigGen", "GenerateBuildSystemFiles", "ExecuteBuild"])),
+        ("KConfigGen", False, (["CreateVEnv", "WestInstall"], ["KConfigGen"])),
+        ("GenerateBuildSystemFiles", True, ([], ["GenerateBuildSystemFiles"])),
+        ("WestInstall", True, (["WestInstall"], [])),
+    ],
+)
+def test_split_pipeline_steps(step: Optional[str], single: bool, expected: tuple[list[str], list[str]]) -> None:
+    assert split_pipeline_steps(create_pipeline(), step, single) == expected
+
+
+def test_create_variant_command(tmp_path: Path) -> None:
+    runner = MultiVariantRunner(MultiVariantRunConfig(tmp_path, ["A"], platform="gtest", target="build"))
+
+    command = runner.create_command("A", "ExecuteBuild", force_run=True)
+
+    assert command[1:4] == ["-m", "yanga.ymain", "run"]
+    assert command[command.index("--variant") + 1] == "A"
+    # The previous steps run in the same process, they provide the execution context of the step
+    assert command[command.index("--step") + 1] == "ExecuteBuild"
+    assert "--single" not in command
+    assert command[command.index("--platform") + 1] == "gtest"
+    assert command[command.index("--target") + 1] == "build"
+    assert "--not-interactive" in command
+    assert "--force-run" in command
+    assert "--build-type" not in command
+    assert "--pristine" not in command
+
+
+def test_run_variants_aggregates_output_and_exit_status(tmp_path: Path) -> None:
+    scripts = {
+        "A": "import os; print('A', 'jobserver' if 'jobserver-auth' in os.environ.get('MAKEFLAGS', '') else os.environ.get('CMAKE_BUILD_PARALLEL_LEVEL'))",
+        "B": "import sys; print('B'); sys.exit(3)",
+    }
+    runner = MultiVariantRunner(MultiVariantRunConfig(tmp_path, ["A", "B"], variant_steps=["ExecuteBuild"], jobs=4))
+
+    with patch.object(MultiVariantRunner, "create_command", side_effect=lambda variant, step, pristine, force_run: [sys.executable, "-c", scripts[variant]]):
+        with pytest.raises(UserNotificationException, match="1 of 2 variants failed: B"):
+            runner.run()
+        results = runner._run_variants(["A", "B"], {"CMAKE_BUILD_PARALLEL_LEVEL": "2"})
+
+    assert [(result.variant, result.returncode, result.output.strip()) for result in results] == [("A", 0, "A 2"), ("B", 3, "B")]
+
+
+def test_shared_steps_run_before_the_variant_steps(tmp_path: Path) -> None:
+    commands: list[tuple[str, str, bool, bool]] = []
+
+    def create_command(variant: str, step: str, pristine: bool, force_run: bool) -> list[str]:
+        commands.append((variant, step, pristine, force_run))
+        return [sys.executable, "-c", f"import sys; sys.exit({int(variant == 'C' and step == 'WestInstall')})"]
+
+    config = MultiVariantRunConfig(tmp_path, ["A", "B", "C"], ["CreateVEnv", "WestInstall"], ["KConfigGen", "ExecuteBuild"], pristine=True, force_run=True)
+    with patch.object(MultiVariantRunner, "create_command", side_effect=create_command):
+        with pytest.raises(UserNotificationException, match="1 of 3 variants failed: C"):
+            MultiVariantRunner(config).run()
+
+    # The shared steps run one variant after the other, each variant in one process
+    assert commands[:3] == [("A", "WestInstall", True, True), ("B", "WestInstall", True, True), ("C", "WestInstall", True, True)]
+    # The variant with failing shared steps does not run its pipeline. The shared steps are not forced again.
+    assert sorted(commands[3:]) == [("A", "ExecuteBuild", False, False), ("B", "ExecuteBuild", False, False)]
+
+
+def test_variants_and_variant_are_exclusive(tmp_path: Path) -> None:
+    result = CliRunner().invoke(app, ["run", "--project-dir", str(tmp_path), "--variant", "A", "--variants", "A,B"])
+
+    assert result.exit_code != 0
+    assert isinstance(result.exception, UserNotificationException)
+
+
+def test_variants_option_starts_the_multi_variant_runner(tmp_path: Path) -> None:
+    with patch("yanga.ymain.RunCommand") as run_command, patch("yanga.ymain.MultiVariantRunner") as multi_variant_runner:
+        run_command.create_project_slurper.return_value.variants = [type("Variant", (), {"name": name}) for name in ["A", "B"]]
+        run_command.create_project_slurper.return_value.pipeline = create_pipeline()
+        result = CliRunner().invoke(app, ["run", "--project-dir", str(tmp_path), "--variants", "all", "--platform", "gtest", "--not-interactive", "--jobs", "6"])
+
+    assert result.exit_code == 0, result.output
+    run_command.return_value.do_run.assert_not_called()
+    config = multi_variant_runner.call_args.args[0]
+    assert config.variants == ["A", "B"]
+    assert config.platform == "gtest"
+    assert config.jobs == 6
+    assert config.shared_steps == ["CreateVEnv", "WestInstall"]
+    assert config.variant_steps == ["KConfigGen", "GenerateBuildSystemFiles", "ExecuteBuild"]
+    assert not config.single
@@ -0,0 +1,64 @@
+import shutil
+import subprocess
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from clanguru.object_analyzer import NmExecutor
+from py_app_dev.core.exceptions import UserNotificationException
+
+from tests.utils import write_file
+from yanga.commands.object_symbols import ObjectSymbols, ObjectSymbolsCommand, collect_object_symbols, read_elf_symbols
+
+
+@pytest.fixture
+def object_files(tmp_path: Path) -> list[Path]:
+    if not shutil.which("gcc") or not shutil.which("nm"):
+        pytest.skip("gcc and nm are required")
+    write_file(
+        tmp_path / "a.c",
+        """
+extern int ext(int);
+int defined_b(int);
+__attribute__((weak)) int maybe(void);
+static int local(void) { return 1; }
+int a(void) { return ext(1) + defined_b(2) + local() + (maybe ? maybe() : 0); }
+""",
+    )
+    write_file(tmp_path / "b.c", "extern int other;\nint common_var;\nint defined_b(int x) { return x + other; }\n")
+    for name in ("a", "b"):
+        subprocess.run(["gcc", "-c", f"{name}.c", "-o", f"{name}.o"], cwd=tmp_path, check=True)  # noqa: S603, S607
+    return [tmp_path / "a.o", tmp_path / "b.o"]
+
+
+def test_required_symbols_match_the_partial_link(object_files: list[Path], tmp_path: Path) -> None:
+    partial_link_obj = tmp_path / "partial.o"
+    subprocess.run(["gcc", "-r", "-nostdlib", "-o", partial_link_obj, *object_files], check=True)  # noqa: S603, S607
+
+    symbols = collect_object_symbols(object_files)
+
+    assert {"ext", "other"} <= set(symbols.required)
+    assert "defined_b" not in symbols.required
+    assert "maybe" not in symbols.required
+    assert set(symbols.required) == NmExecutor().run(partial_link_obj).required_symbols
+    assert {"a", "defined_b", "common_var"} <= symbols.defined
+    assert "local" not in symbols.defined
+
+
+def test_manifest_is_only_written_if_changed(object_files: list[Path], tmp_path: Path) -> None:
+    manifest_file = tmp_path / "out/symbols.json"
+
+    ObjectSymbolsCommand().run(Namespace(object_files=object_files, output_file=manifest_file))
+    assert ObjectSymbols.required_from_manifest(manifest_file) == collect_object_symbols(object_files).required
+    mtime = manifest_file.stat().st_mtime_ns
+
+    ObjectSymbolsCommand().run(Namespace(object_files=object_files, output_file=manifest_file))
+    assert manifest_file.stat().st_mtime_ns == mtime
+
+    ObjectSymbolsCommand().run(Namespace(object_files=object_files[:1], output_file=manifest_file))
+    assert "defined_b" in ObjectSymbols.required_from_manifest(manifest_file)
+
+
+def test_invalid_elf_header() -> None:
+    with pytest.raises(UserNotificationException, match="Invalid ELF header"):
+        read_elf_symbols(b"\x7fELF\x03\x01" + bytes(58))
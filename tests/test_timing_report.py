@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+from tests.utils import write_file
+from yanga.commands.timing_report import create_timing_report, format_trend, read_junit_test_times
+
+JUNIT_REPORT = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuites tests="3" failures="0" disabled="1" errors="0" time="{total}" name="AllTests">
+  <testsuite name="Suite" tests="3" failures="0" disabled="1" skipped="0" errors="0" time="{total}">
+    <testcase name="Fast" status="run" result="completed" time="{fast}" classname="Suite" />
+    <testcase name="Slow" status="run" result="completed" time="{slow}" classname="Suite" />
+    <testcase name="DISABLED_Skipped" status="notrun" result="suppressed" time="0" classname="Suite" />
+  </testsuite>
+</testsuites>
+"""
+
+
+def write_junit_report(file: Path, fast: float, slow: float) -> Path:
+    return write_file(file, JUNIT_REPORT.format(total=fast + slow, fast=fast, slow=slow))
+
+
+def test_read_junit_test_times(tmp_path: Path) -> None:
+    junit_file = write_junit_report(tmp_path / "CompA_junit.xml", 0.001, 1.5)
+
+    assert [(test.component, test.name, test.time) for test in read_junit_test_times(junit_file)] == [("CompA", "Suite.Fast", 0.001), ("CompA", "Suite.Slow", 1.5)]
+    assert read_junit_test_times(tmp_path / "missing_junit.xml") == []
+
+
+def test_format_trend() -> None:
+    assert format_trend(1.5, 1.0) == "+50%"
+    assert format_trend(0.5, 1.0) == "-50%"
+    assert format_trend(1.0, None) == "new"
+
+
+def test_timing_report_tracks_previous_runs(tmp_path: Path) -> None:
+    junit_files = [write_junit_report(tmp_path / "CompA_junit.xml", 0.01, 1.0), write_junit_report(tmp_path / "CompB_junit.xml", 0.02, 3.0)]
+    output_file = tmp_path / "test_timing.md"
+    history_file = tmp_path / "test_timing_history.json"
+
+    create_timing_report(junit_files, output_file, history_file, history_size=2, slowest=1)
+
+    report = output_file.read_text()
+    assert "4 tests in 2 components took 4.030 s." in report
+    # The slowest component comes first
+    assert report.index("| CompB | 2 | 3.020 | new |") < report.index("| CompA | 2 | 1.010 | new |")
+    assert "| Suite.Slow | CompB | 3.000 | new |" in report
+    assert "| Suite.Slow | CompA |" not in report
+
+    write_junit_report(tmp_path / "CompA_junit.xml", 0.01, 2.0)
+    create_timing_report(junit_files, output_file, history_file, history_size=2, slowest=2)
+    assert "| Suite.Slow | CompA | 2.000 | +100% |" in output_file.read_text()
+
+    create_timing_report(junit_files, output_file, history_file, history_size=2, slowest=2)
+    # The trend is relative to the average of the previous runs
+    assert "| Suite.Slow | CompA | 2.000 | +33% |" in output_file.read_text()
+    assert len(json.loads(history_file.read_text())["runs"]) == 2
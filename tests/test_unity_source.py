@@ -0,0 +1,23 @@
+from argparse import Namespace
+from pathlib import Path
+
+from yanga.commands.unity import UnitySourceCommand, create_unity_source
+
+
+def test_create_unity_source() -> None:
+    assert create_unity_source([Path("/src/test_a.cc"), Path("/build/mockup_A.cc")]).splitlines() == [
+        "// Generated by yanga. Do not edit.",
+        '#include "/src/test_a.cc"',
+        '#include "/build/mockup_A.cc"',
+    ]
+
+
+def test_unity_source_command_keeps_unchanged_file(tmp_path: Path) -> None:
+    output_file = tmp_path / "build/A_unity_0.cc"
+    args = Namespace(source_files=[Path("a.cc"), Path("b.cc")], output_file=output_file)
+
+    assert UnitySourceCommand().run(args) == 0
+    assert output_file.read_text() == create_unity_source([Path("a.cc"), Path("b.cc")])
+    mtime = output_file.stat().st_mtime_ns
+    assert UnitySourceCommand().run(args) == 0
+    assert output_file.stat().st_mtime_ns == mtime